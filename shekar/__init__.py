@@ -1,35 +1,97 @@
+from importlib import import_module
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING
 
 try:
     __version__ = version("shekar")
 except PackageNotFoundError:
     __version__ = "unknown"
 
-from .base import BaseTextTransform, BaseTransform
-from .classification import (
-    InformalLanguageClassifier,
-    OffensiveLanguageClassifier,
-    SentimentClassifier,
-)
-from .dep_parsing import DependencyParser
-from .embeddings import ContextualEmbedder, WordEmbedder
-from .hub import Hub
-from .keyword_extraction import KeywordExtractor
-from .morphology import Conjugator, Inflector, Lemmatizer, Stemmer
-from .ner import NER
-from .normalizer import Normalizer
-from .pipeline import Pipeline
-from .pos import POSTagger
-from .spelling import SpellChecker
-from .tokenization import SentenceTokenizer, Tokenizer, WordTokenizer
-from .transforms import (
-    KeyboardNoise,
-    NumberToWords,
-    OCRNoise,
-    Persianizer,
-    WhitespaceNoise,
-)
-from .transliteration import FarsiToTajik, TajikToFarsi
+if TYPE_CHECKING:
+    from .base import BaseTextTransform, BaseTransform
+    from .classification import (
+        InformalLanguageClassifier,
+        OffensiveLanguageClassifier,
+        SentimentClassifier,
+    )
+    from .dep_parsing import DependencyParser
+    from .embeddings import ContextualEmbedder, WordEmbedder
+    from .hub import Hub
+    from .keyword_extraction import KeywordExtractor
+    from .morphology import Conjugator, Inflector, Lemmatizer, Stemmer
+    from .ner import NER
+    from .normalizer import Normalizer
+    from .pipeline import Pipeline
+    from .pos import POSTagger
+    from .spelling import SpellChecker
+    from .tokenization import SentenceTokenizer, Tokenizer, WordTokenizer
+    from .transforms import (
+        KeyboardNoise,
+        NumberToWords,
+        OCRNoise,
+        Persianizer,
+        WhitespaceNoise,
+    )
+    from .transliteration import FarsiToTajik, TajikToFarsi
+
+# Public names are imported from their subpackage on first access (PEP 562), so
+# `import shekar` does not load onnxruntime, sentencepiece or the data lexicons
+# until a component that needs them is actually used.
+_lazy_imports = {
+    "BaseTextTransform": ".base",
+    "BaseTransform": ".base",
+    "Conjugator": ".morphology",
+    "ContextualEmbedder": ".embeddings",
+    "DependencyParser": ".dep_parsing",
+    "FarsiToTajik": ".transliteration",
+    "Hub": ".hub",
+    "Inflector": ".morphology",
+    "InformalLanguageClassifier": ".classification",
+    "KeyboardNoise": ".transforms",
+    "KeywordExtractor": ".keyword_extraction",
+    "Lemmatizer": ".morphology",
+    "NER": ".ner",
+    "Normalizer": ".normalizer",
+    "NumberToWords": ".transforms",
+    "OCRNoise": ".transforms",
+    "OffensiveLanguageClassifier": ".classification",
+    "POSTagger": ".pos",
+    "Persianizer": ".transforms",
+    "Pipeline": ".pipeline",
+    "SentenceTokenizer": ".tokenization",
+    "SentimentClassifier": ".classification",
+    "SpellChecker": ".spelling",
+    "Stemmer": ".morphology",
+    "TajikToFarsi": ".transliteration",
+    "Tokenizer": ".tokenization",
+    "WhitespaceNoise": ".transforms",
+    "WordEmbedder": ".embeddings",
+    "WordTokenizer": ".tokenization",
+}
+
+# Subpackages that `import shekar` used to load eagerly stay reachable as
+# attributes, e.g. `shekar.preprocessing` after a bare `import shekar`.
+_lazy_submodules = {
+    "base",
+    "classification",
+    "data",
+    "dep_parsing",
+    "embeddings",
+    "hub",
+    "keyword_extraction",
+    "morphology",
+    "ner",
+    "normalizer",
+    "pipeline",
+    "pos",
+    "runtime",
+    "preprocessing",
+    "spelling",
+    "tokenization",
+    "transforms",
+    "transliteration",
+    "utils",
+}
 
 __all__ = [
     "NER",
@@ -63,3 +125,19 @@ __all__ = [
     "WordTokenizer",
     "__version__",
 ]
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        value = getattr(import_module(_lazy_imports[name], __name__), name)
+    elif name in _lazy_submodules:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
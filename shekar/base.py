@@ -82,6 +82,17 @@ class BaseTextTransform(BaseTransform):
     def fit_transform(self, X: Iterable[str] | str, y=None):
         return self.transform(X)
 
+    def _as_translation(self) -> tuple[dict[int, str | None], bool] | None:
+        """
+        Describes this transform as a single `str.translate` pass, if it is one.
+        Pipeline.compile uses this to fuse adjacent translation steps.
+        Returns:
+            tuple[dict[int, str | None], bool] | None: `(table, strip)` when `_function`
+            is exactly `text.translate(table)`, followed by `.strip()` if `strip` is
+            True. None for any other transform.
+        """
+        return None
+
     @classmethod
     def _compile_patterns(
         cls, mappings: Iterable[tuple[str, str]], flags: int = re.UNICODE
@@ -105,6 +116,51 @@ class BaseTextTransform(BaseTransform):
         ]
         return compiled_patterns
 
+    @classmethod
+    def _compile_word_pattern(
+        cls, words: Iterable[str], letters: str, flags: int = re.UNICODE
+    ) -> re.Pattern | None:
+        """
+        Compiles a list of words into a single regex that matches any of them as a
+        whole word, i.e. not preceded or followed by any character in `letters`.
+        The words are arranged in a prefix trie, so matching costs time proportional
+        to the length of the text rather than to the number of words. At a given
+        position the longest word that satisfies the boundaries wins.
+        Args:
+            words (Iterable[str]): The words to match. Empty strings are ignored.
+            letters (str): Characters that may not appear right before or after a match.
+        Returns:
+            re.Pattern | None: The compiled pattern, or None if `words` is empty.
+        """
+        trie: dict = {}
+        for word in words:
+            if not word:
+                continue
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        if not trie:
+            return None
+
+        def to_regex(node: dict) -> str:
+            branches = [
+                re.escape(char) + to_regex(child)
+                for char, child in sorted(node.items())
+                if char
+            ]
+            if not branches:
+                return ""
+            body = "|".join(branches)
+            if "" in node:
+                return f"(?:{body})?"
+            return body if len(branches) == 1 else f"(?:{body})"
+
+        return re.compile(
+            rf"(?<![{letters}]){to_regex(trie)}(?![{letters}])", flags=flags
+        )
+
     @classmethod
     def _map_patterns(
         cls, text: str, patterns: Iterable[tuple[re.Pattern, str]]
@@ -122,3 +178,26 @@ class BaseTextTransform(BaseTransform):
             for ch in chars:
                 trans[ord(ch)] = repl
         return trans
+
+    @classmethod
+    def _compose_translation_tables(
+        cls, first: dict[int, str | int | None], second: dict[int, str | int | None]
+    ) -> dict[int, str | None]:
+        """
+        Composes two translation tables so that a single `text.translate(composed)`
+        gives the same result as `text.translate(first).translate(second)`.
+        Args:
+            first (dict[int, str | int | None]): The table applied first.
+            second (dict[int, str | int | None]): The table applied second.
+        Returns:
+            dict[int, str | None]: The composed translation table.
+        """
+        composed: dict[int, str | None] = {}
+        for code, repl in first.items():
+            if isinstance(repl, int):
+                repl = chr(repl)
+            composed[code] = repl.translate(second) if repl else repl
+        for code, repl in second.items():
+            if code not in composed:
+                composed[code] = chr(repl) if isinstance(repl, int) else repl
+        return composed
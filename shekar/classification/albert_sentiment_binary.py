@@ -1,12 +1,19 @@
+from itertools import pairwise
 from pathlib import Path
+from typing import ClassVar
 
 import numpy as np
-import onnxruntime
 
+from shekar import runtime
 from shekar.base import BaseTransform
 from shekar.hub import Hub
 from shekar.tokenization import AlbertTokenizer
-from shekar.utils import get_onnx_providers
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted_logits = logits - np.max(logits, axis=-1, keepdims=True)
+    exponentials = np.exp(shifted_logits)
+    return exponentials / exponentials.sum(axis=-1, keepdims=True)
 
 
 class AlbertBinarySentimentClassifier(BaseTransform):
@@ -14,21 +21,47 @@ class AlbertBinarySentimentClassifier(BaseTransform):
     This model is fine-tuned on the snapfood dataset.
      Args:
         model_path (str | Path, optional): Path to a custom model file. If None, the default model will be used.
+        long_document (str, optional): How to score text beyond the first 512-token window.
+            If None (default), only the first window is scored. Otherwise every window is scored
+            and the window probabilities are combined with "mean", "max" (the most confident
+            window wins) or "weighted" (mean weighted by window length).
     """
 
-    def __init__(self, model_path: str | Path | None = None):
+    aggregations: ClassVar[tuple[str, ...]] = ("mean", "max", "weighted")
+
+    def __init__(
+        self, model_path: str | Path | None = None, long_document: str | None = None
+    ):
         super().__init__()
+        if long_document is not None and long_document not in self.aggregations:
+            raise ValueError(
+                f"Unknown long_document aggregation '{long_document}'. "
+                f"Available: {list(self.aggregations)}"
+            )
         resource_name = "albert_persian_sentiment_binary_q8.onnx"
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
 
-        self.session = onnxruntime.InferenceSession(
-            model_path, providers=get_onnx_providers()
+        self.session = runtime.get_session(model_path)
+        self._release_session = runtime.bind(self, self.session)
+        self._io_runner = runtime.io_binding_runner(self.session)
+        self.long_document = long_document
+        self.tokenizer = AlbertTokenizer(
+            enable_padding=True,
+            enable_truncation=True,
+            return_overflowing_tokens=long_document is not None,
+            padding=runtime.io_binding_padding(),
         )
-        self.tokenizer = AlbertTokenizer(enable_truncation=True)
 
         self.id2tag = {0: "negative", 1: "positive"}
 
+    def release(self) -> None:
+        """Return the shared ONNX session and tokenizer to the runtime registry."""
+        self._release_session()
+        self.tokenizer.release()
+        self.session = None
+        self._io_runner = None
+
     def transform(self, X: str) -> tuple:
         """Perform sentiment analysis on the input text.
         Args:
@@ -50,12 +83,57 @@ class AlbertBinarySentimentClassifier(BaseTransform):
             "input_ids": input_ids,
             "attention_mask": attention_mask,
         }
-        outputs = self.session.run(None, inputs)
-        logits = outputs[0]
-        shifted_logits = logits - np.max(logits, axis=-1, keepdims=True)
-        exponentials = np.exp(shifted_logits)
-        scores = exponentials / exponentials.sum(axis=-1, keepdims=True)
-        predicted_class = int(np.argmax(logits, axis=1)[0])
-        predicted_class_score = float(scores[0, predicted_class])
-
-        return (self.id2tag[predicted_class], predicted_class_score)
+        outputs = (self._io_runner or self.session).run(None, inputs)
+        scores = self._aggregate(_softmax(outputs[0]), attention_mask.sum(axis=1))
+        return self._to_label(scores)
+
+    def transform_batch(self, X: list[str], batch_size: int = 32) -> list[tuple]:
+        """Perform sentiment analysis on many texts with few ONNX calls.
+
+        Windows from all texts are sorted by length and run in batches of
+        ``batch_size``, each padded only to its own longest window, rounded
+        up as the tokenizer's ``padding`` asks. With ``long_document`` set, all windows of a text are scored and
+        aggregated as in ``transform``.
+
+        Returns:
+            list[tuple]: One (label, score) tuple per input text, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        encoded = self.tokenizer.encode_batch(X)
+        sample_mapping = encoded["overflow_to_sample_mapping"]
+        lengths = encoded["attention_mask"].sum(axis=1)
+
+        order = np.argsort(lengths, kind="stable")
+        scores = np.zeros((len(lengths), len(self.id2tag)), dtype=np.float32)
+        runner = self._io_runner or self.session
+        for start in range(0, len(order), batch_size):
+            rows = order[start : start + batch_size]
+            width = self.tokenizer.padded_length(int(lengths[rows].max()))
+            inputs = {
+                "input_ids": encoded["input_ids"][rows, :width],
+                "attention_mask": encoded["attention_mask"][rows, :width],
+            }
+            scores[rows] = _softmax(runner.run(None, inputs)[0])
+
+        # Windows of a text are contiguous rows in sample_mapping.
+        bounds = np.searchsorted(sample_mapping, np.arange(len(X) + 1))
+        return [
+            self._to_label(self._aggregate(scores[lo:hi], lengths[lo:hi]))
+            for lo, hi in pairwise(bounds)
+        ]
+
+    def _aggregate(self, scores: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Combine the (num_windows, num_classes) scores of one text."""
+        if len(scores) == 1 or self.long_document is None:
+            return scores[0]
+        if self.long_document == "max":
+            return scores[np.argmax(scores.max(axis=-1))]
+        if self.long_document == "weighted":
+            return np.average(scores, axis=0, weights=lengths)
+        return scores.mean(axis=0)
+
+    def _to_label(self, scores: np.ndarray) -> tuple:
+        predicted_class = int(np.argmax(scores))
+        return (self.id2tag[predicted_class], float(scores[predicted_class]))
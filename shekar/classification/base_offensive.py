@@ -19,3 +19,10 @@ class OffensiveLanguageClassifier(BaseTransform):
 
     def transform(self, X: str):
         return self.model.transform(X)
+
+    def transform_batch(self, X: list[str], batch_size: int = 4096):
+        return self.model.transform_batch(X, batch_size=batch_size)
+
+    def release(self) -> None:
+        """Return the model's shared resources to the runtime registry."""
+        self.model.release()
@@ -13,16 +13,22 @@ class SentimentClassifier(BaseTransform):
      Args:
         model (str): The sentiment analysis model to use. Default is "albert-binary".
         model_path (str, optional): Path to a custom model file. If None, the default model will be used.
+        long_document (str, optional): Aggregate all 512-token windows of long texts with
+            "mean", "max" or "weighted" instead of scoring only the first window.
     """
 
-    def __init__(self, model: str = "albert-binary", model_path=None):
+    def __init__(
+        self, model: str = "albert-binary", model_path=None, long_document=None
+    ):
         model = model.lower()
         if model not in SENTIMENT_REGISTRY:
             raise ValueError(
                 f"Unknown sentiment model '{model}'. Available: {list(SENTIMENT_REGISTRY.keys())}"
             )
 
-        self.model = SENTIMENT_REGISTRY[model](model_path=model_path)
+        self.model = SENTIMENT_REGISTRY[model](
+            model_path=model_path, long_document=long_document
+        )
 
     def transform(self, X: str) -> tuple:
         """Perform sentiment analysis on the input text.
@@ -39,3 +45,17 @@ class SentimentClassifier(BaseTransform):
             ('positive', 0.9976541996002197)
         """
         return self.model.transform(X)
+
+    def transform_batch(self, X: list[str], batch_size: int = 32) -> list[tuple]:
+        """Perform sentiment analysis on many texts at once.
+        Args:
+            X (list[str]): Input texts.
+            batch_size (int): Maximum number of windows per ONNX call.
+            Returns:
+                list[tuple]: One (label, score) tuple per input text.
+        """
+        return self.model.transform_batch(X, batch_size=batch_size)
+
+    def release(self) -> None:
+        """Return the model's shared resources to the runtime registry."""
+        self.model.release()
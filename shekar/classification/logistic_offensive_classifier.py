@@ -1,12 +1,11 @@
 from pathlib import Path
 
 import numpy as np
-import onnxruntime
 
+from shekar import runtime
 from shekar.base import BaseTransform
 from shekar.hub import Hub
 from shekar.preprocessing import StopWordRemover
-from shekar.utils import get_onnx_providers
 
 
 class LogisticOffensiveClassifier(BaseTransform):
@@ -29,22 +28,62 @@ class LogisticOffensiveClassifier(BaseTransform):
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
 
-        self.session = onnxruntime.InferenceSession(
-            model_path, providers=get_onnx_providers()
-        )
+        self.session = runtime.get_session(model_path)
+        self._release_session = runtime.bind(self, self.session)
 
         self.id2label = {0: "neutral", 1: "offensive"}
+        self._labels = np.array([self.id2label[i] for i in sorted(self.id2label)])
         self.stopword_remover = StopWordRemover()
+        self._separator = "\x00"
+        self._input_name = self.session.get_inputs()[0].name
+        self._output_names = [o.name for o in self.session.get_outputs()]
 
-    def transform(self, X: str) -> tuple:
-        X = self.stopword_remover(X)
+    def release(self) -> None:
+        """Return the shared ONNX session to the runtime registry."""
+        self._release_session()
+        self.session = None
+
+    def _remove_stopwords(self, texts: list[str]) -> list[str]:
+        # One regex pass over all texts; the separator is never a Persian letter,
+        # so word boundaries at the joins behave like string boundaries.
+        if any(self._separator in text for text in texts):
+            return [self.stopword_remover(text) for text in texts]
+        joined = self.stopword_remover(self._separator.join(texts))
+        return [text.strip() for text in joined.split(self._separator)]
+
+    def transform_batch(
+        self, X: list[str], batch_size: int = 4096
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Classify many texts with one ONNX call per ``batch_size`` texts.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The predicted labels and the
+            confidence of each prediction, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
 
-        in_name = self.session.get_inputs()[0].name
-        out_names = [o.name for o in self.session.get_outputs()]
-        arr = np.array([[X]], dtype=object)
-        onnx_label, onnx_proba = self.session.run(out_names, {in_name: arr})
+        texts = list(X)
+        label_ids = np.zeros(len(texts), dtype=np.int64)
+        scores = np.zeros(len(texts), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            chunk = self._remove_stopwords(texts[start : start + batch_size])
+            arr = np.array(chunk, dtype=object).reshape(-1, 1)
+            onnx_label, onnx_proba = self.session.run(
+                self._output_names, {self._input_name: arr}
+            )
 
-        if onnx_proba.ndim != 2:
-            onnx_label, onnx_proba = onnx_proba, onnx_label
+            if onnx_proba.ndim != 2:
+                onnx_label, onnx_proba = onnx_proba, onnx_label
 
-        return (self.id2label[onnx_label[0]], float(onnx_proba[0][onnx_label[0]]))
+            chunk_ids = np.asarray(onnx_label, dtype=np.int64)
+            label_ids[start : start + len(chunk)] = chunk_ids
+            scores[start : start + len(chunk)] = onnx_proba[
+                np.arange(len(chunk)), chunk_ids
+            ]
+
+        return self._labels[label_ids], scores
+
+    def transform(self, X: str) -> tuple:
+        labels, scores = self.transform_batch([X])
+        return (str(labels[0]), float(scores[0]))
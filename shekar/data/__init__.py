@@ -281,16 +281,45 @@ def read_word_mappings(path):
     return vocab
 
 
-verbs = load_verbs()
-stopwords = read_words(stopwords_csv_path)
-offensive_words = read_words(offensive_words_csv_path)
-informal_words = read_word_mappings(informal_words_csv_path)
-loanwords = read_word_mappings(loanword_mappings_csv_path)
-vocab = read_vocab(vocab_csv_path)
-compound_words = read_words(compound_words_csv_path)
-
-for keyword, formal_word in informal_words.items():
-    vocab[keyword] = vocab.get(formal_word, 1)
-
-min_count = min(vocab.values())
-vocab = {word: count - min_count for word, count in vocab.items()}
+def load_vocab():
+    """Read the vocabulary and shift its counts so that the smallest one is zero."""
+    vocab = read_vocab(vocab_csv_path)
+
+    for keyword, formal_word in __getattr__("informal_words").items():
+        vocab[keyword] = vocab.get(formal_word, 1)
+
+    min_count = min(vocab.values())
+    globals()["min_count"] = min_count
+    return {word: count - min_count for word, count in vocab.items()}
+
+
+def load_min_count():
+    __getattr__("vocab")
+    return globals()["min_count"]
+
+
+# Lexicons are parsed on first access rather than at import time, so code that
+# only needs the character sets and affix lists above does not pay for them.
+_lazy_loaders = {
+    "verbs": load_verbs,
+    "stopwords": lambda: read_words(stopwords_csv_path),
+    "offensive_words": lambda: read_words(offensive_words_csv_path),
+    "informal_words": lambda: read_word_mappings(informal_words_csv_path),
+    "loanwords": lambda: read_word_mappings(loanword_mappings_csv_path),
+    "vocab": load_vocab,
+    "min_count": load_min_count,
+    "compound_words": lambda: read_words(compound_words_csv_path),
+}
+
+
+def __getattr__(name):
+    if name not in _lazy_loaders:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if name not in globals():
+        globals()[name] = _lazy_loaders[name]()
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_loaders))
@@ -1,13 +1,20 @@
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import ClassVar
 
 import numpy as np
-import onnxruntime
 
+from shekar import runtime
 from shekar.base import BaseTransform
 from shekar.hub import Hub
-from shekar.tokenization import AlbertTokenizer, WordTokenizer
-from shekar.utils import get_onnx_providers
+from shekar.tokenization import AlbertTokenizer, SentenceTokenizer, WordTokenizer
+
+
+def _encode_word(tokenizer: AlbertTokenizer, word: str) -> tuple[int, ...]:
+    sub_ids = tokenizer.sp.encode(word, out_type=int)
+    if not sub_ids:
+        sub_ids = [tokenizer.unk_token_id]
+    return tuple(sub_ids[: tokenizer.model_max_length - 2])
 
 
 class AlbertDepParser(BaseTransform):
@@ -55,11 +62,82 @@ class AlbertDepParser(BaseTransform):
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
 
-        self.session = onnxruntime.InferenceSession(
-            model_path, providers=get_onnx_providers()
+        self.session = runtime.get_session(model_path)
+        self._release_session = runtime.bind(self, self.session)
+        self._io_runner = runtime.io_binding_runner(self.session)
+        self.tokenizer = AlbertTokenizer(
+            enable_padding=True, padding=runtime.io_binding_padding()
         )
-        self.tokenizer = AlbertTokenizer()
         self.word_tokenizer = WordTokenizer()
+        self.sentence_tokenizer = SentenceTokenizer()
+        # A plain function, not a bound method, so the cache does not hold a
+        # reference back to the parser.
+        self._word_ids = lru_cache(maxsize=65536)(partial(_encode_word, self.tokenizer))
+
+    def release(self) -> None:
+        """Return the shared ONNX session and tokenizer to the runtime registry."""
+        self._release_session()
+        self.tokenizer.release()
+        self.session = None
+        self._io_runner = None
+
+    def _split_rows(self, text: str) -> list[list[str]]:
+        """
+        Split a document into word rows that each fit in one model window.
+
+        Texts that fit are parsed whole, as before. Longer texts are parsed
+        sentence by sentence; a sentence that is too long on its own is split
+        between words.
+        """
+        max_body_length = self.tokenizer.model_max_length - 2
+        words = list(self.word_tokenizer(text))
+        if sum(len(self._word_ids(word)) for word in words) <= max_body_length:
+            return [words] if words else []
+
+        rows = []
+        for sentence in self.sentence_tokenizer(text):
+            current: list[str] = []
+            current_length = 0
+            for word in self.word_tokenizer(sentence):
+                length = len(self._word_ids(word))
+                if current and current_length + length > max_body_length:
+                    rows.append(current)
+                    current, current_length = [], 0
+                current.append(word)
+                current_length += length
+            if current:
+                rows.append(current)
+        return rows
+
+    def _build_batch(self, rows: list[list[str]]):
+        """Tokenize word rows and build padded ONNX-ready arrays.
+
+        Returns:
+            input_ids:              np.int64 (batch, seq_len)
+            attention_mask:         np.int64 (batch, seq_len)
+            word_to_first_subtoken: np.int64 (batch, max_num_words)
+        """
+        sequences = []
+        word_to_first_subtoken = np.zeros(
+            (len(rows), max((len(words) for words in rows), default=0)),
+            dtype=np.int64,
+        )
+
+        for row, words in enumerate(rows):
+            all_ids = [self.tokenizer.cls_token_id]
+            for index, word in enumerate(words):
+                word_to_first_subtoken[row, index] = len(all_ids)
+                all_ids.extend(self._word_ids(word))
+            all_ids.append(self.tokenizer.sep_token_id)
+            sequences.append(all_ids)
+
+        inputs = self.tokenizer.pad(sequences)
+
+        return (
+            inputs["input_ids"],
+            inputs["attention_mask"],
+            word_to_first_subtoken,
+        )
 
     def _build_inputs(self, words: list[str]):
         """Tokenize words and build ONNX-ready arrays.
@@ -69,33 +147,91 @@ class AlbertDepParser(BaseTransform):
             attention_mask:         np.int64 (1, seq_len)
             word_to_first_subtoken: np.int64 (1, num_words)
         """
-        all_ids = [self.tokenizer.cls_token_id]
-        word_to_first_subtoken = []
-
-        for word in words:
-            sub_ids = self.tokenizer.sp.encode(word, out_type=int)
-            if not sub_ids:
-                sub_ids = [self.tokenizer.unk_token_id]
-            word_to_first_subtoken.append(len(all_ids))
-            all_ids.extend(sub_ids)
+        return self._build_batch([words])
 
-        all_ids.append(self.tokenizer.sep_token_id)
+    def _decode(
+        self, arc_logits: np.ndarray, rel_logits: np.ndarray, num_words: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Pick the best head and relation for every word in a batch.
 
-        if len(all_ids) > self.tokenizer.model_max_length:
-            all_ids = all_ids[: self.tokenizer.model_max_length - 1] + [
-                self.tokenizer.sep_token_id
-            ]
-
-        attention_mask = [1] * len(all_ids)
-        pad_len = self.tokenizer.model_max_length - len(all_ids)
-        all_ids += [self.tokenizer.pad_token_id] * pad_len
-        attention_mask += [0] * pad_len
+        Heads are restricted to ROOT and the real words of each row, so
+        padding words never win. Returns (batch, max_num_words + 1) arrays of
+        head indices and relation ids; position 0 (ROOT) is meaningless.
+        """
+        positions = np.arange(arc_logits.shape[-1])
+        valid_heads = positions[None, :] <= num_words[:, None]  # (B, n+1)
+        arc_logits = np.where(valid_heads[:, None, :], arc_logits, -np.inf)
+
+        heads = arc_logits.argmax(axis=-1)  # (B, n+1)
+        rel_scores = np.take_along_axis(
+            rel_logits, heads[:, :, None, None], axis=2
+        ).squeeze(axis=2)  # (B, n+1, num_deprels)
+        return heads, rel_scores.argmax(axis=-1)
+
+    def transform_batch(
+        self, X: list[str], batch_size: int = 32
+    ) -> list[list[tuple[str, int, str]]]:
+        """Parse many Persian texts with as few ONNX calls as possible.
+
+        Each text is split into rows that fit the model window (see
+        ``_split_rows``). Rows from all texts are sorted by length and run in
+        batches of ``batch_size``, each padded only to its own longest row.
+        When a text is split, heads stay 1-indexed over the whole text and
+        every row gets its own ROOT attachment.
 
-        return (
-            np.array([all_ids], dtype=np.int64),
-            np.array([attention_mask], dtype=np.int64),
-            np.array([word_to_first_subtoken], dtype=np.int64),
-        )
+        Returns:
+            One list of (word, head, deprel) per input text, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        rows = []
+        for doc_index, text in enumerate(X):
+            offset = 0
+            for words in self._split_rows(text):
+                rows.append((doc_index, offset, words))
+                offset += len(words)
+
+        parsed: list[list[tuple[str, int, str]]] = [[] for _ in rows]
+        lengths = [sum(len(self._word_ids(w)) for w in words) for _, _, words in rows]
+        order = sorted(range(len(rows)), key=lengths.__getitem__)
+
+        for start in range(0, len(order), batch_size):
+            bucket = order[start : start + batch_size]
+            word_rows = [rows[row][2] for row in bucket]
+            input_ids, attention_mask, word_to_first_subtoken = self._build_batch(
+                word_rows
+            )
+
+            arc_logits, rel_logits = (self._io_runner or self.session).run(
+                None,
+                {
+                    "input_ids": input_ids,
+                    "attention_mask": attention_mask,
+                    "word_to_first_subtoken": word_to_first_subtoken,
+                },
+            )
+            # arc_logits: (B, n+1, n+1)
+            # rel_logits: (B, n+1, n+1, num_deprels)
+
+            num_words = np.array([len(words) for words in word_rows])
+            heads, deprels = self._decode(arc_logits, rel_logits, num_words)
+
+            for position, row in enumerate(bucket):
+                _, offset, words = rows[row]
+                n = len(words)
+                row_heads = heads[position, 1 : n + 1]
+                row_heads = np.where(row_heads > 0, row_heads + offset, 0).tolist()
+                row_deprels = deprels[position, 1 : n + 1].tolist()
+                parsed[row] = [
+                    (word, head, self.id2deprel[deprel])
+                    for word, head, deprel in zip(words, row_heads, row_deprels)
+                ]
+
+        results: list[list[tuple[str, int, str]]] = [[] for _ in X]
+        for (doc_index, _, _), row_results in zip(rows, parsed):
+            results[doc_index].extend(row_results)
+        return results
 
     def transform(self, text: str) -> list[tuple[str, int, str]]:
         """Parse a Persian text string.
@@ -103,29 +239,4 @@ class AlbertDepParser(BaseTransform):
         Returns:
             list of (word, head, deprel) where head is 1-indexed (0 = ROOT).
         """
-        words = list(self.word_tokenizer(text))
-        n = len(words)
-        if n == 0:
-            return []
-
-        input_ids, attention_mask, word_to_first_subtoken = self._build_inputs(words)
-
-        arc_logits, rel_logits = self.session.run(
-            None,
-            {
-                "input_ids": input_ids,
-                "attention_mask": attention_mask,
-                "word_to_first_subtoken": word_to_first_subtoken,
-            },
-        )
-        # arc_logits: (1, n+1, n+1)
-        # rel_logits: (1, n+1, n+1, num_deprels)
-
-        results = []
-        for i in range(n):
-            dep_pos = i + 1
-            pred_head = int(arc_logits[0, dep_pos, : n + 1].argmax())
-            pred_deprel = int(rel_logits[0, dep_pos, pred_head].argmax())
-            results.append((words[i], pred_head, self.id2deprel[pred_deprel]))
-
-        return results
+        return self.transform_batch([text])[0]
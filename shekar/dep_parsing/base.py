@@ -1,4 +1,4 @@
-from shekar.base import BaseTransform
+from shekar import runtime
 
 from .albert_dep_parser import AlbertDepParser
 
@@ -7,17 +7,14 @@ DEP_PARSER_REGISTRY = {
 }
 
 
-class DependencyParser(BaseTransform):
-    def __init__(self, model: str = "albert", model_path=None):
+class DependencyParser(runtime.LazyModelTransform):
+    def __init__(self, model: str = "albert", model_path=None, lazy: bool = False):
         model = model.lower()
         if model not in DEP_PARSER_REGISTRY:
             raise ValueError(
                 f"Unknown dependency parser model '{model}'. Available: {list(DEP_PARSER_REGISTRY.keys())}"
             )
-        self.model = DEP_PARSER_REGISTRY[model](model_path=model_path)
-
-    def transform(self, X: str) -> list:
-        return self.model.transform(X)
+        super().__init__(DEP_PARSER_REGISTRY[model], model_path=model_path, lazy=lazy)
 
     def print_tree(self, results: list[tuple[str, int, str]]):
         """Print a dependency parse result as a tree to stdout."""
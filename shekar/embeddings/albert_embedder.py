@@ -1,11 +1,10 @@
 from pathlib import Path
 
 import numpy as np
-import onnxruntime
 
+from shekar import runtime
 from shekar.hub import Hub
 from shekar.tokenization import AlbertTokenizer
-from shekar.utils import get_onnx_providers
 
 from .base import BaseEmbedder
 
@@ -16,31 +15,56 @@ class AlbertEmbedder(BaseEmbedder):
         resource_name = "albert_persian_mlm_embeddings.onnx"
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
-        self.session = onnxruntime.InferenceSession(
-            model_path, providers=get_onnx_providers()
-        )
+        self.session = runtime.get_session(model_path)
+        self._release_session = runtime.bind(self, self.session)
+        self._io_runner = runtime.io_binding_runner(self.session)
         self.tokenizer = AlbertTokenizer(
             enable_padding=True,
             enable_truncation=True,
             return_overflowing_tokens=True,
+            padding=runtime.io_binding_padding(),
         )
         self.vector_size = 768
 
+    def release(self) -> None:
+        """Return the shared ONNX session and tokenizer to the runtime registry."""
+        self._release_session()
+        self.tokenizer.release()
+        self.session = None
+        self._io_runner = None
+
     def embed(self, phrase: str) -> np.ndarray:
-        inputs = self.tokenizer(phrase)
+        return self.embed_batch([phrase])[0]
+
+    def embed_batch(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        """Embed many texts with as few ONNX calls as possible.
+
+        Windows from all texts are sorted by length and run in batches of
+        ``batch_size``, each padded only to its own longest window, rounded
+        up as the tokenizer's ``padding`` asks. Each text is the mean of the hidden states of all its tokens, across all
+        of its windows.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
 
-        _logits, last_hidden_state = self.session.run(None, inputs)
+        encoded = self.tokenizer.encode_batch(texts)
+        sample_mapping = encoded.pop("overflow_to_sample_mapping")
+        lengths = encoded["attention_mask"].sum(axis=1)
 
-        mask = inputs["attention_mask"].astype(last_hidden_state.dtype)[:, :, None]
+        sums = np.zeros((len(texts), self.vector_size), dtype=np.float64)
+        order = np.argsort(lengths, kind="stable")
+        runner = self._io_runner or self.session
+        for start in range(0, len(order), batch_size):
+            rows = order[start : start + batch_size]
+            width = self.tokenizer.padded_length(int(lengths[rows].max()))
+            inputs = {k: v[rows, :width] for k, v in encoded.items()}
 
-        # drop special tokens
-        # if "input_ids" in inputs:
-        #     ids = inputs["input_ids"]
-        #     for tid in [cls_id, sep_id]:  # define these ids if available
-        #         if tid is not None:
-        #             mask[ids == tid] = 0
+            _logits, last_hidden_state = runner.run(None, inputs)
 
-        sum_all = (last_hidden_state * mask).sum(axis=(0, 1))  # (H,)
-        count = np.clip(mask.sum(), 1e-9, None)  # scalar
+            mask = inputs["attention_mask"].astype(last_hidden_state.dtype)[:, :, None]
+            np.add.at(
+                sums, sample_mapping[rows], (last_hidden_state * mask).sum(axis=1)
+            )
 
-        return (sum_all / count).astype(np.float32)
+        counts = np.bincount(sample_mapping, weights=lengths, minlength=len(texts))
+        return (sums / np.clip(counts, 1e-9, None)[:, None]).astype(np.float32)
@@ -40,6 +40,26 @@ class BaseEmbedder(BaseTransform):
             np.ndarray: Vector representation of the input text.
         """
 
+    def embed_batch(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        """Embed many texts into a single matrix.
+        Args:
+            texts (list[str]): Input texts to be embedded.
+            batch_size (int): Number of texts per model call, for embedders that batch.
+        Returns:
+            np.ndarray: A (len(texts), vector_size) float32 matrix. Texts without an
+            embedding get a zero row.
+        """
+        vectors = [self.embed(text) for text in texts]
+        size = next(
+            (len(vec) for vec in vectors if vec is not None),
+            getattr(self, "vector_size", 0),
+        )
+        matrix = np.zeros((len(vectors), size), dtype=np.float32)
+        for row, vec in enumerate(vectors):
+            if vec is not None:
+                matrix[row] = vec
+        return matrix
+
     def transform(self, X: str) -> np.ndarray:
         """Transform the input text into its embedded vector representation.
         Args:
@@ -58,6 +78,37 @@ class BaseEmbedder(BaseTransform):
             float: Cosine similarity between the embeddings of the two texts.
         """
 
-        vec1 = self.embed(text1)
-        vec2 = self.embed(text2)
+        vec1, vec2 = self.embed_batch([text1, text2])
         return self._cosine_similarity(vec1, vec2)
+
+    def similarity_matrix(
+        self,
+        texts: list[str],
+        other: list[str] | None = None,
+        batch_size: int = 32,
+    ) -> np.ndarray:
+        """Calculate pairwise cosine similarities between texts.
+        Args:
+            texts (list[str]): Texts for the rows of the matrix.
+            other (list[str], optional): Texts for the columns. If None, ``texts`` is
+                compared with itself.
+            batch_size (int): Number of texts per model call, for embedders that batch.
+        Returns:
+            np.ndarray: A (len(texts), len(other)) float32 matrix of cosine similarities.
+            Rows or columns of texts without an embedding are zero.
+        """
+        vectors = self._normalize_rows(self.embed_batch(texts, batch_size=batch_size))
+        if other is None:
+            other_vectors = vectors
+        else:
+            other_vectors = self._normalize_rows(
+                self.embed_batch(other, batch_size=batch_size)
+            )
+        return vectors @ other_vectors.T
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(
+            matrix, norms, out=np.zeros_like(matrix), where=norms > 0
+        ).astype(np.float32)
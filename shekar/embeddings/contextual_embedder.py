@@ -29,5 +29,12 @@ class ContextualEmbedder(BaseEmbedder):
     def embed(self, phrase: str) -> np.ndarray:
         return self.embedder(phrase)
 
+    def embed_batch(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        return self.embedder.embed_batch(texts, batch_size=batch_size)
+
     def transform(self, X: str) -> np.ndarray:
         return self.embed(X)
+
+    def release(self) -> None:
+        """Return the model's shared resources to the runtime registry."""
+        self.embedder.release()
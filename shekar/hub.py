@@ -1,4 +1,5 @@
 import hashlib
+import json
 import logging
 import os
 import tempfile
@@ -32,6 +33,10 @@ MIRRORS = [
 _DOWNLOAD_TIMEOUT = 10
 _BLOCK_SIZE = 65536
 
+# Set SHEKAR_VERIFY=full to ignore the verification sidecars and re-hash every
+# cached resource on load.
+_VERIFY_ENV = "SHEKAR_VERIFY"
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,6 +119,85 @@ class Hub:
 
         return actual_hash == expected_hash
 
+    @staticmethod
+    def get_verification_path(file_path: Path) -> Path:
+        """Return the path of the verified-hash sidecar stored next to file_path."""
+
+        return file_path.with_name(f".{file_path.name}.verified")
+
+    @staticmethod
+    def get_file_signature(file_path: Path) -> dict[str, int]:
+        """Return the stat metadata that identifies one version of a file on disk."""
+
+        stat = file_path.stat()
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": stat.st_ino,
+        }
+
+    @staticmethod
+    def write_verification(
+        file_path: Path, sha256: str, sidecar_path: Path | None = None
+    ) -> None:
+        """Record that file_path, as it is on disk right now, hashes to sha256.
+
+        The record goes next to the file unless ``sidecar_path`` is given.
+        """
+
+        record = {**Hub.get_file_signature(file_path), "sha256": sha256}
+        if sidecar_path is None:
+            sidecar_path = Hub.get_verification_path(file_path)
+
+        try:
+            sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, tmp_name = tempfile.mkstemp(
+                dir=sidecar_path.parent,
+                prefix=f"{sidecar_path.name}.",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+                    json.dump(record, f)
+                os.replace(tmp_name, sidecar_path)
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
+        except OSError as e:
+            # A read-only cache still works, it just falls back to full hashing.
+            logger.debug("Could not write verification record for %s: %s", file_path, e)
+
+    @staticmethod
+    def is_verified(file_path: Path, expected_hash: str) -> bool:
+        """
+        Check file integrity, trusting a matching verification sidecar.
+
+        The file is only re-hashed when its size, mtime or inode differ from the
+        recorded ones, when no sidecar exists, or when SHEKAR_VERIFY=full is set.
+        A successful full check refreshes the sidecar.
+        """
+
+        if os.environ.get(_VERIFY_ENV, "").lower() != "full":
+            try:
+                record = json.loads(
+                    Hub.get_verification_path(file_path).read_text(encoding="utf-8")
+                )
+                signature = Hub.get_file_signature(file_path)
+            except (OSError, ValueError):
+                record = None
+
+            if (
+                isinstance(record, dict)
+                and record.get("sha256") == expected_hash
+                and all(record.get(key) == value for key, value in signature.items())
+            ):
+                return True
+
+        if not Hub.validate_file(file_path, expected_hash):
+            return False
+
+        Hub.write_verification(file_path, expected_hash)
+        return True
+
     @staticmethod
     def download_file(url: str, dest_path: Path) -> bool:
         """Download url into dest_path using a local opener (no global state mutation)."""
@@ -207,14 +291,14 @@ class Hub:
         model_path = cache_dir / file_name
         expected_hash = MODEL_HASHES[file_name]
 
-        if Hub.validate_file(model_path, expected_hash):
+        if Hub.is_verified(model_path, expected_hash):
             return model_path
 
         lock_path = model_path.with_name(f".{model_path.name}.lock")
         with FileLock(lock_path):
             # Another process may have completed the download while this one
             # waited for the per-resource lock.
-            if Hub.validate_file(model_path, expected_hash):
+            if Hub.is_verified(model_path, expected_hash):
                 return model_path
 
             if model_path.exists():
@@ -236,6 +320,9 @@ class Hub:
                     f"{cache_dir}"
                 )
 
+            # download_from_mirrors only commits files that passed a full hash.
+            Hub.write_verification(model_path, expected_hash)
+
         return model_path
 
 
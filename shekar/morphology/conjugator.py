@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
 from functools import lru_cache
+from pathlib import Path
 
 from shekar import data
 
+# Bump when the layout of the pickled verb tables changes.
+_VERB_CACHE_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
 
 class Conjugator:
     """
@@ -1735,7 +1746,7 @@ def _build_conjugated_verbs() -> tuple[
         present_stem,
         informal_past_stem,
         informal_present_stem,
-    ) in data.verbs:
+    ) in sorted(data.verbs, key=lambda verb: tuple(stem or "" for stem in verb)):
         base_past_stem, prefix = conjugator.get_verb_prefix(past_stem)
         base_present_stem, _ = conjugator.get_verb_prefix(present_stem)
         informal_base_past_stem, _ = conjugator.get_verb_prefix(informal_past_stem)
@@ -1766,11 +1777,68 @@ def _build_conjugated_verbs() -> tuple[
     return all_forms, informal_only
 
 
+def _verb_cache_path() -> Path:
+    """Path of the on-disk verb table cache for the current verbs.csv and code."""
+
+    sha256 = hashlib.sha256()
+    sha256.update(str(_VERB_CACHE_VERSION).encode())
+    sha256.update(data.verbs_csv_path.read_bytes())
+    # The conjugation rules live in this module and the affix lists it uses
+    # live in shekar.data, so both are part of the key.
+    sha256.update(Path(__file__).read_bytes())
+    sha256.update(Path(data.__file__).read_bytes())
+
+    return Path.home() / ".shekar" / f"conjugated_verbs_{sha256.hexdigest()[:16]}.pkl"
+
+
 @lru_cache(maxsize=1)
+def _load_conjugated_verbs() -> tuple[
+    dict[str, tuple[str | None, str]],
+    dict[str, tuple[str | None, str]],
+]:
+    """
+    Return the formal+informal and informal-only verb tables, reading them from
+    the ~/.shekar cache when possible and building (then caching) them otherwise.
+    """
+
+    try:
+        cache_path = _verb_cache_path()
+    except OSError as e:
+        logger.debug("Verb table cache unavailable: %s", e)
+        return _build_conjugated_verbs()
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+        logger.debug("Ignoring unreadable verb table cache %s: %s", cache_path, e)
+
+    tables = _build_conjugated_verbs()
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, tmp_name = tempfile.mkstemp(
+            dir=cache_path.parent,
+            prefix=f".{cache_path.name}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug("Could not write verb table cache %s: %s", cache_path, e)
+
+    return tables
+
+
 def get_conjugated_verbs() -> dict[str, tuple[str | None, str]]:
-    return _build_conjugated_verbs()[0]
+    return _load_conjugated_verbs()[0]
 
 
-@lru_cache(maxsize=1)
 def get_informal_conjugated_verbs() -> dict[str, tuple[str | None, str]]:
-    return _build_conjugated_verbs()[1]
+    return _load_conjugated_verbs()[1]
@@ -1,12 +1,12 @@
+from itertools import pairwise
 from pathlib import Path
 
 import numpy as np
-import onnxruntime
 
+from shekar import runtime
 from shekar.base import BaseTransform
 from shekar.hub import Hub
 from shekar.tokenization import AlbertTokenizer
-from shekar.utils import get_onnx_providers
 
 
 class AlbertNER(BaseTransform):
@@ -16,13 +16,25 @@ class AlbertNER(BaseTransform):
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
 
-        self.session = onnxruntime.InferenceSession(
-            model_path, providers=get_onnx_providers()
-        )
+        self.session = runtime.get_session(model_path)
+        self._release_session = runtime.bind(self, self.session)
+        self._io_runner = runtime.io_binding_runner(self.session)
         self.tokenizer = AlbertTokenizer(
             enable_padding=True,
             enable_truncation=True,
             return_overflowing_tokens=True,
+            padding=runtime.io_binding_padding(),
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        special_names = ["<pad>", "[PAD]", "[CLS]", "[SEP]", "<cls>", "<sep>"]
+        special_ids = {self.tokenizer.token_to_id(n) for n in special_names}
+        self._special_ids = np.array(
+            sorted(i for i in special_ids if i is not None), dtype=np.int64
+        )
+        sp = self.tokenizer.sp
+        self._id_to_token = np.array(
+            sp.id_to_piece(list(range(sp.get_piece_size()))), dtype=object
         )
 
         self.id2tag = {
@@ -39,6 +51,13 @@ class AlbertNER(BaseTransform):
             10: "O",
         }
 
+    def release(self) -> None:
+        """Return the shared ONNX session and tokenizer to the runtime registry."""
+        self._release_session()
+        self.tokenizer.release()
+        self.session = None
+        self._io_runner = None
+
     def _aggregate_entities(self, tokens, predicted_tag_ids):
         entities = []
         current_entity = ""
@@ -81,59 +100,94 @@ class AlbertNER(BaseTransform):
 
         return entities
 
-    def transform(self, X: str) -> list:
-        """
-        NER tag a possibly long input by running ONNX over tokenizer chunks
-        and stitching predictions back into a single sequence.
-
-        Returns:
-            entities: list produced by self._aggregate_entities over the full text
-        """
-
-        batched = self.tokenizer(X)  # dict with (num_chunks, L) arrays
-        input_ids = batched["input_ids"]  # (B, L)
-        attention_mask = batched["attention_mask"]  # (B, L)
-
-        onnx_input_names = {i.name for i in self.session.get_inputs()}
-        feed = {k: v for k, v in batched.items() if k in onnx_input_names}
-
-        outputs = self.session.run(None, feed)
-        logits = outputs[0]  # (B, L, num_tags)
-        pred_ids = np.argmax(logits, axis=-1)  # (B, L)
-
-        special_names = ["<pad>", "[PAD]", "[CLS]", "[SEP]", "<cls>", "<sep>"]
-        special_ids = {self.tokenizer.tokenizer.token_to_id(n) for n in special_names}
-        special_ids = {i for i in special_ids if i is not None}
-
+    def _predict(self, encoded: dict[str, np.ndarray]) -> np.ndarray:
+        feed = {k: v for k, v in encoded.items() if k in self._input_names}
+        runner = self._io_runner or self.session
+        logits = runner.run(None, feed)[0]  # (B, L, num_tags)
+        return np.argmax(logits, axis=-1)  # (B, L)
+
+    def _decode_windows(
+        self,
+        input_ids: np.ndarray,
+        attention_mask: np.ndarray,
+        pred_ids: np.ndarray,
+    ) -> list:
+        """Stitch the windows of one document back into a single entity list."""
         stride = getattr(self.tokenizer, "stride", 0)
-        B, L = input_ids.shape
 
         tokens_all: list[str] = []
         tags_all: list[int] = []
 
-        for b in range(B):
+        for b in range(input_ids.shape[0]):
             ids = input_ids[b]
-            mask = attention_mask[b].astype(bool)
-
-            valid_pos = [
-                i for i in range(L) if mask[i] and int(ids[i]) not in special_ids
-            ]
+            valid_pos = np.flatnonzero(
+                attention_mask[b].astype(bool) & ~np.isin(ids, self._special_ids)
+            )
 
             if b > 0 and stride > 0:
                 valid_pos = valid_pos[stride:]
 
-            if not valid_pos:
+            if not valid_pos.size:
                 continue
 
-            toks = [
-                self.tokenizer.tokenizer.id_to_token(int(ids[i])) for i in valid_pos
-            ]
-            tags = pred_ids[b, valid_pos].tolist()
+            tokens_all.extend(self._id_to_token[ids[valid_pos]].tolist())
+            tags_all.extend(pred_ids[b, valid_pos].tolist())
+
+        return self._aggregate_entities(tokens_all, tags_all)
+
+    def transform(self, X: str) -> list:
+        """
+        NER tag a possibly long input by running ONNX over tokenizer chunks
+        and stitching predictions back into a single sequence.
+
+        Returns:
+            entities: list produced by self._aggregate_entities over the full text
+        """
 
-            tokens_all.extend(toks)
-            tags_all.extend(tags)
+        batched = self.tokenizer(X)  # dict with (num_chunks, L) arrays
+        pred_ids = self._predict(batched)
 
-        entities = self._aggregate_entities(
-            tokens_all, np.asarray(tags_all, dtype=pred_ids.dtype)
+        return self._decode_windows(
+            batched["input_ids"], batched["attention_mask"], pred_ids
         )
-        return entities
+
+    def transform_batch(self, X: list[str], batch_size: int = 32) -> list[list]:
+        """
+        NER tag many documents with as few ONNX calls as possible.
+
+        Overflow windows from all documents are sorted by length and packed
+        into batches of ``batch_size`` rows, each padded only to its own
+        longest window, rounded up as the tokenizer's ``padding`` asks.
+        Predictions are then stitched back per document.
+
+        Returns:
+            One entity list per input document, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        encoded = self.tokenizer.encode_batch(X)
+        input_ids = encoded["input_ids"]
+        attention_mask = encoded["attention_mask"]
+        sample_mapping = encoded["overflow_to_sample_mapping"]
+
+        lengths = attention_mask.sum(axis=1)
+        order = np.argsort(lengths, kind="stable")
+        pred_ids = np.zeros_like(input_ids)
+
+        for start in range(0, len(order), batch_size):
+            rows = order[start : start + batch_size]
+            width = self.tokenizer.padded_length(int(lengths[rows].max()))
+            bucket = {
+                k: encoded[k][rows, :width] for k in self._input_names & encoded.keys()
+            }
+            pred_ids[rows, :width] = self._predict(bucket)
+
+        # Windows of a document are contiguous rows in sample_mapping.
+        bounds = np.searchsorted(sample_mapping, np.arange(len(X) + 1))
+        return [
+            self._decode_windows(
+                input_ids[lo:hi], attention_mask[lo:hi], pred_ids[lo:hi]
+            )
+            for lo, hi in pairwise(bounds)
+        ]
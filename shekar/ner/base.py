@@ -1,4 +1,4 @@
-from shekar.base import BaseTransform
+from shekar import runtime
 
 from .albert_ner import AlbertNER
 
@@ -7,15 +7,12 @@ NER_REGISTRY = {
 }
 
 
-class NER(BaseTransform):
-    def __init__(self, model: str = "albert", model_path=None):
+class NER(runtime.LazyModelTransform):
+    def __init__(self, model: str = "albert", model_path=None, lazy: bool = False):
         model = model.lower()
         if model not in NER_REGISTRY:
             raise ValueError(
                 f"Unknown NER model '{model}'. Available: {list(NER_REGISTRY.keys())}"
             )
 
-        self.model = NER_REGISTRY[model](model_path=model_path)
-
-    def transform(self, X: str) -> list:
-        return self.model.transform(X)
+        super().__init__(NER_REGISTRY[model], model_path=model_path, lazy=lazy)
@@ -15,7 +15,8 @@ from shekar.preprocessing import (
 
 class Normalizer(Pipeline):
     def __init__(self, steps=None):
-        if steps is None:
+        default_steps = steps is None
+        if default_steps:
             steps = [
                 ("AlphabetNormalizer", AlphabetNormalizer()),
                 ("ArabicUnicodeNormalizer", ArabicUnicodeNormalizer()),
@@ -28,5 +29,9 @@ class Normalizer(Pipeline):
             ]
         super().__init__(steps=steps)
 
+        if default_steps:
+            # The leading character-mapping steps run as one str.translate pass.
+            self.steps = self.compile().steps
+
     def normalize(self, text: Iterable[str] | str):
         return self(text)
@@ -1,8 +1,38 @@
+import copy
 from collections.abc import Iterable
 from functools import wraps
 from inspect import signature
 
-from .base import BaseTransform
+from .base import BaseTextTransform, BaseTransform
+
+
+class _FusedTranslation(BaseTextTransform):
+    """
+    A single `str.translate` pass standing in for several adjacent translation
+    steps of a pipeline. Built by `Pipeline.compile`.
+    """
+
+    def __init__(
+        self,
+        steps: list[tuple[str, BaseTextTransform]],
+        translation_table: dict[int, str | None],
+        strip: bool = False,
+    ):
+        super().__init__()
+        self.steps = steps
+        self._translation_table = translation_table
+        self._strip = strip
+
+    def _function(self, text: str) -> str:
+        text = text.translate(self._translation_table)
+        return text.strip() if self._strip else text
+
+    def _as_translation(self):
+        return self._translation_table, self._strip
+
+    def __repr__(self):
+        steps_repr = ", ".join(repr(step) for _, step in self.steps)
+        return f"{self.__class__.__name__}(steps=[{steps_repr}])"
 
 
 class Pipeline(BaseTransform):
@@ -24,6 +54,9 @@ class Pipeline(BaseTransform):
         fit_transform(X, y=None):
             Fits and transforms the input data X sequentially through each step in the pipeline.
             Supports both single string input and a list of strings.
+        compile():
+            Returns an equivalent pipeline in which adjacent `str.translate` based steps
+            are fused into a single translation pass.
         __call__(X):
             Allows the pipeline to be called as a function, fitting and transforming the input data X.
 
@@ -106,6 +139,70 @@ class Pipeline(BaseTransform):
     def __call__(self, X):
         return self.fit_transform(X)
 
+    def compile(self):
+        """
+        Returns an equivalent pipeline with adjacent translation steps fused.
+
+        Steps such as AlphabetNormalizer, DigitNormalizer or PunctuationMasker are each a
+        full `str.translate` pass over the text. Runs of such steps are replaced by one
+        step whose translation table is the composition of theirs, so the text is copied
+        once instead of once per step. A step that strips the text after translating
+        closes its run. Nested pipelines are compiled recursively. The output is
+        identical to that of the original pipeline, which is left unchanged.
+
+        Returns:
+            Pipeline: A shallow copy of this pipeline with the compiled steps.
+
+        Example:
+            >>> pipeline = Pipeline([AlphabetNormalizer(), DigitNormalizer()]).compile()
+            >>> pipeline.steps[0][0]
+            'AlphabetNormalizer+DigitNormalizer'
+        """
+        compiled_steps = []
+        run = []
+
+        def close_run():
+            if len(run) == 1:
+                name, step, _ = run[0]
+                compiled_steps.append((name, step))
+            elif run:
+                table = run[0][2][0]
+                for _, _, (next_table, _) in run[1:]:
+                    table = BaseTextTransform._compose_translation_tables(
+                        table, next_table
+                    )
+                fused = _FusedTranslation(
+                    steps=[(name, step) for name, step, _ in run],
+                    translation_table=table,
+                    strip=run[-1][2][1],
+                )
+                compiled_steps.append(("+".join(name for name, _, _ in run), fused))
+            run.clear()
+
+        for name, step in self.steps:
+            if isinstance(step, Pipeline):
+                close_run()
+                compiled_steps.append((name, step.compile()))
+                continue
+
+            translation = (
+                step._as_translation() if isinstance(step, BaseTextTransform) else None
+            )
+            if translation is None:
+                close_run()
+                compiled_steps.append((name, step))
+                continue
+
+            run.append((name, step, translation))
+            if translation[1]:
+                close_run()
+
+        close_run()
+
+        pipeline = copy.copy(self)
+        pipeline.steps = compiled_steps
+        return pipeline
+
     def __or__(self, other):
         if isinstance(other, Pipeline):
             return Pipeline(self.steps + other.steps)
@@ -1,12 +1,17 @@
+from functools import lru_cache, partial
 from pathlib import Path
 
 import numpy as np
-import onnxruntime
 
+from shekar import runtime
 from shekar.base import BaseTransform
 from shekar.hub import Hub
-from shekar.tokenization import AlbertTokenizer, WordTokenizer
-from shekar.utils import get_onnx_providers
+from shekar.tokenization import AlbertTokenizer, SentenceTokenizer, WordTokenizer
+
+
+def _encode_word(tokenizer: AlbertTokenizer, word: str) -> tuple[int, ...]:
+    ids = tokenizer.sp.encode(word, out_type=int)
+    return tuple(ids[: tokenizer.model_max_length])
 
 
 class AlbertPOS(BaseTransform):
@@ -16,11 +21,18 @@ class AlbertPOS(BaseTransform):
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
 
-        self.session = onnxruntime.InferenceSession(
-            model_path, providers=get_onnx_providers()
+        self.session = runtime.get_session(model_path)
+        self._release_session = runtime.bind(self, self.session)
+        self._io_runner = runtime.io_binding_runner(self.session)
+        self.tokenizer = AlbertTokenizer(
+            enable_padding=True, padding=runtime.io_binding_padding()
         )
-        self.tokenizer = AlbertTokenizer()
         self.word_tokenizer = WordTokenizer()
+        self.sentence_tokenizer = SentenceTokenizer()
+        # Word frequencies are Zipfian, so a modest cache serves most lookups.
+        # It wraps a plain function, not a bound method, so the cache does
+        # not hold a reference back to the tagger.
+        self._word_ids = lru_cache(maxsize=65536)(partial(_encode_word, self.tokenizer))
 
         self.id2tag = {
             0: "ADJ",
@@ -42,49 +54,94 @@ class AlbertPOS(BaseTransform):
             16: "_",
         }
 
-    def transform(self, text: str) -> list:
+    def release(self) -> None:
+        """Return the shared ONNX session and tokenizer to the runtime registry."""
+        self._release_session()
+        self.tokenizer.release()
+        self.session = None
+        self._io_runner = None
+
+    def _split_rows(self, text: str) -> list[list[str]]:
+        """
+        Split a document into word rows that each fit in one model window.
+
+        Texts that fit are kept whole. Longer texts are split on sentence
+        boundaries, packing as many consecutive sentences as fit into each
+        row; a sentence that is too long on its own is split between words.
+        """
+        max_length = self.tokenizer.model_max_length
         words = list(self.word_tokenizer(text))
-        tokens = []
-        word_ids = []
-        for word_index, word in enumerate(words):
-            encoded = self.tokenizer.tokenizer.encode(word, add_special_tokens=False)
-            tokens.extend(encoded.tokens)
-            word_ids.extend([word_index] * len(encoded.tokens))
-
-        # Convert to IDs
-        input_ids = []
-        for token in tokens:
-            token_id = self.tokenizer.tokenizer.token_to_id(token)
-            if token_id is None:
-                token_id = self.tokenizer.pad_token_id
-            input_ids.append(token_id)
-
-        attention_mask = [1] * len(input_ids)
-        # Pad to max length (optional or if needed)
-        pad_len = self.tokenizer.model_max_length - len(input_ids)
-        input_ids += (
-            [self.tokenizer.pad_token_id] * pad_len
-        )  # Using self.tokenizer.pad_token_id as the padding token ID for ALBERT
-        attention_mask += [0] * pad_len
-
-        inputs = {
-            "input_ids": np.array([input_ids], dtype=np.int64),
-            "attention_mask": np.array([attention_mask], dtype=np.int64),
-        }
+        if sum(len(self._word_ids(word)) for word in words) <= max_length:
+            return [words] if words else []
+
+        rows = []
+        current: list[str] = []
+        current_length = 0
+        for sentence in self.sentence_tokenizer(text):
+            sentence_words = list(self.word_tokenizer(sentence))
+            lengths = [len(self._word_ids(word)) for word in sentence_words]
+            if current and current_length + sum(lengths) > max_length:
+                rows.append(current)
+                current, current_length = [], 0
+
+            for word, length in zip(sentence_words, lengths):
+                if current and current_length + length > max_length:
+                    rows.append(current)
+                    current, current_length = [], 0
+                current.append(word)
+                current_length += length
+
+        if current:
+            rows.append(current)
+        return rows
 
-        outputs = self.session.run(None, inputs)
-        logits = outputs[0]
-        logits = logits[0, : len(tokens), :]
-        tags_ids = np.argmax(logits, axis=-1)
-        tags = [self.id2tag[tag] for tag in tags_ids]
-
-        final_preds = []
-        match_words = []
-        previous_word_id = None
-        for word_id, pred_tag in zip(word_ids, tags):
-            if word_id != previous_word_id:
-                final_preds.append(pred_tag)
-                match_words.append(words[word_id])
-                previous_word_id = word_id
-
-        return list(zip(match_words, final_preds))
+    def transform_batch(self, X: list[str], batch_size: int = 32) -> list[list]:
+        """
+        POS tag many documents with as few ONNX calls as possible.
+
+        Each document is split into rows that fit the model window (see
+        ``_split_rows``). Rows from all documents are sorted by length and
+        run in batches of ``batch_size``, each padded only to its own
+        longest row.
+
+        Returns:
+            One list of (word, tag) pairs per input document, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        rows = []
+        for doc_index, text in enumerate(X):
+            for words in self._split_rows(text):
+                kept_words = []
+                first_subtokens = []
+                input_ids: list[int] = []
+                for word in words:
+                    word_ids = self._word_ids(word)
+                    if not word_ids:
+                        continue
+                    kept_words.append(word)
+                    first_subtokens.append(len(input_ids))
+                    input_ids.extend(word_ids)
+                rows.append((doc_index, kept_words, first_subtokens, input_ids))
+
+        tag_rows: list[list[str]] = [[] for _ in rows]
+        order = sorted(range(len(rows)), key=lambda row: len(rows[row][3]))
+        for start in range(0, len(order), batch_size):
+            bucket = order[start : start + batch_size]
+            inputs = self.tokenizer.pad([rows[row][3] for row in bucket])
+            inputs.pop("token_type_ids")
+
+            logits = (self._io_runner or self.session).run(None, inputs)[0]
+            for position, row in enumerate(bucket):
+                first_subtokens = rows[row][2]
+                tags_ids = np.argmax(logits[position, first_subtokens], axis=-1)
+                tag_rows[row] = [self.id2tag[tag] for tag in tags_ids.tolist()]
+
+        results: list[list] = [[] for _ in X]
+        for (doc_index, kept_words, _, _), tags in zip(rows, tag_rows):
+            results[doc_index].extend(zip(kept_words, tags))
+        return results
+
+    def transform(self, text: str) -> list:
+        return self.transform_batch([text])[0]
@@ -1,4 +1,4 @@
-from shekar.base import BaseTransform
+from shekar import runtime
 
 from .albert_pos import AlbertPOS
 
@@ -7,15 +7,12 @@ POS_REGISTRY = {
 }
 
 
-class POSTagger(BaseTransform):
-    def __init__(self, model: str = "albert", model_path=None):
+class POSTagger(runtime.LazyModelTransform):
+    def __init__(self, model: str = "albert", model_path=None, lazy: bool = False):
         model = model.lower()
         if model not in POS_REGISTRY:
             raise ValueError(
                 f"Unknown POS model '{model}'. Available: {list(POS_REGISTRY.keys())}"
             )
 
-        self.model = POS_REGISTRY[model](model_path=model_path)
-
-    def transform(self, X: str) -> list:
-        return self.model.transform(X)
+        super().__init__(POS_REGISTRY[model], model_path=model_path, lazy=lazy)
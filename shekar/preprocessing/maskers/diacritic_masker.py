@@ -45,3 +45,6 @@ class DiacriticMasker(BaseTextTransform):
 
     def _function(self, text: str) -> str:
         return text.translate(self._translation_table)
+
+    def _as_translation(self):
+        return self._translation_table, False
@@ -39,3 +39,6 @@ class DigitMasker(BaseTextTransform):
 
     def _function(self, text: str) -> str:
         return text.translate(self._translation_table).strip()
+
+    def _as_translation(self):
+        return self._translation_table, True
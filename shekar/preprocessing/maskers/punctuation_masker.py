@@ -44,3 +44,6 @@ class PunctuationMasker(BaseTextTransform):
 
     def _function(self, text: str) -> str:
         return text.translate(self._translation_table).strip()
+
+    def _as_translation(self):
+        return self._translation_table, True
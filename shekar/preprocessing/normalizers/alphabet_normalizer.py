@@ -90,3 +90,6 @@ class AlphabetNormalizer(BaseTextTransform):
 
     def _function(self, X, y=None):
         return X.translate(self._translation_table)
+
+    def _as_translation(self):
+        return self._translation_table, False
@@ -52,3 +52,6 @@ class ArabicUnicodeNormalizer(BaseTextTransform):
 
     def _function(self, X, y=None):
         return X.translate(self._translation_table)
+
+    def _as_translation(self):
+        return self._translation_table, False
@@ -63,3 +63,6 @@ class DigitNormalizer(BaseTextTransform):
 
     def _function(self, X, y=None):
         return X.translate(self._translation_table)
+
+    def _as_translation(self):
+        return self._translation_table, False
@@ -0,0 +1,767 @@
+import hashlib
+import json
+import logging
+import os
+import platform
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import onnxruntime as ort
+
+from shekar.base import BaseTransform
+from shekar.hub import Hub
+from shekar.utils import get_onnx_providers
+
+_INTRA_OP_THREADS_ENV = "SHEKAR_INTRA_OP_THREADS"
+_INTER_OP_THREADS_ENV = "SHEKAR_INTER_OP_THREADS"
+_GLOBAL_THREAD_POOL_ENV = "SHEKAR_GLOBAL_THREAD_POOL"
+# Set SHEKAR_OPTIMIZED_CACHE=0 to stop saving and reusing optimized graphs.
+_OPTIMIZED_CACHE_ENV = "SHEKAR_OPTIMIZED_CACHE"
+_IO_BINDING_ENV = "SHEKAR_IO_BINDING"
+
+logger = logging.getLogger(__name__)
+
+_SESSION_OPTION_FIELDS = (
+    "intra_op_num_threads",
+    "inter_op_num_threads",
+    "use_per_session_threads",
+    "graph_optimization_level",
+    "execution_mode",
+    "execution_order",
+    "enable_cpu_mem_arena",
+    "enable_mem_pattern",
+    "enable_mem_reuse",
+    "enable_profiling",
+    "optimized_model_filepath",
+    "use_deterministic_compute",
+    "log_severity_level",
+)
+
+
+class _Entry:
+    __slots__ = ("lock", "refs", "value")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.refs = 0
+        self.value = None
+
+
+class ResourceRegistry:
+    """
+    Thread-safe, reference-counted cache of heavy shared objects.
+
+    ``acquire`` returns the object cached under a key, building it with the
+    given factory on first use, and increments its reference count.
+    ``release`` decrements it; when the count reaches zero the registry drops
+    its reference so the object can be freed once no component holds it.
+    Different keys are built concurrently; concurrent requests for the same
+    key wait for a single build.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, _Entry] = {}
+        self._keys: dict[int, Hashable] = {}
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            entry.refs += 1
+
+        try:
+            with entry.lock:
+                if entry.value is None:
+                    entry.value = factory()
+        except BaseException:
+            with self._lock:
+                entry.refs -= 1
+                if entry.refs == 0 and self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+
+        with self._lock:
+            self._keys[id(entry.value)] = key
+        return entry.value
+
+    def release(self, value: Any) -> bool:
+        """Drop one reference to ``value``. Returns False if it is not tracked."""
+        with self._lock:
+            key = self._keys.get(id(value))
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry.value is not value:
+                return False
+
+            entry.refs -= 1
+            if entry.refs == 0:
+                del self._entries[key]
+                del self._keys[id(value)]
+            return True
+
+    def refcount(self, value: Any) -> int:
+        with self._lock:
+            key = self._keys.get(id(value))
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry.value is not value:
+                return 0
+            return entry.refs
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(entry.value is not None for entry in self._entries.values())
+
+
+registry = ResourceRegistry()
+
+# Short input used to run a model once after loading it.
+WARMUP_TEXT = "علی دیروز به کتابخانه‌ی دانشگاه تهران رفت."
+
+
+class LazyModel:
+    """
+    Build a model on first use instead of at construction time.
+
+    ``get`` builds the model with ``factory`` the first time it is called and
+    returns the same instance afterwards; concurrent callers wait for a single
+    build. ``preload`` does the build, and optionally a warm-up run, on a
+    background thread, so a service can answer cheap requests while heavy
+    models load. A failed build is not cached and is retried on the next call.
+    ``release`` frees the built model and forgets it, so the next use builds a
+    fresh one.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        warmup: Callable[[Any], Any] | None = None,
+    ):
+        self._factory = factory
+        self._warmup = warmup
+        self._lock = threading.Lock()
+        self._value = None
+        self._preload_lock = threading.Lock()
+        self._preload: Future | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> Any:
+        value = self._value
+        if value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._factory()
+                value = self._value
+        return value
+
+    def warmup(self) -> Any:
+        """Build the model if needed and run it once on a dummy input."""
+        value = self.get()
+        if self._warmup is not None:
+            self._warmup(value)
+        return value
+
+    def preload(self, warmup: bool = True) -> Future:
+        """
+        Build the model (and warm it up) on a background thread.
+
+        Returns a future that resolves to the model, or to the exception the
+        build raised. Calls made meanwhile wait for this build instead of
+        starting another one, and a second ``preload`` while one is pending
+        returns the same future.
+        """
+        with self._preload_lock:
+            if self._preload is not None and not self._preload.done():
+                return self._preload
+            future: Future = Future()
+            future.set_running_or_notify_cancel()
+            self._preload = future
+
+        def _load() -> None:
+            try:
+                future.set_result(self.warmup() if warmup else self.get())
+            except Exception as e:  # noqa: BLE001 - surfaced through the future
+                future.set_exception(e)
+
+        threading.Thread(target=_load, name="shekar-preload", daemon=True).start()
+        return future
+
+    def release(self) -> None:
+        """Release the model's shared resources if it has been built."""
+        with self._lock:
+            value, self._value = self._value, None
+        with self._preload_lock:
+            self._preload = None
+        if value is not None:
+            value.release()
+
+
+def _warm_up_model(model: Any) -> None:
+    model.transform_batch([WARMUP_TEXT])
+
+
+class LazyModelTransform(BaseTransform):
+    """
+    Base for components that forward to a registry model held in a
+    ``LazyModel``.
+
+    With ``lazy=False`` the model is built in the constructor; otherwise it
+    is built on first use or by ``preload``. ``model`` can be assigned to
+    replace the underlying model with an already built one.
+    """
+
+    def __init__(
+        self,
+        model_class: Callable[..., Any],
+        model_path: str | Path | None = None,
+        lazy: bool = False,
+    ):
+        self._model = LazyModel(
+            lambda: model_class(model_path=model_path), warmup=_warm_up_model
+        )
+        if not lazy:
+            self._model.get()
+
+    @property
+    def model(self):
+        """The underlying model, loaded on first access in lazy mode."""
+        return self._model.get()
+
+    @model.setter
+    def model(self, value) -> None:
+        self._model = LazyModel(lambda: value, warmup=_warm_up_model)
+        self._model.get()
+
+    def preload(self, warmup: bool = True) -> Future:
+        """Load the model, and run it once, on a background thread."""
+        return self._model.preload(warmup=warmup)
+
+    def warmup(self) -> None:
+        """Load the model if needed and run it once on a dummy input."""
+        self._model.warmup()
+
+    def transform(self, X: str) -> list:
+        return self.model.transform(X)
+
+    def transform_batch(self, X: list[str], batch_size: int = 32) -> list[list]:
+        return self.model.transform_batch(X, batch_size=batch_size)
+
+    def release(self) -> None:
+        """Return the model's shared resources to the runtime registry."""
+        self._model.release()
+
+
+_thread_lock = threading.Lock()
+_thread_settings: dict[str, Any] = {}
+_global_pool_sizes: tuple[int, int] | None = None
+
+
+def _check_thread_count(name: str, value: Any) -> int | None:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"{name} must be a non-negative integer, got {value!r}.")
+    return value
+
+
+def _env_thread_count(env_name: str) -> int | None:
+    value = os.environ.get(env_name, "").strip()
+    if not value:
+        return None
+    if not value.isdigit():
+        raise ValueError(f"{env_name} must be a non-negative integer, got {value!r}.")
+    return int(value)
+
+
+def configure_threads(
+    intra_op_num_threads: int | None = None,
+    inter_op_num_threads: int | None = None,
+    global_thread_pool: bool = False,
+) -> None:
+    """
+    Set the thread budget for ONNX Runtime sessions created from now on.
+
+    By default every session sizes its own thread pool to all cores, so
+    loading several models oversubscribes the CPU. With per-session budgets,
+    each session gets ``intra_op_num_threads`` / ``inter_op_num_threads``
+    threads. With ``global_thread_pool=True``, all sessions share a single
+    pool of that size instead; it is created with the first session and
+    cannot be resized afterwards. ``None`` or ``0`` keeps ONNX Runtime's
+    default. Explicit thread counts in a component's own session options
+    take precedence.
+
+    The same settings can be given through the ``SHEKAR_INTRA_OP_THREADS``,
+    ``SHEKAR_INTER_OP_THREADS`` and ``SHEKAR_GLOBAL_THREAD_POOL=1``
+    environment variables; values passed here override them.
+    """
+    settings = {
+        "intra_op_num_threads": _check_thread_count(
+            "intra_op_num_threads", intra_op_num_threads
+        ),
+        "inter_op_num_threads": _check_thread_count(
+            "inter_op_num_threads", inter_op_num_threads
+        ),
+        "global_thread_pool": bool(global_thread_pool),
+    }
+    with _thread_lock:
+        _check_global_pool(settings)
+        _thread_settings.clear()
+        _thread_settings.update(settings)
+
+
+def thread_settings() -> dict[str, Any]:
+    """Return the effective thread settings (API values, else environment)."""
+    with _thread_lock:
+        if _thread_settings:
+            return dict(_thread_settings)
+    return {
+        "intra_op_num_threads": _env_thread_count(_INTRA_OP_THREADS_ENV),
+        "inter_op_num_threads": _env_thread_count(_INTER_OP_THREADS_ENV),
+        "global_thread_pool": os.environ.get(_GLOBAL_THREAD_POOL_ENV, "").lower()
+        in {"1", "true", "yes"},
+    }
+
+
+def _pool_sizes(settings: dict[str, Any]) -> tuple[int, int]:
+    return (
+        settings["intra_op_num_threads"] or 0,
+        settings["inter_op_num_threads"] or 0,
+    )
+
+
+def _check_global_pool(settings: dict[str, Any]) -> None:
+    if (
+        settings["global_thread_pool"]
+        and _global_pool_sizes is not None
+        and _pool_sizes(settings) != _global_pool_sizes
+    ):
+        raise RuntimeError(
+            "The global ONNX Runtime thread pool already exists with sizes "
+            f"{_global_pool_sizes}; it cannot be resized."
+        )
+
+
+def _ensure_global_pool(settings: dict[str, Any]) -> None:
+    global _global_pool_sizes
+    with _thread_lock:
+        _check_global_pool(settings)
+        if _global_pool_sizes is None:
+            sizes = _pool_sizes(settings)
+            ort.set_global_thread_pool_sizes(*sizes)
+            _global_pool_sizes = sizes
+
+
+def apply_thread_settings(
+    sess_options: ort.SessionOptions | None = None,
+) -> ort.SessionOptions:
+    """Apply the configured thread budget to (new) session options."""
+    settings = thread_settings()
+    if sess_options is None:
+        sess_options = ort.SessionOptions()
+
+    if settings["global_thread_pool"]:
+        _ensure_global_pool(settings)
+        sess_options.use_per_session_threads = False
+        return sess_options
+
+    if settings["intra_op_num_threads"] and not sess_options.intra_op_num_threads:
+        sess_options.intra_op_num_threads = settings["intra_op_num_threads"]
+    if settings["inter_op_num_threads"] and not sess_options.inter_op_num_threads:
+        sess_options.inter_op_num_threads = settings["inter_op_num_threads"]
+    return sess_options
+
+
+def session_options_key(sess_options: ort.SessionOptions | None) -> tuple:
+    """Return a hashable summary of the settings that shape a session."""
+    if sess_options is None:
+        return ()
+    return tuple(
+        (field, str(getattr(sess_options, field, None)))
+        for field in _SESSION_OPTION_FIELDS
+    )
+
+
+def optimized_cache_dir() -> Path:
+    """Return the directory where optimized model graphs are kept."""
+    return Path.home() / ".shekar" / "optimized"
+
+
+def _optimized_cache_enabled() -> bool:
+    return os.environ.get(_OPTIMIZED_CACHE_ENV, "").lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+_model_hashes: dict[tuple, str] = {}
+
+
+def _hash_record_path(path: Path) -> Path:
+    """
+    Return where the hash record of a model is kept.
+
+    Models in the ``~/.shekar`` cache use the hub's record next to them.
+    Records for any other file are kept in the cache directory under a
+    name derived from the file's path, so hashing a custom model never
+    writes into the caller's directory.
+    """
+    path = Path(path).resolve()
+    if path.is_relative_to((Path.home() / ".shekar").resolve()):
+        return Hub.get_verification_path(path)
+    digest = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:32]
+    return optimized_cache_dir() / "hashes" / f"{digest}.verified"
+
+
+def model_sha256(path: Path) -> str:
+    """
+    Hash a model, reusing its verification record when it is current.
+
+    A model without a current record, such as a custom path, is hashed once
+    and a record is written (see ``_hash_record_path``), so later loads
+    only stat the file. Hashes are also kept for the life of the process,
+    which covers caches the record cannot be written to.
+    """
+    signature = Hub.get_file_signature(path)
+    cache_key = (str(path), *signature.values())
+    if cache_key in _model_hashes:
+        return _model_hashes[cache_key]
+
+    record_path = _hash_record_path(path)
+    try:
+        record = json.loads(record_path.read_text("utf-8"))
+    except (OSError, ValueError):
+        record = None
+
+    if (
+        isinstance(record, dict)
+        and isinstance(record.get("sha256"), str)
+        and all(record.get(key) == value for key, value in signature.items())
+    ):
+        sha256 = record["sha256"]
+    else:
+        sha256 = Hub.compute_sha256_hash(path)
+        Hub.write_verification(path, sha256, record_path)
+    _model_hashes[cache_key] = sha256
+    return sha256
+
+
+def _saved_optimization_level(
+    level: ort.GraphOptimizationLevel,
+) -> ort.GraphOptimizationLevel:
+    # Layout optimizations are hardware specific, so they are not persisted.
+    return min(level, ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED, key=int)
+
+
+def optimized_model_path(
+    model_path: str | Path,
+    providers: Iterable[str],
+    sess_options: ort.SessionOptions,
+) -> Path:
+    """
+    Return the cache path of a model's optimized graph.
+
+    The name is derived from the model's SHA-256, the ONNX Runtime version,
+    the execution providers, the optimization level and the machine
+    architecture, so a stale or foreign graph is never reused.
+    """
+    path = Path(model_path)
+    fingerprint = json.dumps(
+        [
+            model_sha256(path),
+            ort.__version__,
+            list(providers),
+            str(_saved_optimization_level(sess_options.graph_optimization_level)),
+            platform.machine(),
+        ]
+    )
+    digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+    return optimized_cache_dir() / f"{path.stem}.{digest}.onnx"
+
+
+def _save_optimized_graph(
+    path: Path,
+    cached: Path,
+    providers: tuple[str, ...],
+    sess_options: ort.SessionOptions,
+) -> ort.InferenceSession | None:
+    """
+    Optimize ``path`` and atomically write the graph to ``cached``.
+
+    Returns the session that did the optimizing, or ``None`` if the graph
+    could not be saved.
+    """
+    level = sess_options.graph_optimization_level
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, tmp_name = tempfile.mkstemp(
+            dir=cached.parent, prefix=f".{cached.name}.", suffix=".tmp"
+        )
+        os.close(file_descriptor)
+    except OSError as e:
+        # A read-only cache still works, it just optimizes on every load.
+        logger.debug("Could not create optimized graph cache for %s: %s", path, e)
+        return None
+
+    sess_options.graph_optimization_level = _saved_optimization_level(level)
+    sess_options.optimized_model_filepath = tmp_name
+    try:
+        session = ort.InferenceSession(
+            str(path), sess_options=sess_options, providers=list(providers)
+        )
+        os.replace(tmp_name, cached)
+        return session
+    except OSError as e:
+        logger.debug("Could not save optimized graph for %s: %s", path, e)
+        return None
+    finally:
+        sess_options.graph_optimization_level = level
+        sess_options.optimized_model_filepath = ""
+        Path(tmp_name).unlink(missing_ok=True)
+
+
+def _build_session(
+    path: Path, providers: tuple[str, ...], sess_options: ort.SessionOptions
+) -> ort.InferenceSession:
+    """
+    Build a session, loading or saving its optimized graph in the cache.
+
+    On a cache miss the model is optimized once and ONNX Runtime writes the
+    graph to a temporary file that is then moved into place, so concurrent
+    processes never see a partial file. That session is returned as is
+    when every requested optimization was saved; otherwise, and on a cache
+    hit, the session is loaded from the cached graph with only the
+    optimizations that were not persisted still enabled. Any cache failure
+    falls back to the original model.
+    """
+    level = sess_options.graph_optimization_level
+    if (
+        not _optimized_cache_enabled()
+        or sess_options.optimized_model_filepath
+        or level == ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    ):
+        return ort.InferenceSession(
+            str(path), sess_options=sess_options, providers=list(providers)
+        )
+
+    try:
+        cached = optimized_model_path(path, providers, sess_options)
+    except OSError as e:
+        logger.debug("Could not fingerprint %s: %s", path, e)
+        cached = None
+
+    fully_saved = _saved_optimization_level(level) == level
+    if cached is not None and not cached.exists():
+        session = _save_optimized_graph(path, cached, providers, sess_options)
+        if session is not None and fully_saved:
+            return session
+
+    if cached is not None and cached.exists():
+        if fully_saved:
+            sess_options.graph_optimization_level = (
+                ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            )
+        try:
+            return ort.InferenceSession(
+                str(cached), sess_options=sess_options, providers=list(providers)
+            )
+        except Exception as e:  # noqa: BLE001 - any bad cache file means rebuild
+            logger.debug("Discarding unusable optimized graph %s: %s", cached, e)
+            cached.unlink(missing_ok=True)
+        finally:
+            sess_options.graph_optimization_level = level
+
+    return ort.InferenceSession(
+        str(path), sess_options=sess_options, providers=list(providers)
+    )
+
+
+def get_session(
+    model_path: str | Path,
+    providers: Iterable[str] | None = None,
+    sess_options: ort.SessionOptions | None = None,
+) -> ort.InferenceSession:
+    """
+    Get a shared ONNX Runtime session for a model.
+
+    Sessions are cached process-wide, keyed by the resolved model path, the
+    execution providers and the session options. Every call takes one
+    reference; give it back with ``release`` when the session is no longer
+    needed. ``InferenceSession.run`` is thread-safe, so one session can serve
+    any number of components and threads.
+
+    The optimized graph of each model is saved under ``~/.shekar/optimized``
+    on first load and reused by later processes, which skips graph
+    optimization at start-up. Set ``SHEKAR_OPTIMIZED_CACHE=0`` to disable it.
+
+    Args:
+        model_path: Path to the ``.onnx`` model file.
+        providers: Execution providers; defaults to ``get_onnx_providers()``.
+        sess_options: Optional session options used to build the session. The
+            thread budget from ``configure_threads`` is applied to them.
+    """
+    path = Path(model_path).resolve()
+    providers = tuple(get_onnx_providers() if providers is None else providers)
+    sess_options = apply_thread_settings(sess_options)
+    key = ("onnx", str(path), providers, session_options_key(sess_options))
+
+    def _build() -> ort.InferenceSession:
+        return _build_session(path, providers, sess_options)
+
+    return registry.acquire(key, _build)
+
+
+def release(*resources: Any) -> None:
+    """Return resources obtained from the registry. Untracked objects are ignored."""
+    for resource in resources:
+        if resource is not None:
+            registry.release(resource)
+
+
+def bind(owner: object, *resources: Any) -> weakref.finalize:
+    """
+    Release ``resources`` when ``owner`` is garbage collected.
+
+    The returned finalizer can be called to release them earlier; it runs at
+    most once.
+    """
+    return weakref.finalize(owner, release, *resources)
+
+
+_io_binding: bool | None = None
+# Sequence widths are rounded up to this many tokens when IO binding is on.
+IO_BINDING_PAD_MULTIPLE = 64
+
+
+def configure_io_binding(enabled: bool = True) -> None:
+    """
+    Enable or disable the IO-binding execution path for models loaded from now on.
+
+    When enabled, components run their sessions through ``IOBindingRunner``,
+    which reuses input and output buffers between calls of the same shape.
+    It can also be turned on with ``SHEKAR_IO_BINDING=1``.
+    """
+    global _io_binding
+    _io_binding = bool(enabled)
+
+
+def io_binding_enabled() -> bool:
+    if _io_binding is not None:
+        return _io_binding
+    return os.environ.get(_IO_BINDING_ENV, "").lower() in {"1", "true", "yes"}
+
+
+def io_binding_padding(padding: str = "longest") -> str:
+    """
+    Return the tokenizer padding to use for a model that may run bound.
+
+    Bound buffers are reused per input shape, so with IO binding enabled
+    sequences are padded to a multiple of ``IO_BINDING_PAD_MULTIPLE``:
+    batches of similar length then share one set of buffers instead of
+    each allocating its own. Otherwise ``padding`` is returned unchanged.
+    """
+    if io_binding_enabled():
+        return f"multiple_of={IO_BINDING_PAD_MULTIPLE}"
+    return padding
+
+
+class _Bucket:
+    __slots__ = ("binding", "inputs", "outputs")
+
+    def __init__(self, binding, inputs: dict[str, np.ndarray], outputs: list):
+        self.binding = binding
+        self.inputs = inputs
+        self.outputs = outputs
+
+
+class IOBindingRunner:
+    """
+    Run a session through IO binding with preallocated, reused buffers.
+
+    Buffers are kept per input shape bucket: the first call with a given set
+    of input shapes binds copies of the inputs and lets ONNX Runtime size the
+    outputs; later calls copy the inputs into the bound buffers and write the
+    outputs into the same arrays, so steady-state inference allocates no new
+    tensors. The ``max_buckets`` most recently used buckets are kept per
+    thread, which also makes the runner safe to share between threads.
+
+    ``run`` has the signature of ``InferenceSession.run``, but the returned
+    arrays are only valid until the next call with the same shapes on the
+    same thread. Output shapes must depend only on input shapes, which holds
+    for the ALBERT models.
+    """
+
+    def __init__(self, session: ort.InferenceSession, max_buckets: int = 16):
+        if not isinstance(max_buckets, int) or max_buckets < 1:
+            raise ValueError("max_buckets must be a positive integer.")
+        self.session = session
+        self.max_buckets = max_buckets
+        self._output_names = [output.name for output in session.get_outputs()]
+        self._local = threading.local()
+
+    def _buckets(self) -> OrderedDict:
+        buckets = getattr(self._local, "buckets", None)
+        if buckets is None:
+            buckets = self._local.buckets = OrderedDict()
+        return buckets
+
+    def _new_bucket(
+        self, output_names: tuple[str, ...], feed: dict[str, np.ndarray]
+    ) -> _Bucket:
+        binding = self.session.io_binding()
+        inputs = {name: np.array(value, order="C") for name, value in feed.items()}
+        for name, buffer in inputs.items():
+            binding.bind_cpu_input(name, buffer)
+        for name in output_names:
+            binding.bind_output(name)
+        self.session.run_with_iobinding(binding)
+
+        outputs = binding.copy_outputs_to_cpu()
+        binding.clear_binding_outputs()
+        for name, buffer in zip(output_names, outputs):
+            binding.bind_output(
+                name, "cpu", 0, buffer.dtype, buffer.shape, buffer.ctypes.data
+            )
+        return _Bucket(binding, inputs, outputs)
+
+    def run(
+        self, output_names: Iterable[str] | None, input_feed: dict[str, Any]
+    ) -> list[np.ndarray]:
+        names = tuple(self._output_names if output_names is None else output_names)
+        feed = {name: np.asarray(value) for name, value in input_feed.items()}
+        key = (
+            names,
+            tuple(
+                (name, value.shape, value.dtype.str)
+                for name, value in sorted(feed.items())
+            ),
+        )
+
+        buckets = self._buckets()
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = self._new_bucket(names, feed)
+            if len(buckets) > self.max_buckets:
+                buckets.popitem(last=False)
+            return bucket.outputs
+
+        buckets.move_to_end(key)
+        for name, buffer in bucket.inputs.items():
+            np.copyto(buffer, feed[name])
+        self.session.run_with_iobinding(bucket.binding)
+        return bucket.outputs
+
+
+def io_binding_runner(session: ort.InferenceSession) -> IOBindingRunner | None:
+    """Return an ``IOBindingRunner`` for ``session`` if IO binding is enabled."""
+    return IOBindingRunner(session) if io_binding_enabled() else None
@@ -4,6 +4,7 @@ from typing import Any
 import numpy as np
 import sentencepiece as spm
 
+from shekar import runtime
 from shekar.base import BaseTransform
 from shekar.hub import Hub
 
@@ -21,9 +22,17 @@ class AlbertTokenizer(BaseTransform):
     - Optionally truncates long inputs to ``model_max_length``
     - Optionally returns truncated content as overlapping windows
     - Adds [CLS] and [SEP]
-    - Pads to model_max_length if enabled
+    - Pads according to ``padding`` if enabled
     - Returns dense NumPy arrays
 
+    ``padding`` selects the padded length when ``enable_padding`` is true:
+
+    - ``"max_length"`` pads every sequence to ``model_max_length``
+    - ``"longest"`` pads to the longest sequence in the batch
+    - ``"multiple_of=N"`` pads to the longest sequence rounded up to a
+      multiple of ``N`` (never past ``model_max_length`` unless a sequence
+      is already longer)
+
     When multiple overflow windows are returned, the final shorter window is
     padded even if ``enable_padding`` is false. This keeps the returned batch
     rectangular and representable as a NumPy array.
@@ -37,9 +46,12 @@ class AlbertTokenizer(BaseTransform):
         stride: int = 0,
         model_max_length: int = 512,
         return_overflowing_tokens: bool = False,
+        padding: str = "max_length",
     ):
         super().__init__()
 
+        self._pad_multiple = self._parse_padding(padding)
+
         if (
             not isinstance(model_max_length, int)
             or isinstance(model_max_length, bool)
@@ -71,12 +83,17 @@ class AlbertTokenizer(BaseTransform):
         if model_path is None or not Path(model_path).exists():
             model_path = Hub.get_resource(file_name=resource_name)
 
-        self.sp = spm.SentencePieceProcessor()
-        self.sp.load(str(model_path))
+        model_path = Path(model_path).resolve()
+        self.sp = runtime.registry.acquire(
+            ("sentencepiece", str(model_path)),
+            lambda: spm.SentencePieceProcessor(model_file=str(model_path)),
+        )
+        self._release_sp = runtime.bind(self, self.sp)
 
         self.model_max_length = model_max_length
         self.stride = stride
         self.enable_padding = enable_padding
+        self.padding = padding
         self.enable_truncation = enable_truncation
         self.return_overflowing_tokens = return_overflowing_tokens
 
@@ -91,6 +108,22 @@ class AlbertTokenizer(BaseTransform):
         self.cls_token_id = self._require_token(self.cls_token)
         self.sep_token_id = self._require_token(self.sep_token)
 
+    @staticmethod
+    def _parse_padding(padding: str) -> int | None:
+        """Return the padding multiple, or None for ``"max_length"``."""
+        if padding == "max_length":
+            return None
+        if padding == "longest":
+            return 1
+        if isinstance(padding, str) and padding.startswith("multiple_of="):
+            value = padding[len("multiple_of=") :]
+            if value.isdigit() and int(value) > 0:
+                return int(value)
+        raise ValueError(
+            "padding must be 'max_length', 'longest' or 'multiple_of=N' "
+            f"with a positive integer N, got {padding!r}."
+        )
+
     def _require_token(self, token: str) -> int:
         tid = self.sp.piece_to_id(token)
         if tid < 0:
@@ -100,9 +133,9 @@ class AlbertTokenizer(BaseTransform):
         return tid
 
     def encode(self, text: str, add_special_tokens: bool = True):
-        # SentencePiece pieces (strings)
+        # SentencePiece pieces (strings); unknown pieces map to unk_token_id
         pieces = self.sp.encode(text, out_type=str)
-        ids = self.sp.encode(text, out_type=int)
+        ids = self.sp.piece_to_id(pieces)
 
         if add_special_tokens:
             pieces = ["[CLS]"] + pieces + ["[SEP]"]
@@ -143,9 +176,41 @@ class AlbertTokenizer(BaseTransform):
 
         return chunks
 
-    def _pad(self, ids: list[int], target_length: int) -> list[int]:
-        pad_len = target_length - len(ids)
-        return ids + [self.pad_token_id] * pad_len
+    def padded_length(self, longest: int) -> int:
+        """Return the length the ``padding`` strategy pads ``longest`` to."""
+        if self._pad_multiple is None:
+            return max(longest, self.model_max_length)
+
+        multiple = self._pad_multiple
+        target_length = -(-longest // multiple) * multiple
+        if longest <= self.model_max_length:
+            target_length = min(target_length, self.model_max_length)
+        return target_length
+
+    def pad(self, sequences: list[list[int]]) -> dict[str, np.ndarray]:
+        """
+        Pad already-encoded id sequences into dense model inputs.
+
+        Sequences are padded to a common length chosen by the ``padding``
+        strategy when ``enable_padding`` is true, and to the longest sequence
+        otherwise (a single sequence is then returned as is).
+        """
+        longest = max((len(seq) for seq in sequences), default=0)
+        target_length = self.padded_length(longest) if self.enable_padding else longest
+
+        input_ids = np.full(
+            (len(sequences), target_length), self.pad_token_id, dtype=np.int64
+        )
+        attention_mask = np.zeros((len(sequences), target_length), dtype=np.int64)
+        for row, seq in enumerate(sequences):
+            input_ids[row, : len(seq)] = seq
+            attention_mask[row, : len(seq)] = 1
+
+        return {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": np.zeros_like(input_ids),
+        }
 
     def token_to_id(self, token: str) -> int | None:
         tid = self.sp.piece_to_id(token)
@@ -154,38 +219,54 @@ class AlbertTokenizer(BaseTransform):
     def id_to_token(self, idx: int) -> str:
         return self.sp.id_to_piece(idx)
 
+    def release(self) -> None:
+        """Return the shared SentencePiece model to the runtime registry."""
+        self._release_sp()
+
     @property
     def tokenizer(self):
         return self
 
+    def encode_batch(
+        self, texts: list[str], num_threads: int = -1
+    ) -> dict[str, np.ndarray]:
+        """
+        Encode many documents into a single padded batch.
+
+        Texts are tokenized with SentencePiece's multithreaded batch encoder,
+        then truncated or split into overflow windows per document exactly as
+        ``transform`` would. The returned dict holds the usual ``input_ids``,
+        ``attention_mask`` and ``token_type_ids`` arrays with one row per
+        window, plus ``overflow_to_sample_mapping``, the index of the source
+        document for each row.
+
+        Args:
+            texts: Documents to encode.
+            num_threads: Number of SentencePiece worker threads
+                (``-1`` uses all available cores).
+        """
+        texts = list(texts)
+        ids_batch = (
+            self.sp.encode(texts, out_type=int, num_threads=num_threads)
+            if texts
+            else []
+        )
+
+        chunks = []
+        sample_mapping = []
+        for doc_index, ids in enumerate(ids_batch):
+            for chunk in self._chunk_ids(ids):
+                chunks.append(chunk)
+                sample_mapping.append(doc_index)
+
+        inputs = self.pad(chunks)
+        inputs["overflow_to_sample_mapping"] = np.asarray(
+            sample_mapping, dtype=np.int64
+        )
+        return inputs
+
     def transform(self, X: str) -> dict[str, Any]:
         # Encode without special tokens
         ids = self.sp.encode(X, out_type=int)
 
-        chunks = self._chunk_ids(ids)
-        pad_batch = self.enable_padding or len(chunks) > 1
-        target_length = max(len(chunk) for chunk in chunks)
-        if self.enable_padding:
-            target_length = max(target_length, self.model_max_length)
-
-        input_ids = []
-        attention_mask = []
-        token_type_ids = []
-
-        for chunk in chunks:
-            if pad_batch:
-                padded = self._pad(chunk, target_length)
-                mask = [1] * len(chunk) + [0] * (target_length - len(chunk))
-            else:
-                padded = chunk
-                mask = [1] * len(chunk)
-
-            input_ids.append(padded)
-            attention_mask.append(mask)
-            token_type_ids.append([0] * len(padded))
-
-        return {
-            "input_ids": np.asarray(input_ids, dtype=np.int64),
-            "attention_mask": np.asarray(attention_mask, dtype=np.int64),
-            "token_type_ids": np.asarray(token_type_ids, dtype=np.int64),
-        }
+        return self.pad(self._chunk_ids(ids))
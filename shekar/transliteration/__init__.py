@@ -3,6 +3,7 @@ from .byt5_encoder import ByT5Encoder
 from .byt5_tokenizer import ByT5Tokenizer
 from .byt5_transliterator import ByT5Transliterator
 from .farsi_to_tajik import FarsiToTajik
+from .memo import TransliterationMemo
 from .tajik_to_farsi import TajikToFarsi
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "ByT5Transliterator",
     "FarsiToTajik",
     "TajikToFarsi",
+    "TransliterationMemo",
 ]
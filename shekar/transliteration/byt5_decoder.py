@@ -4,14 +4,21 @@ from pathlib import Path
 import numpy as np
 import onnxruntime as ort
 
+from shekar import runtime
 from shekar.transliteration.byt5_tokenizer import ByT5Tokenizer
-from shekar.utils import get_onnx_providers
 
 
 class ByT5Decoder:
+    _io_binding = False
+    _device = "cpu"
+
     def __init__(self, model_path: str | Path):
         self._session = self._make_session(Path(model_path))
+        self._release_session = runtime.bind(self, self._session)
         self._tokenizer = ByT5Tokenizer()
+        self._io_binding = runtime.io_binding_enabled()
+        if self._session.get_providers()[0] == "CUDAExecutionProvider":
+            self._device = "cuda"
 
         dec_input_names = [i.name for i in self._session.get_inputs()]
         dec_output_names = [o.name for o in self._session.get_outputs()]
@@ -65,14 +72,16 @@ class ByT5Decoder:
         self._num_heads = int(shape[1]) if isinstance(shape[1], int) else 6
         self._d_kv = int(shape[3]) if isinstance(shape[3], int) else 64
 
+    def release(self) -> None:
+        """Return the shared ONNX session to the runtime registry."""
+        self._release_session()
+
     @staticmethod
     def _make_session(path: Path) -> ort.InferenceSession:
         so = ort.SessionOptions()
         so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
         so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
-        return ort.InferenceSession(
-            str(path), sess_options=so, providers=get_onnx_providers()
-        )
+        return runtime.get_session(path, sess_options=so)
 
     @staticmethod
     def _by_idx(names: list[str]) -> list[str]:
@@ -110,6 +119,7 @@ class ByT5Decoder:
     def validate_generation_parameters(
         num_beams: int,
         max_new_tokens: int,
+        speculative_tokens: int = 0,
     ) -> None:
         if (
             isinstance(num_beams, bool)
@@ -123,6 +133,14 @@ class ByT5Decoder:
             or max_new_tokens < 1
         ):
             raise ValueError("max_new_tokens must be a positive integer.")
+        if (
+            isinstance(speculative_tokens, bool)
+            or not isinstance(speculative_tokens, Integral)
+            or speculative_tokens < 0
+        ):
+            raise ValueError("speculative_tokens must be a non-negative integer.")
+        if speculative_tokens and num_beams != 1:
+            raise ValueError("speculative decoding requires num_beams=1.")
 
     @staticmethod
     def _normalized_score(score: float, sequence: list[int]) -> float:
@@ -135,129 +153,588 @@ class ByT5Decoder:
         attention_mask: np.ndarray,
         num_beams: int = 4,
         max_new_tokens: int = 256,
+        speculative_tokens: int = 0,
+        source_ids: np.ndarray | None = None,
     ) -> list[int]:
         """Run beam-search decoding given encoder outputs.
 
         Returns token ids with the leading decoder-start and trailing EOS already stripped.
         """
-        self.validate_generation_parameters(num_beams, max_new_tokens)
+        return self.decode_batch(
+            enc_out,
+            attention_mask,
+            num_beams,
+            max_new_tokens,
+            speculative_tokens,
+            None if source_ids is None else [source_ids],
+        )[0]
+
+    @property
+    def _step_output_names(self) -> list[str]:
+        # Cross-attention KV does not change after the first step.
+        return ["logits", *self._present_self_k, *self._present_self_v]
+
+    def _run(
+        self, feed: dict, output_names: list[str] | None = None, bind: bool = True
+    ) -> dict:
+        """Run one decoder step; returns outputs by name, logits as NumPy."""
+        names = self._output_names if output_names is None else output_names
+        if self._io_binding and bind:
+            return self._run_bound(feed, names)
+        return dict(zip(names, self._session.run(names, feed)))
+
+    def _run_bound(self, feed: dict, output_names: list[str]) -> dict:
+        """Run a step with IO binding, keeping outputs as ``OrtValue``s.
+
+        Present KV tensors stay in ONNX Runtime memory on the session's
+        device and are bound directly as the next step's past inputs.
+        """
+        binding = self._session.io_binding()
+        for name, value in feed.items():
+            if isinstance(value, ort.OrtValue):
+                binding.bind_ortvalue_input(name, value)
+            else:
+                binding.bind_cpu_input(name, value)
+        for name in output_names:
+            binding.bind_output(name, self._device)
+        self._session.run_with_iobinding(binding)
+
+        outputs = dict(zip(output_names, binding.get_outputs()))
+        outputs["logits"] = outputs["logits"].numpy()
+        return outputs
+
+    def _to_device(self, value: np.ndarray, bind: bool = True):
+        """Move a constant decoder input to ONNX Runtime memory when binding."""
+        if not (self._io_binding and bind):
+            return value
+        return ort.OrtValue.ortvalue_from_numpy(
+            np.ascontiguousarray(value), self._device, 0
+        )
+
+    def _take(self, value, rows: np.ndarray):
+        """Select batch rows of a decoder tensor, keeping its representation.
+
+        On CPU, ``OrtValue.numpy()`` is a view, so re-indexing a bound tensor
+        is a single gather, just like re-indexing a NumPy array.
+        """
+        if isinstance(value, ort.OrtValue):
+            return ort.OrtValue.ortvalue_from_numpy(
+                value.numpy()[rows], self._device, 0
+            )
+        return value[rows]
+
+    def _select_rows(self, cache: dict, rows: np.ndarray) -> dict:
+        return {name: self._take(value, rows) for name, value in cache.items()}
+
+    @property
+    def _binds_reindexed_steps(self) -> bool:
+        """Whether searches that re-index the KV cache every step bind it.
 
-        src_len = attention_mask.shape[1]
+        Beam search reorders the cache and speculative decoding trims it
+        after every call. ONNX Runtime offers no device-side gather to do
+        that between steps, so it goes through ``OrtValue.numpy()``: a view
+        on CPU, but a full device-to-host-to-device copy on CUDA. There those
+        searches run unbound and only greedy decoding keeps the cache on the
+        device.
+        """
+        return self._device == "cpu"
 
+    def _first_step(
+        self, enc_out: np.ndarray, attention_mask: np.ndarray, bind: bool = True
+    ) -> tuple[dict, np.ndarray]:
+        """Run the decoder-start step; returns outputs by name and log-probs."""
+        batch_size, src_len = attention_mask.shape
         first_feed = {
-            "input_ids": np.array([[self._tokenizer._pad_id]], dtype=np.int64),
+            "input_ids": np.full(
+                (batch_size, 1), self._tokenizer._pad_id, dtype=np.int64
+            ),
             "encoder_attention_mask": attention_mask,
             "encoder_hidden_states": enc_out,
         }
-        first_feed.update(self._empty_self_past(1))
-        first_feed.update(self._empty_cross_past(1, src_len))
+        first_feed.update(self._empty_self_past(batch_size))
+        first_feed.update(self._empty_cross_past(batch_size, src_len))
         if self._has_use_cache_branch:
             first_feed["use_cache_branch"] = np.array([False], dtype=bool)
 
-        out0 = self._session.run(None, first_feed)
-        n2o = dict(zip(self._output_names, out0))
-        logp = self._log_softmax(n2o["logits"][0, -1])
-        vocab_size = logp.shape[0]
-        if num_beams >= vocab_size:
-            raise ValueError(
-                f"num_beams must be smaller than the vocabulary size ({vocab_size})."
+        n2o = self._run(first_feed, bind=bind)
+        return n2o, self._log_softmax_2d(n2o["logits"][:, -1, :])
+
+    @staticmethod
+    def _lookup_draft(context: np.ndarray, k: int, max_ngram: int = 3) -> np.ndarray:
+        """Propose up to ``k`` tokens by prompt lookup.
+
+        Finds an earlier occurrence of the longest (up to ``max_ngram``)
+        suffix of ``context`` and returns the tokens that followed it, or an
+        empty array when nothing matches. The latest occurrence followed by
+        ``k`` tokens is preferred, then the one followed by the most.
+        """
+        if k < 1:
+            return context[:0]
+        for n in range(min(max_ngram, len(context) - 1), 0, -1):
+            windows = np.lib.stride_tricks.sliding_window_view(context[:-1], n)
+            matches = np.flatnonzero((windows == context[-n:]).all(axis=1))
+            if len(matches):
+                full = matches[matches + n + k <= len(context)]
+                start = (full[-1] if len(full) else matches[0]) + n
+                return context[start : start + k]
+        return context[:0]
+
+    def _propose_drafts(
+        self, sources: list[np.ndarray], generated: list[np.ndarray], budgets
+    ) -> list[np.ndarray]:
+        """Draft up to ``budgets[i]`` next tokens for every row."""
+        return [
+            self._lookup_draft(np.concatenate([source, row]), budget)
+            for source, row, budget in zip(sources, generated, budgets)
+        ]
+
+    def _truncate(self, value, length: int):
+        """Keep the first ``length`` positions of a self-attention KV tensor."""
+        if isinstance(value, ort.OrtValue):
+            return ort.OrtValue.ortvalue_from_numpy(
+                np.ascontiguousarray(value.numpy()[:, :, :length]), self._device, 0
             )
+        return np.ascontiguousarray(value[:, :, :length])
 
+    def _greedy_batch(
+        self,
+        enc_out: np.ndarray,
+        attention_mask: np.ndarray,
+        max_new_tokens: int,
+    ) -> list[list[int]]:
+        """Decode with ``num_beams=1`` without the beam bookkeeping.
+
+        Gives the same result as the beam search with a single beam: the
+        active sequence follows the best non-EOS token, and the best
+        EOS-terminated alternative seen so far is kept by its length
+        normalized score. Tokens are written into one preallocated array,
+        the self-attention cache returned by the model is fed straight back,
+        and cross-attention KV is reused without copying.
+        """
+        batch_size = attention_mask.shape[0]
         eos_id = self._tokenizer._eos_id
-        start_id = self._tokenizer._pad_id
-        finished: list[tuple[float, list[int]]] = [
-            (
-                float(logp[eos_id]),
-                [start_id, eos_id],
-            )
-        ]
 
-        active_logp = logp.copy()
-        active_logp[eos_id] = -np.inf
-        top_ids = np.argsort(-active_logp, kind="stable")[:num_beams]
+        n2o, logp = self._first_step(enc_out, attention_mask)
 
-        seqs = [[start_id, int(token_id)] for token_id in top_ids]
-        scores = active_logp[top_ids].astype(np.float32)
+        # tokens[n, 1:length] is the active sequence of input n (after the
+        # decoder start); the best finished one is tokens[n, 1:best_length].
+        tokens = np.zeros((batch_size, max_new_tokens + 1), dtype=np.int64)
+        length = 1
+        best_scores = logp[:, eos_id].astype(np.float64)
+        best_lengths = np.ones(batch_size, dtype=np.int64)
+        results_lengths = np.ones(batch_size, dtype=np.int64)
 
-        self_k = [np.repeat(n2o[n], num_beams, axis=0) for n in self._present_self_k]
-        self_v = [np.repeat(n2o[n], num_beams, axis=0) for n in self._present_self_v]
-        cross_k = [np.repeat(n2o[n], num_beams, axis=0) for n in self._present_cross_k]
-        cross_v = [np.repeat(n2o[n], num_beams, axis=0) for n in self._present_cross_v]
+        logp[:, eos_id] = -np.inf
+        next_tokens = logp.argmax(axis=1)
+        scores = logp[np.arange(batch_size), next_tokens]
+        tokens[:, length] = next_tokens
+        length += 1
 
-        enc_out_b = np.repeat(enc_out, num_beams, axis=0)
-        enc_mask_b = np.repeat(attention_mask, num_beams, axis=0)
+        self_kv = {
+            name: n2o[name] for name in self._present_self_k + self._present_self_v
+        }
+        cross_kv = {
+            name: n2o[name] for name in self._present_cross_k + self._present_cross_v
+        }
+        alive = np.arange(batch_size)
+        use_cache_branch = np.array([True], dtype=bool)
+        enc_out = self._to_device(enc_out)
+        attention_mask = self._to_device(attention_mask)
 
         for _ in range(max_new_tokens - 1):
-            best_finished_score = max(score for score, _ in finished)
-            best_active_upper_bound = float(scores.max()) / max_new_tokens
-            if best_finished_score >= best_active_upper_bound:
+            keep = best_scores[alive] < scores.astype(np.float64) / max_new_tokens
+            if not keep.all():
+                done = alive[~keep]
+                results_lengths[done] = np.where(
+                    scores[~keep].astype(np.float64) / (length - 1) > best_scores[done],
+                    length,
+                    best_lengths[done],
+                )
+                kept = np.flatnonzero(keep)
+                if len(kept) == 0:
+                    break
+                alive = alive[kept]
+                scores = scores[kept]
+                self_kv = self._select_rows(self_kv, kept)
+                cross_kv = self._select_rows(cross_kv, kept)
+                enc_out = self._take(enc_out, kept)
+                attention_mask = self._take(attention_mask, kept)
+
+            feed = {
+                "input_ids": tokens[alive, length - 1 : length],
+                "encoder_attention_mask": attention_mask,
+                "encoder_hidden_states": enc_out,
+            }
+            for i in range(self._num_layers):
+                feed[self._past_self_k[i]] = self_kv[self._present_self_k[i]]
+                feed[self._past_self_v[i]] = self_kv[self._present_self_v[i]]
+                feed[self._past_cross_k[i]] = cross_kv[self._present_cross_k[i]]
+                feed[self._past_cross_v[i]] = cross_kv[self._present_cross_v[i]]
+            if self._has_use_cache_branch:
+                feed["use_cache_branch"] = use_cache_branch
+
+            n2o = self._run(feed, self._step_output_names)
+            cand_scores = scores[:, None] + self._log_softmax_2d(
+                n2o["logits"][:, -1, :]
+            )
+
+            # Appending EOS to the active sequence ends it at `length` tokens.
+            eos_scores = cand_scores[:, eos_id].astype(np.float64) / length
+            improved = eos_scores > best_scores[alive]
+            best_scores[alive[improved]] = eos_scores[improved]
+            best_lengths[alive[improved]] = length
+
+            cand_scores[:, eos_id] = -np.inf
+            next_tokens = cand_scores.argmax(axis=1)
+            scores = cand_scores[np.arange(len(alive)), next_tokens]
+            tokens[alive, length] = next_tokens
+            length += 1
+
+            self_kv = {
+                name: n2o[name] for name in self._present_self_k + self._present_self_v
+            }
+        else:
+            results_lengths[alive] = np.where(
+                scores.astype(np.float64) / (length - 1) > best_scores[alive],
+                length,
+                best_lengths[alive],
+            )
+
+        return [tokens[n, 1 : results_lengths[n]].tolist() for n in range(batch_size)]
+
+    def _speculative_batch(
+        self,
+        enc_out: np.ndarray,
+        attention_mask: np.ndarray,
+        max_new_tokens: int,
+        speculative_tokens: int,
+        source_ids: list[np.ndarray] | None = None,
+    ) -> list[list[int]]:
+        """Greedy decoding that verifies drafted tokens in each decoder call.
+
+        Every row feeds its committed tokens that are not in the cache yet,
+        followed by up to ``speculative_tokens`` drafts found by n-gram
+        lookup in its ``source_ids`` and its output so far. The logits of
+        the fed positions are then consumed as ordinary greedy steps, row by
+        row, for as long as the row's drafts agree with the greedy choice,
+        so each row accepts as many drafts as it can on its own.
+
+        All rows share one self-attention cache length, so the cache is cut
+        back to the shortest accepted prefix; rows that got further feed
+        their remaining accepted tokens again on the next call. The decoded
+        tokens are the ones ``_greedy_batch`` returns.
+        """
+        batch_size = attention_mask.shape[0]
+        eos_id = self._tokenizer._eos_id
+        pad_id = self._tokenizer._pad_id
+        if source_ids is None:
+            source_ids = [np.zeros(0, dtype=np.int64)] * batch_size
+        bind = self._binds_reindexed_steps
+
+        n2o, logp = self._first_step(enc_out, attention_mask, bind)
+
+        # tokens[n, :lengths[n]] are the decoder start and the committed
+        # tokens of input n; the cache holds the first `cache_length` of
+        # them for every row.
+        tokens = np.full((batch_size, max_new_tokens + 1), pad_id, dtype=np.int64)
+        lengths = np.full(batch_size, 2, dtype=np.int64)
+        cache_length = 1
+        best_scores = logp[:, eos_id].astype(np.float64)
+        best_lengths = np.ones(batch_size, dtype=np.int64)
+        results_lengths = np.ones(batch_size, dtype=np.int64)
+
+        logp[:, eos_id] = -np.inf
+        next_tokens = logp.argmax(axis=1)
+        scores = logp[np.arange(batch_size), next_tokens]
+        tokens[:, 1] = next_tokens
+
+        self_kv = {
+            name: n2o[name] for name in self._present_self_k + self._present_self_v
+        }
+        cross_kv = {
+            name: n2o[name] for name in self._present_cross_k + self._present_cross_v
+        }
+        alive = np.arange(batch_size)
+        use_cache_branch = np.array([True], dtype=bool)
+        enc_out = self._to_device(enc_out, bind)
+        attention_mask = self._to_device(attention_mask, bind)
+
+        def finish(local: np.ndarray) -> np.ndarray:
+            # The checks at the start of every greedy step: a row ends once
+            # it used up `max_new_tokens` or nothing can beat its best EOS.
+            rows = alive[local]
+            row_scores = scores[local].astype(np.float64)
+            done = (lengths[rows] > max_new_tokens) | (
+                best_scores[rows] >= row_scores / max_new_tokens
+            )
+            ended = rows[done]
+            results_lengths[ended] = np.where(
+                row_scores[done] / (lengths[ended] - 1) > best_scores[ended],
+                lengths[ended],
+                best_lengths[ended],
+            )
+            return done
+
+        done = finish(np.arange(batch_size))
+        while True:
+            if done.any():
+                kept = np.flatnonzero(~done)
+                if len(kept) == 0:
+                    break
+                alive = alive[kept]
+                scores = scores[kept]
+                self_kv = self._select_rows(self_kv, kept)
+                cross_kv = self._select_rows(cross_kv, kept)
+                enc_out = self._take(enc_out, kept)
+                attention_mask = self._take(attention_mask, kept)
+
+            # A row that feeds k drafts may take k + 1 greedy steps.
+            fed = lengths[alive] - cache_length
+            drafts = self._propose_drafts(
+                [source_ids[n] for n in alive],
+                [tokens[n, 1 : lengths[n]] for n in alive],
+                np.minimum(speculative_tokens, max_new_tokens - lengths[alive]),
+            )
+            widths = fed + np.array([len(draft) for draft in drafts], dtype=np.int64)
+            input_ids = np.full((len(alive), widths.max()), pad_id, dtype=np.int64)
+            for i, n in enumerate(alive):
+                input_ids[i, : fed[i]] = tokens[n, cache_length : lengths[n]]
+                input_ids[i, fed[i] : widths[i]] = drafts[i]
+
+            feed = {
+                "input_ids": input_ids,
+                "encoder_attention_mask": attention_mask,
+                "encoder_hidden_states": enc_out,
+            }
+            for i in range(self._num_layers):
+                feed[self._past_self_k[i]] = self_kv[self._present_self_k[i]]
+                feed[self._past_self_v[i]] = self_kv[self._present_self_v[i]]
+                feed[self._past_cross_k[i]] = cross_kv[self._present_cross_k[i]]
+                feed[self._past_cross_v[i]] = cross_kv[self._present_cross_v[i]]
+            if self._has_use_cache_branch:
+                feed["use_cache_branch"] = use_cache_branch
+
+            n2o = self._run(feed, self._step_output_names, bind)
+            self_kv = {
+                name: n2o[name] for name in self._present_self_k + self._present_self_v
+            }
+            window = self._log_softmax_2d(n2o["logits"][:, -input_ids.shape[1] :])
+
+            # position[i] is the fed position whose logits give row i's next
+            # token; rows drop out of `active` at their first wrong draft.
+            position = fed - 1
+            done = np.zeros(len(alive), dtype=bool)
+            active = np.arange(len(alive))
+            while True:
+                rows = alive[active]
+                cand_scores = scores[active, None] + window[active, position[active]]
+
+                # Appending EOS ends the active sequence at its current length.
+                eos_scores = cand_scores[:, eos_id].astype(np.float64) / lengths[rows]
+                improved = eos_scores > best_scores[rows]
+                best_scores[rows[improved]] = eos_scores[improved]
+                best_lengths[rows[improved]] = lengths[rows[improved]]
+
+                cand_scores[:, eos_id] = -np.inf
+                next_tokens = cand_scores.argmax(axis=1)
+                scores[active] = cand_scores[np.arange(len(active)), next_tokens]
+                tokens[rows, lengths[rows]] = next_tokens
+                lengths[rows] += 1
+                position[active] += 1
+
+                step = position[active]
+                accepted = (step < widths[active]) & (
+                    input_ids[active, np.minimum(step, input_ids.shape[1] - 1)]
+                    == next_tokens
+                )
+                active = active[accepted]
+                if len(active) == 0:
+                    break
+                ended = finish(active)
+                done[active[ended]] = True
+                active = active[~ended]
+                if len(active) == 0:
+                    break
+
+            rest = np.flatnonzero(~done)
+            done[rest[finish(rest)]] = True
+            if done.all():
                 break
 
-            last_tokens = np.array([[s[-1]] for s in seqs], dtype=np.int64)
+            # Every fed position before `position` holds an accepted token.
+            valid = int((cache_length + position[~done]).min())
+            if valid < cache_length + input_ids.shape[1]:
+                self_kv = {
+                    name: self._truncate(value, valid)
+                    for name, value in self_kv.items()
+                }
+            cache_length = valid
+        return [tokens[n, 1 : results_lengths[n]].tolist() for n in range(batch_size)]
+
+    def decode_batch(
+        self,
+        enc_out: np.ndarray,
+        attention_mask: np.ndarray,
+        num_beams: int = 4,
+        max_new_tokens: int = 256,
+        speculative_tokens: int = 0,
+        source_ids: list[np.ndarray] | None = None,
+    ) -> list[list[int]]:
+        """Run beam search for a padded batch of encoder outputs.
+
+        The beams of all inputs are flattened into one decoder batch of
+        ``batch_size * num_beams`` rows. Every input keeps its own finished
+        candidates and stops on its own; finished inputs are dropped from
+        the batch so later steps only run the ones still decoding. Each
+        result matches what ``decode`` returns for that input alone.
+
+        ``speculative_tokens`` enables prompt-lookup decoding for
+        ``num_beams=1``: up to that many tokens are drafted from
+        ``source_ids`` (one token array per input) and the output so far,
+        and verified in a single decoder call. The result is the same as
+        plain greedy decoding.
+
+        Returns one list of token ids per input, with the leading
+        decoder-start and trailing EOS stripped.
+        """
+        self.validate_generation_parameters(
+            num_beams, max_new_tokens, speculative_tokens
+        )
+        if num_beams == 1 and speculative_tokens:
+            return self._speculative_batch(
+                enc_out, attention_mask, max_new_tokens, speculative_tokens, source_ids
+            )
+        if num_beams == 1:
+            return self._greedy_batch(enc_out, attention_mask, max_new_tokens)
+
+        batch_size = attention_mask.shape[0]
+        eos_id = self._tokenizer._eos_id
+        start_id = self._tokenizer._pad_id
+        bind = self._binds_reindexed_steps
+
+        n2o, logp = self._first_step(enc_out, attention_mask, bind)
+        vocab_size = logp.shape[1]
+        if num_beams >= vocab_size:
+            raise ValueError(
+                f"num_beams must be smaller than the vocabulary size ({vocab_size})."
+            )
+
+        finished: list[list[tuple[float, list[int]]]] = [
+            [(float(logp[n, eos_id]), [start_id, eos_id])] for n in range(batch_size)
+        ]
+
+        active_logp = logp.copy()
+        active_logp[:, eos_id] = -np.inf
+        top_ids = np.argsort(-active_logp, axis=1, kind="stable")[:, :num_beams]
+
+        seqs = [[[start_id, int(token_id)] for token_id in row] for row in top_ids]
+        scores = np.take_along_axis(active_logp, top_ids, axis=1).astype(np.float32)
+
+        # Row n * num_beams + j of every tensor below belongs to beam j of
+        # input alive[n]. Cross-attention KV is identical for all beams of an
+        # input, so it only needs rows dropped, never reordered.
+        rows = np.repeat(np.arange(batch_size), num_beams)
+        self_kv = {
+            name: self._take(n2o[name], rows)
+            for name in self._present_self_k + self._present_self_v
+        }
+        cross_kv = {
+            name: self._take(n2o[name], rows)
+            for name in self._present_cross_k + self._present_cross_v
+        }
+        enc_out_b = self._to_device(enc_out[rows], bind)
+        enc_mask_b = self._to_device(attention_mask[rows], bind)
+        alive = list(range(batch_size))
+        results: list[list[tuple[float, list[int]]]] = [[] for _ in range(batch_size)]
+
+        for _ in range(max_new_tokens - 1):
+            best_finished = np.array([max(s for s, _ in finished[n]) for n in alive])
+            upper_bound = scores.max(axis=1).astype(np.float64) / max_new_tokens
+            keep = best_finished < upper_bound
+            if not keep.all():
+                for n, beams, beam_scores in zip(alive, seqs, scores):
+                    results[n] = [
+                        (self._normalized_score(score, sequence), sequence)
+                        for score, sequence in zip(beam_scores, beams)
+                    ]
+                kept = np.flatnonzero(keep)
+                if len(kept) == 0:
+                    break
+                alive = [alive[i] for i in kept]
+                seqs = [seqs[i] for i in kept]
+                scores = scores[kept]
+                rows = (kept[:, None] * num_beams + np.arange(num_beams)).reshape(-1)
+                self_kv = self._select_rows(self_kv, rows)
+                cross_kv = self._select_rows(cross_kv, rows)
+                enc_out_b = self._take(enc_out_b, rows)
+                enc_mask_b = self._take(enc_mask_b, rows)
+
+            last_tokens = np.array(
+                [[sequence[-1]] for beams in seqs for sequence in beams],
+                dtype=np.int64,
+            )
             feed = {
                 "input_ids": last_tokens,
                 "encoder_attention_mask": enc_mask_b,
                 "encoder_hidden_states": enc_out_b,
             }
             for i in range(self._num_layers):
-                feed[self._past_self_k[i]] = self_k[i]
-                feed[self._past_self_v[i]] = self_v[i]
-                feed[self._past_cross_k[i]] = cross_k[i]
-                feed[self._past_cross_v[i]] = cross_v[i]
+                feed[self._past_self_k[i]] = self_kv[self._present_self_k[i]]
+                feed[self._past_self_v[i]] = self_kv[self._present_self_v[i]]
+                feed[self._past_cross_k[i]] = cross_kv[self._present_cross_k[i]]
+                feed[self._past_cross_v[i]] = cross_kv[self._present_cross_v[i]]
             if self._has_use_cache_branch:
                 feed["use_cache_branch"] = np.array([True], dtype=bool)
 
-            outs = self._session.run(None, feed)
-            n2o = dict(zip(self._output_names, outs))
-            logits = n2o["logits"][:, -1, :]
-            logp = self._log_softmax_2d(logits)
-
-            cand_scores = scores[:, None] + logp
-
-            for beam_index, sequence in enumerate(seqs):
-                eos_sequence = sequence + [eos_id]
-                finished.append(
-                    (
-                        self._normalized_score(
-                            cand_scores[beam_index, eos_id],
-                            eos_sequence,
-                        ),
-                        eos_sequence,
-                    )
-                )
-
-            active_scores = cand_scores.copy()
-            active_scores[:, eos_id] = -np.inf
-            flat = active_scores.reshape(-1)
-            top_idx = np.argsort(-flat, kind="stable")[:num_beams]
-            beam_idx = top_idx // logp.shape[1]
-            tok_idx = top_idx % logp.shape[1]
-            new_scores = flat[top_idx]
-
-            new_seqs = [
-                seqs[beam_index] + [int(token_id)]
-                for beam_index, token_id in zip(beam_idx, tok_idx)
-            ]
+            n2o = self._run(feed, self._step_output_names, bind)
+            logp = self._log_softmax_2d(n2o["logits"][:, -1, :])
 
-            # Self-attn KV grows every step; take the full updated cache from model output.
-            self_k = [n2o[n][beam_idx] for n in self._present_self_k]
-            self_v = [n2o[n][beam_idx] for n in self._present_self_v]
-            # Cross-attn KV is constant; re-index by selected parent beams.
-            cross_k = [cross_k[i][beam_idx] for i in range(self._num_layers)]
-            cross_v = [cross_v[i][beam_idx] for i in range(self._num_layers)]
+            cand_scores = (scores.reshape(-1)[:, None] + logp).reshape(
+                len(alive), num_beams, vocab_size
+            )
 
-            seqs = new_seqs
-            scores = new_scores
+            for n, beams, beam_scores in zip(alive, seqs, cand_scores):
+                for sequence, eos_score in zip(beams, beam_scores[:, eos_id]):
+                    eos_sequence = sequence + [eos_id]
+                    finished[n].append(
+                        (self._normalized_score(eos_score, eos_sequence), eos_sequence)
+                    )
 
-        candidates = finished + [
-            (self._normalized_score(score, sequence), sequence)
-            for score, sequence in zip(scores, seqs)
-        ]
-        best_seq = max(candidates, key=lambda candidate: candidate[0])[1]
+            active_scores = cand_scores.reshape(len(alive), -1).copy()
+            active_scores[:, eos_id::vocab_size] = -np.inf
+            top_idx = np.argsort(-active_scores, axis=1, kind="stable")[:, :num_beams]
+            beam_idx = top_idx // vocab_size
+            tok_idx = top_idx % vocab_size
+            scores = np.take_along_axis(active_scores, top_idx, axis=1)
 
-        if best_seq and best_seq[0] == start_id:
-            best_seq = best_seq[1:]
-        if best_seq and best_seq[-1] == eos_id:
-            best_seq = best_seq[:-1]
+            seqs = [
+                [beams[b] + [int(token_id)] for b, token_id in zip(parents, tokens)]
+                for beams, parents, tokens in zip(seqs, beam_idx, tok_idx)
+            ]
 
-        return best_seq
+            # Self-attn KV grows every step; take the full updated cache from
+            # model output, re-indexed by the selected parent beams.
+            rows = (np.arange(len(alive))[:, None] * num_beams + beam_idx).reshape(-1)
+            self_kv = {
+                name: self._take(n2o[name], rows)
+                for name in self._present_self_k + self._present_self_v
+            }
+        else:
+            for n, beams, beam_scores in zip(alive, seqs, scores):
+                results[n] = [
+                    (self._normalized_score(score, sequence), sequence)
+                    for score, sequence in zip(beam_scores, beams)
+                ]
+
+        outputs = []
+        for n in range(batch_size):
+            candidates = finished[n] + results[n]
+            best_seq = max(candidates, key=lambda candidate: candidate[0])[1]
+
+            if best_seq and best_seq[0] == start_id:
+                best_seq = best_seq[1:]
+            if best_seq and best_seq[-1] == eos_id:
+                best_seq = best_seq[:-1]
+            outputs.append(best_seq)
+
+        return outputs
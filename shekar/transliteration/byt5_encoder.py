@@ -2,26 +2,33 @@ from pathlib import Path
 
 import onnxruntime as ort
 
+from shekar import runtime
 from shekar.transliteration.byt5_tokenizer import ByT5Tokenizer
-from shekar.utils import get_onnx_providers
 
 
 class ByT5Encoder:
     def __init__(self, model_path: str | Path):
         self._session = self._make_session(Path(model_path))
+        self._release_session = runtime.bind(self, self._session)
         self.tokenizer = ByT5Tokenizer()
 
+    def release(self) -> None:
+        """Return the shared ONNX session to the runtime registry."""
+        self._release_session()
+
     @staticmethod
     def _make_session(path: Path) -> ort.InferenceSession:
         so = ort.SessionOptions()
         so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
         so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
-        return ort.InferenceSession(
-            str(path), sess_options=so, providers=get_onnx_providers()
-        )
+        return runtime.get_session(path, sess_options=so)
 
     def encode(self, text: str) -> tuple:
-        input_ids, attention_mask = self.tokenizer.batch_tokenize([text])
+        return self.encode_batch([text])
+
+    def encode_batch(self, texts: list[str]) -> tuple:
+        """Encode texts as one padded batch; returns hidden states and mask."""
+        input_ids, attention_mask = self.tokenizer.batch_tokenize(texts)
         hidden_states = self._session.run(
             ["last_hidden_state"],
             {"input_ids": input_ids, "attention_mask": attention_mask},
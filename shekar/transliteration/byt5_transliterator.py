@@ -1,21 +1,52 @@
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
 
+import numpy as np
+
+from shekar import runtime
 from shekar.base import BaseTextTransform
 from shekar.hub import Hub
+from shekar.tokenization import SentenceTokenizer
 from shekar.transliteration.byt5_decoder import ByT5Decoder
 from shekar.transliteration.byt5_encoder import ByT5Encoder
+from shekar.transliteration.memo import TransliterationMemo
+
+_WHITESPACE = re.compile(r"(\s+)")
 
 
 class ByT5Transliterator(BaseTextTransform):
+    # Iterables are read and transliterated this many texts at a time.
+    stream_batch_size = 16
+    # Long inputs are cut into sentence chunks of at most this many bytes.
+    _max_chunk_bytes = 256
+    _sentence_pattern = SentenceTokenizer().pattern
+    memo: TransliterationMemo | None = None
+
     def __init__(
         self,
         encoder_path: str | Path | None = None,
         decoder_path: str | Path | None = None,
         num_beams: int = 1,
         max_new_tokens: int = 256,
+        speculative_tokens: int = 0,
+        memo: TransliterationMemo | None = None,
+        stream_batch_size: int = 16,
     ):
         self._direction = None  # to be set by subclasses
-        ByT5Decoder.validate_generation_parameters(num_beams, max_new_tokens)
+        ByT5Decoder.validate_generation_parameters(
+            num_beams, max_new_tokens, speculative_tokens
+        )
+        if (
+            isinstance(stream_batch_size, bool)
+            or not isinstance(stream_batch_size, int)
+            or stream_batch_size < 1
+        ):
+            raise ValueError("stream_batch_size must be a positive integer.")
 
         if encoder_path is None or not Path(encoder_path).exists():
             encoder_path = Hub.get_resource("byt5_tg2fa_encoder_q8.onnx")
@@ -24,12 +55,266 @@ class ByT5Transliterator(BaseTextTransform):
 
         self.encoder = ByT5Encoder(encoder_path)
         self.decoder = ByT5Decoder(decoder_path)
+        self._model_paths = (Path(encoder_path), Path(decoder_path))
         self.num_beams = num_beams
         self.max_new_tokens = max_new_tokens
+        self.speculative_tokens = speculative_tokens
+        self.memo = memo
+        self.stream_batch_size = stream_batch_size
 
-    def _function(self, X: str) -> str:
-        enc_out, attention_mask = self.encoder.encode(f"{self._direction}: {X.strip()}")
-        token_ids = self.decoder.decode(
-            enc_out, attention_mask, self.num_beams, self.max_new_tokens
+    def release(self) -> None:
+        """Return the shared encoder and decoder sessions to the runtime registry."""
+        self.encoder.release()
+        self.decoder.release()
+
+    def transform(self, X: Iterable[str] | str) -> Iterable[str] | str:
+        if isinstance(X, str) or not isinstance(X, Iterable):
+            return super().transform(X)
+        return self._transform_stream(X)
+
+    def _transform_stream(self, X: Iterable[str]) -> Iterator[str]:
+        # Results come out after every `stream_batch_size` inputs, so a slow
+        # or interactive source is not held back waiting for a large buffer.
+        texts = iter(X)
+        while chunk := list(islice(texts, self.stream_batch_size)):
+            yield from self.transform_batch(chunk)
+
+    def transform_batch(
+        self,
+        X: list[str],
+        batch_size: int = 16,
+        max_new_tokens: list[int] | None = None,
+    ) -> list[str]:
+        """Transliterate many texts with batched encoder and decoder calls.
+
+        Texts are sorted by length and processed ``batch_size`` at a time:
+        each group is encoded as one padded batch and decoded with a single
+        beam search over all of its inputs. Results are returned in input
+        order. ``max_new_tokens`` optionally gives every text its own
+        output budget; texts with the same budget are batched together.
+
+        With a ``memo``, texts whose result is already stored are not run
+        through the model, and repeated texts are only transliterated once.
+        Results are stored per ``max_new_tokens`` budget, since the budget
+        bounds the lengths the search compares and can change the output.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        texts = list(X)
+        if not all(isinstance(text, str) for text in texts):
+            raise TypeError("Input must be a string or a Iterable of strings.")
+        texts = [text.strip() for text in texts]
+        if max_new_tokens is None:
+            max_new_tokens = [self.max_new_tokens] * len(texts)
+        if self.memo is None:
+            return self._transliterate(texts, max_new_tokens, batch_size)
+
+        keys = [
+            self._memo_key(text, budget) for text, budget in zip(texts, max_new_tokens)
+        ]
+        found = {key: self.memo.get(key) for key in dict.fromkeys(keys)}
+        missing = {key: row for row, key in enumerate(keys) if found[key] is None}
+        found.update(
+            zip(
+                missing,
+                self._transliterate(
+                    [texts[row] for row in missing.values()],
+                    [max_new_tokens[row] for row in missing.values()],
+                    batch_size,
+                ),
+            )
         )
-        return self.encoder.tokenizer.detokenize(token_ids)
+        self.memo.update({key: found[key] for key in missing})
+        return [found[key] for key in keys]
+
+    def _memo_key(self, text: str, max_new_tokens: int) -> str:
+        # Speculative decoding does not change the output, so it is not
+        # part of the key.
+        return "\x1f".join(
+            (
+                self._direction,
+                str(self.num_beams),
+                str(max_new_tokens),
+                self._model_key,
+                text,
+            )
+        )
+
+    @cached_property
+    def _model_key(self) -> str:
+        return "-".join(runtime.model_sha256(path)[:16] for path in self._model_paths)
+
+    def _transliterate(
+        self, texts: list[str], max_new_tokens: list[int], batch_size: int
+    ) -> list[str]:
+        prompts = [f"{self._direction}: {text}" for text in texts]
+        lengths = [len(prompt.encode("utf-8")) for prompt in prompts]
+        order = np.lexsort((lengths, max_new_tokens))
+
+        groups: list[list[int]] = []
+        for row in order:
+            if (
+                groups
+                and len(groups[-1]) < batch_size
+                and max_new_tokens[groups[-1][0]] == max_new_tokens[row]
+            ):
+                groups[-1].append(row)
+            else:
+                groups.append([row])
+
+        results = [""] * len(prompts)
+        for rows in groups:
+            enc_out, attention_mask = self.encoder.encode_batch(
+                [prompts[row] for row in rows]
+            )
+            source_ids = None
+            if self.speculative_tokens:
+                source_ids = [
+                    self.encoder.tokenizer.tokenize(texts[row]) for row in rows
+                ]
+            token_ids = self.decoder.decode_batch(
+                enc_out,
+                attention_mask,
+                self.num_beams,
+                max_new_tokens[rows[0]],
+                self.speculative_tokens,
+                source_ids,
+            )
+            for row, ids in zip(rows, token_ids):
+                results[row] = self.encoder.tokenizer.detokenize(ids)
+        return results
+
+    def transform_long(
+        self,
+        text: str,
+        batch_size: int = 16,
+        workers: int = 1,
+        unit: str = "sentence",
+    ) -> str:
+        """Transliterate a long text sentence by sentence.
+
+        See ``stream_long``; this returns the whole result at once.
+        """
+        return "".join(self.stream_long(text, batch_size, workers, unit))
+
+    def stream_long(
+        self,
+        text: str,
+        batch_size: int = 16,
+        workers: int = 1,
+        unit: str = "sentence",
+    ) -> Iterator[str]:
+        """Transliterate a long text in sentence chunks, yielding output in order.
+
+        The text is split at ``SentenceTokenizer`` boundaries, and sentences
+        longer than ``_max_chunk_bytes`` are cut between words, so no chunk
+        hits the quadratic attention cost or the output limit of one long
+        sequence. Every chunk gets a ``max_new_tokens`` budget derived from
+        its length. Chunks are transliterated ``batch_size`` at a time, on
+        ``workers`` threads when more than one is given, and each chunk's
+        output is yielded with the whitespace that followed it as soon as
+        all chunks before it are done.
+
+        With ``unit="word"`` every word is a chunk of its own. Words lose
+        the context of their sentence, but recurring ones are looked up in
+        the ``memo`` instead of being transliterated again. Chunk budgets
+        differ from ``self.max_new_tokens``, so these entries are not shared
+        with ``transform_batch`` calls on the same text.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if workers < 1:
+            raise ValueError("workers must be a positive integer.")
+        if unit not in {"sentence", "word"}:
+            raise ValueError("unit must be 'sentence' or 'word'.")
+
+        pieces = self._split_chunks(text, by_word=unit == "word")
+        chunks, spaces = pieces[1::2], pieces[2::2]
+        groups = [
+            chunks[start : start + batch_size]
+            for start in range(0, len(chunks), batch_size)
+        ]
+
+        yield pieces[0]
+        # Only `workers` groups are in flight, so a consumer that stops
+        # reading does not pay for the rest of the text.
+        pool = ThreadPoolExecutor(max_workers=workers)
+        pending: deque[Future] = deque()
+        groups = iter(groups)
+        try:
+            for group in islice(groups, workers):
+                pending.append(
+                    pool.submit(self._transliterate_chunks, group, batch_size)
+                )
+            index = 0
+            while pending:
+                group_outputs = pending.popleft().result()
+                for group in islice(groups, 1):
+                    pending.append(
+                        pool.submit(self._transliterate_chunks, group, batch_size)
+                    )
+                for output in group_outputs:
+                    yield output + spaces[index]
+                    index += 1
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _transliterate_chunks(self, chunks: list[str], batch_size: int) -> list[str]:
+        budgets = [self._chunk_budget(chunk) for chunk in chunks]
+        return self.transform_batch(chunks, batch_size, budgets)
+
+    def _split_chunks(self, text: str, by_word: bool = False) -> list[str]:
+        """Split text into ``[space, chunk, space, ..., chunk, space]``.
+
+        Joining the list gives back ``text``. Chunks never span a sentence
+        boundary or a line break, and stay within ``_max_chunk_bytes``
+        unless a single word is longer. With ``by_word`` every word is a
+        chunk.
+        """
+        pieces = [""]
+        parts = self._sentence_pattern.split(text)
+        for start in range(0, len(parts), 2):
+            first = len(pieces)
+            sentence = "".join(parts[start : start + 2])
+            for i, token in enumerate(_WHITESPACE.split(sentence)):
+                if not token:
+                    continue
+                if i % 2:
+                    if len(pieces) % 2:
+                        pieces[-1] += token
+                    else:
+                        pieces.append(token)
+                elif len(pieces) % 2 == 0:
+                    # A sentence that starts right after the previous one.
+                    pieces += ["", token]
+                elif (
+                    not by_word
+                    and len(pieces) - 2 >= first
+                    and "\n" not in pieces[-1]
+                    and self._fits(pieces[-2] + pieces[-1] + token)
+                ):
+                    pieces[-2:] = [pieces[-2] + pieces[-1] + token]
+                else:
+                    pieces.append(token)
+        if len(pieces) % 2 == 0:
+            pieces.append("")
+        return pieces
+
+    def _fits(self, chunk: str) -> bool:
+        return len(chunk.encode("utf-8")) <= self._max_chunk_bytes
+
+    @staticmethod
+    def _chunk_budget(chunk: str) -> int:
+        """A ``max_new_tokens`` budget for a chunk, rounded up to 64 bytes.
+
+        Letters take two bytes in both scripts and Tajik spells out the
+        vowels Persian omits, so twice the input length leaves headroom.
+        Rounding keeps the number of distinct budgets, and so of batches,
+        small.
+        """
+        budget = 2 * len(chunk.encode("utf-8")) + 16
+        return -(-budget // 64) * 64
+
+    def _function(self, X: str) -> str:
+        return self.transform_batch([X])[0]
@@ -0,0 +1,158 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+
+
+def _is_positive_int(value) -> bool:
+    return not isinstance(value, bool) and isinstance(value, int) and value >= 1
+
+
+class TransliterationMemo:
+    """
+    A bounded LRU of transliteration results with an optional disk tier.
+
+    The ``max_size`` most recently used entries are kept in memory. When
+    ``path`` is given, every entry is also written to an SQLite file there,
+    so results survive restarts and can be shared between processes; a
+    memory miss that is found on disk is moved back into memory. The file
+    keeps at most ``max_disk_size`` entries (``None`` for no limit) and
+    drops the ones used least recently when it grows past that. Keys are
+    built by the transliterator from the direction, the input text, the
+    generation settings and the model hash, so one memo can be shared by
+    several transliterators. The memo is safe to use from several threads.
+
+    ``hits`` and ``misses`` count lookups; ``disk_hits`` counts the hits
+    that were served from the disk tier.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100_000,
+        path: str | Path | None = None,
+        max_disk_size: int | None = 1_000_000,
+    ):
+        if not _is_positive_int(max_size):
+            raise ValueError("max_size must be a positive integer.")
+        if max_disk_size is not None and not _is_positive_int(max_disk_size):
+            raise ValueError("max_disk_size must be a positive integer or None.")
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.path = None if path is None else Path(path).expanduser()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        # Keys served from memory since the last write; their disk access
+        # times are refreshed with the next write instead of one by one.
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
+        self._db = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memo "
+                "(key TEXT PRIMARY KEY, value TEXT, used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS memo_used ON memo (used)")
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        """Return the stored result for ``key``, or ``None``."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                if self._db is not None:
+                    self._used.add(key)
+                self.hits += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM memo WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE memo SET used = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def update(self, entries: Mapping[str, str]) -> None:
+        """Store several results, with one disk write for all of them."""
+        with self._lock:
+            for key, value in entries.items():
+                self._remember(key, value)
+            if self._db is not None and entries:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE memo SET used = ? WHERE key = ?",
+                    ((now, key) for key in self._used.difference(entries)),
+                )
+                self._used.clear()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO memo (key, value, used) VALUES (?, ?, ?)",
+                    ((key, value, now) for key, value in entries.items()),
+                )
+                self._evict()
+                self._db.commit()
+
+    def put(self, key: str, value: str) -> None:
+        self.update({key: value})
+
+    def _remember(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _evict(self) -> None:
+        if self.max_disk_size is None:
+            return
+        (count,) = self._db.execute("SELECT COUNT(*) FROM memo").fetchone()
+        if count > self.max_disk_size:
+            self._db.execute(
+                "DELETE FROM memo WHERE key IN "
+                "(SELECT key FROM memo ORDER BY used, rowid LIMIT ?)",
+                (count - self.max_disk_size,),
+            )
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit and miss counters and the in-memory size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Drop all entries, on disk too, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._used.clear()
+            self.hits = self.misses = self.disk_hits = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM memo")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the disk tier; the in-memory entries stay usable."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
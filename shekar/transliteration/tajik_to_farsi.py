@@ -1,4 +1,5 @@
 from shekar.transliteration.byt5_transliterator import ByT5Transliterator
+from shekar.transliteration.memo import TransliterationMemo
 
 
 class TajikToFarsi(ByT5Transliterator):
@@ -8,6 +9,17 @@ class TajikToFarsi(ByT5Transliterator):
         decoder_path: str | None = None,
         num_beams: int = 1,
         max_new_tokens: int = 256,
+        speculative_tokens: int = 0,
+        memo: TransliterationMemo | None = None,
+        stream_batch_size: int = 16,
     ):
-        super().__init__(encoder_path, decoder_path, num_beams, max_new_tokens)
+        super().__init__(
+            encoder_path,
+            decoder_path,
+            num_beams,
+            max_new_tokens,
+            speculative_tokens,
+            memo,
+            stream_batch_size,
+        )
         self._direction = "tg2fa"
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+
+from shekar import data
+
+# Self time of the shekar.data module itself, in microseconds, as reported by
+# `python -X importtime`. Parsing the lexicons eagerly costs well over 100ms.
+IMPORT_BUDGET_US = 50_000
+
+
+def test_import_stays_under_budget_and_loads_no_lexicon():
+    script = (
+        "import shekar.data as d;print(sorted(set(d._lazy_loaders) & set(vars(d))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+    self_times = [
+        int(line.split("|")[0].split(":")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+        and line.split("|")[-1].strip() == "shekar.data"
+    ]
+    assert self_times
+    assert max(self_times) < IMPORT_BUDGET_US
+    assert result.stdout.strip() == "[]"
+
+
+def test_lexicons_load_on_first_access():
+    assert "stop" not in data.stopwords
+    assert "و" in data.stopwords
+    assert isinstance(data.verbs, set)
+    assert data.loanwords and data.compound_words and data.offensive_words
+    assert data.stopwords is data.stopwords
+
+
+def test_vocab_counts_are_shifted_by_min_count():
+    assert isinstance(data.min_count, int)
+    assert min(data.vocab.values()) == 0
+    for keyword in list(data.informal_words)[:10]:
+        assert keyword in data.vocab
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError, match="has no attribute 'not_a_lexicon'"):
+        _ = data.not_a_lexicon
+
+    assert "vocab" in dir(data)
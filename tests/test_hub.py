@@ -464,3 +464,76 @@ def test_tqdm_up_to_updates_and_sets_total():
     assert t.total == 200
     assert t.n - n_before == 30
     t.close()
+
+
+def test_is_verified_writes_sidecar_and_skips_rehash(monkeypatch, tmp_path: Path):
+    p = tmp_path / "model.bin"
+    p.write_bytes(b"abc")
+    expected = hashlib.sha256(b"abc").hexdigest()
+
+    assert Hub.is_verified(p, expected) is True
+    assert Hub.get_verification_path(p).exists()
+
+    hash_mock = mock.Mock(return_value="should-not-be-used")
+    monkeypatch.setattr(Hub, "compute_sha256_hash", hash_mock)
+    assert Hub.is_verified(p, expected) is True
+    hash_mock.assert_not_called()
+
+
+def test_is_verified_rehashes_when_file_changes(tmp_path: Path):
+    p = tmp_path / "model.bin"
+    p.write_bytes(b"abc")
+    expected = hashlib.sha256(b"abc").hexdigest()
+    assert Hub.is_verified(p, expected) is True
+
+    p.write_bytes(b"abcd")
+    assert Hub.is_verified(p, expected) is False
+
+
+def test_is_verified_rejects_sidecar_for_other_hash(tmp_path: Path):
+    p = tmp_path / "model.bin"
+    p.write_bytes(b"abc")
+    Hub.write_verification(p, "stalehash")
+
+    assert Hub.is_verified(p, hashlib.sha256(b"abc").hexdigest()) is True
+    assert Hub.is_verified(p, "stalehash") is False
+
+
+def test_is_verified_ignores_corrupt_sidecar(tmp_path: Path):
+    p = tmp_path / "model.bin"
+    p.write_bytes(b"abc")
+    Hub.get_verification_path(p).write_text("{not json")
+
+    assert Hub.is_verified(p, hashlib.sha256(b"abc").hexdigest()) is True
+
+
+def test_is_verified_full_mode_always_rehashes(monkeypatch, tmp_path: Path):
+    p = tmp_path / "model.bin"
+    p.write_bytes(b"abc")
+    expected = hashlib.sha256(b"abc").hexdigest()
+    assert Hub.is_verified(p, expected) is True
+
+    monkeypatch.setenv("SHEKAR_VERIFY", "full")
+    hash_mock = mock.Mock(return_value=expected)
+    monkeypatch.setattr(Hub, "compute_sha256_hash", hash_mock)
+    assert Hub.is_verified(p, expected) is True
+    hash_mock.assert_called_once_with(p)
+
+
+def test_get_resource_records_verification_after_download(monkeypatch, tmp_path: Path):
+    fname = "albert_persian_tokenizer.json"
+    monkeypatch.setattr(Path, "home", _fake_home(tmp_path))
+
+    def fake_download_from_mirrors(_, dest_path, __):
+        dest_path.write_bytes(b"model bytes")
+        return True
+
+    monkeypatch.setattr(Hub, "download_from_mirrors", fake_download_from_mirrors)
+    Hub.get_resource(fname)
+
+    hash_mock = mock.Mock()
+    monkeypatch.setattr(Hub, "compute_sha256_hash", hash_mock)
+    result = Hub.get_resource(fname)
+    assert result == tmp_path / ".shekar" / fname
+    hash_mock.assert_not_called()
+    assert not list((tmp_path / ".shekar").glob("*.tmp"))
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+import shekar
+
+
+def test_import_does_not_load_heavy_dependencies():
+    script = (
+        "import sys, shekar;"
+        "print(sorted(m for m in ('onnxruntime', 'sentencepiece', 'flashtext',"
+        " 'numpy', 'shekar.data', 'shekar.ner') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("name", [n for n in shekar.__all__ if n != "__version__"])
+def test_public_names_resolve_lazily(name):
+    obj = getattr(shekar, name)
+    assert obj.__name__ == name
+    assert name in vars(shekar)
+    assert name in dir(shekar)
+
+
+def test_subpackages_are_reachable_as_attributes():
+    assert shekar.preprocessing.AlphabetNormalizer
+    assert shekar.data.ZWNJ == "‌"
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError, match="has no attribute 'NotAThing'"):
+        _ = shekar.NotAThing
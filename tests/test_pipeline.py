@@ -1,10 +1,17 @@
 import pytest
 
+from shekar.normalizer import Normalizer
 from shekar.pipeline import Pipeline
 from shekar.preprocessing import (
+    AlphabetNormalizer,
+    ArabicUnicodeNormalizer,
+    DiacriticRemover,
+    DigitNormalizer,
+    DigitRemover,
     EmojiRemover,
     HTMLTagRemover,
     NonPersianRemover,
+    PunctuationNormalizer,
     PunctuationRemover,
 )
 
@@ -145,3 +152,64 @@ def test_pipeline_repr(mock_pipeline):
         repr(mock_pipeline)
         == "Pipeline(steps=[('EmojiMasker', EmojiMasker()), ('PunctuationMasker', PunctuationMasker())])"
     )
+
+
+def test_pipeline_compile_fuses_adjacent_translations():
+    pipeline = Pipeline(
+        [
+            AlphabetNormalizer(),
+            DigitNormalizer(),
+            PunctuationNormalizer(),
+            EmojiRemover(),
+            DiacriticRemover(),
+            PunctuationRemover(),
+            DigitRemover(),
+        ]
+    )
+    compiled = pipeline.compile()
+
+    assert [name for name, _ in compiled.steps] == [
+        "AlphabetNormalizer+DigitNormalizer+PunctuationNormalizer",
+        "EmojiMasker",
+        "DiacriticMasker+PunctuationMasker",
+        "DigitMasker",
+    ]
+    assert len(pipeline.steps) == 7
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "  ۿدف ما ػمګ بۃ ێڪډيڱڕ إښټ!  ",
+        "فارسی شکر است❕نوشته کیست? 1𝟮3٤٥⓺ ﷽ ﷼",
+        "کُجا نِشانِ قَدَم ناتَمام خواهَد ماند؟ 🌹 ⑽ ⁉",
+        "  ۱۲۳ سلام، دنیا؛ 456  ",
+    ],
+)
+def test_pipeline_compile_preserves_output(text):
+    pipeline = Pipeline(
+        [
+            AlphabetNormalizer(),
+            ArabicUnicodeNormalizer(),
+            DigitNormalizer(),
+            PunctuationNormalizer(),
+            DiacriticRemover(),
+            PunctuationRemover(mask_token=" "),
+            DigitRemover(),
+            Pipeline([PunctuationNormalizer(), EmojiRemover()]),
+        ]
+    )
+    compiled = pipeline.compile()
+    assert compiled(text) == pipeline(text)
+    assert list(compiled.transform([text, text])) == [pipeline(text)] * 2
+
+
+def test_normalizer_default_steps_are_compiled():
+    fused_name, fused = Normalizer().steps[0]
+    assert fused_name == (
+        "AlphabetNormalizer+ArabicUnicodeNormalizer+DigitNormalizer"
+        "+PunctuationNormalizer+DiacriticRemover"
+    )
+    text = "ۿدف ما ػمګ بۃ ێڪډيڱڕ إښټ❕ 1𝟮3 کُجا"
+    assert fused(text) == Pipeline(fused.steps)(text)
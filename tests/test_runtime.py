@@ -0,0 +1,649 @@
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import onnxruntime as ort
+import pytest
+
+from shekar import runtime
+from shekar.dep_parsing import DependencyParser
+from shekar.dep_parsing.albert_dep_parser import AlbertDepParser
+from shekar.ner import NER
+from shekar.ner.albert_ner import AlbertNER
+from shekar.pos import POSTagger
+from shekar.pos.albert_pos import AlbertPOS
+from shekar.runtime import ResourceRegistry
+from shekar.tokenization import AlbertTokenizer
+
+
+class _Resource:
+    pass
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    created = []
+
+    class FakeSession:
+        def __init__(self, path, sess_options=None, providers=None):
+            self.path = path
+            self.sess_options = sess_options
+            self.providers = providers
+            created.append(self)
+
+    monkeypatch.setattr(runtime, "registry", ResourceRegistry())
+    monkeypatch.setattr(runtime.ort, "InferenceSession", FakeSession)
+    monkeypatch.setenv("SHEKAR_OPTIMIZED_CACHE", "0")
+    return created
+
+
+def test_acquire_returns_shared_instance():
+    registry = ResourceRegistry()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return _Resource()
+
+    first = registry.acquire("key", factory)
+    second = registry.acquire("key", factory)
+
+    assert first is second
+    assert len(calls) == 1
+    assert registry.refcount(first) == 2
+    assert len(registry) == 1
+
+
+def test_release_drops_resource_at_zero_references():
+    registry = ResourceRegistry()
+    resource = registry.acquire("key", _Resource)
+    registry.acquire("key", _Resource)
+
+    assert registry.release(resource)
+    assert registry.refcount(resource) == 1
+    assert registry.release(resource)
+    assert registry.refcount(resource) == 0
+    assert len(registry) == 0
+    assert not registry.release(resource)
+
+    assert registry.acquire("key", _Resource) is not resource
+
+
+def test_release_ignores_untracked_objects():
+    registry = ResourceRegistry()
+    assert not registry.release(_Resource())
+
+
+def test_failed_factory_does_not_poison_the_key():
+    registry = ResourceRegistry()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        registry.acquire("key", failing)
+
+    assert len(registry) == 0
+    resource = registry.acquire("key", _Resource)
+    assert registry.refcount(resource) == 1
+
+
+def test_concurrent_acquire_builds_once():
+    registry = ResourceRegistry()
+    barrier = threading.Barrier(8)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return _Resource()
+
+    def worker(_):
+        barrier.wait()
+        return registry.acquire("key", factory)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(worker, range(8)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert registry.refcount(results[0]) == 8
+
+
+def test_get_session_is_keyed_by_path_providers_and_options(
+    fake_sessions, tmp_path: Path
+):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"")
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = 2
+
+    first = runtime.get_session(model, providers=["CPUExecutionProvider"])
+    same = runtime.get_session(str(model), providers=["CPUExecutionProvider"])
+    other_options = runtime.get_session(
+        model, providers=["CPUExecutionProvider"], sess_options=options
+    )
+
+    assert first is same
+    assert other_options is not first
+    assert len(fake_sessions) == 2
+    assert first.path == str(model.resolve())
+    assert first.providers == ["CPUExecutionProvider"]
+
+    equal_options = ort.SessionOptions()
+    equal_options.intra_op_num_threads = 2
+    assert (
+        runtime.get_session(
+            model, providers=["CPUExecutionProvider"], sess_options=equal_options
+        )
+        is other_options
+    )
+
+
+def test_bind_releases_when_owner_is_collected(monkeypatch):
+    registry = ResourceRegistry()
+    monkeypatch.setattr(runtime, "registry", registry)
+    resource = registry.acquire("key", _Resource)
+
+    class Owner:
+        pass
+
+    owner = Owner()
+    runtime.bind(owner, resource)
+    del owner
+    gc.collect()
+
+    assert registry.refcount(resource) == 0
+
+
+def test_bind_finalizer_releases_once(fake_sessions, tmp_path: Path):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"")
+
+    class Owner:
+        pass
+
+    owner = Owner()
+    session = runtime.get_session(model)
+    runtime.get_session(model)
+    finalizer = runtime.bind(owner, session)
+
+    finalizer()
+    finalizer()
+
+    assert runtime.registry.refcount(session) == 1
+
+
+@pytest.fixture
+def thread_state(monkeypatch):
+    pool_calls = []
+    monkeypatch.setattr(runtime, "_thread_settings", {})
+    monkeypatch.setattr(runtime, "_global_pool_sizes", None)
+    monkeypatch.setattr(
+        runtime.ort,
+        "set_global_thread_pool_sizes",
+        lambda intra, inter: pool_calls.append((intra, inter)),
+    )
+    for name in (
+        "SHEKAR_INTRA_OP_THREADS",
+        "SHEKAR_INTER_OP_THREADS",
+        "SHEKAR_GLOBAL_THREAD_POOL",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    return pool_calls
+
+
+def test_default_thread_settings_leave_onnxruntime_defaults(thread_state):
+    options = runtime.apply_thread_settings()
+
+    assert options.intra_op_num_threads == 0
+    assert options.inter_op_num_threads == 0
+    assert options.use_per_session_threads
+    assert thread_state == []
+
+
+def test_configure_threads_sets_per_session_budget(
+    thread_state, fake_sessions, tmp_path: Path
+):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"")
+
+    runtime.configure_threads(intra_op_num_threads=2, inter_op_num_threads=1)
+    session = runtime.get_session(model)
+
+    assert session.sess_options.intra_op_num_threads == 2
+    assert session.sess_options.inter_op_num_threads == 1
+    assert thread_state == []
+
+
+def test_explicit_session_options_take_precedence(thread_state):
+    runtime.configure_threads(intra_op_num_threads=2)
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = 6
+
+    assert runtime.apply_thread_settings(options).intra_op_num_threads == 6
+
+
+def test_thread_settings_from_environment(thread_state, monkeypatch):
+    monkeypatch.setenv("SHEKAR_INTRA_OP_THREADS", "3")
+    monkeypatch.setenv("SHEKAR_INTER_OP_THREADS", "1")
+
+    options = runtime.apply_thread_settings()
+
+    assert options.intra_op_num_threads == 3
+    assert options.inter_op_num_threads == 1
+
+    runtime.configure_threads(intra_op_num_threads=1)
+    assert runtime.thread_settings()["intra_op_num_threads"] == 1
+
+
+def test_invalid_thread_settings_are_rejected(thread_state, monkeypatch):
+    with pytest.raises(ValueError, match="intra_op_num_threads"):
+        runtime.configure_threads(intra_op_num_threads=-1)
+    with pytest.raises(ValueError, match="inter_op_num_threads"):
+        runtime.configure_threads(inter_op_num_threads=1.5)
+
+    monkeypatch.setenv("SHEKAR_INTRA_OP_THREADS", "many")
+    with pytest.raises(ValueError, match="SHEKAR_INTRA_OP_THREADS"):
+        runtime.thread_settings()
+
+
+def test_global_thread_pool_is_created_once(thread_state, monkeypatch):
+    monkeypatch.setenv("SHEKAR_GLOBAL_THREAD_POOL", "1")
+    monkeypatch.setenv("SHEKAR_INTRA_OP_THREADS", "4")
+
+    first = runtime.apply_thread_settings()
+    second = runtime.apply_thread_settings()
+
+    assert not first.use_per_session_threads
+    assert not second.use_per_session_threads
+    assert thread_state == [(4, 0)]
+
+    with pytest.raises(RuntimeError, match="cannot be resized"):
+        runtime.configure_threads(intra_op_num_threads=2, global_thread_pool=True)
+    runtime.configure_threads(intra_op_num_threads=4, global_thread_pool=True)
+
+
+@pytest.fixture
+def add_model(tmp_path: Path, monkeypatch) -> Path:
+    onnx = pytest.importorskip("onnx")
+    helper = onnx.helper
+    x = helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None, 4])
+    y = helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [None, 4])
+    one = helper.make_tensor("one", onnx.TensorProto.FLOAT, [4], [1.0] * 4)
+    two = helper.make_tensor("two", onnx.TensorProto.FLOAT, [4], [2.0] * 4)
+    graph = helper.make_graph(
+        [
+            helper.make_node("Add", ["one", "two"], ["three"]),
+            helper.make_node("Add", ["x", "three"], ["y"]),
+        ],
+        "add",
+        [x],
+        [y],
+        [one, two],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    path = tmp_path / "model" / "add.onnx"
+    path.parent.mkdir()
+    onnx.save(model, path)
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.delenv("SHEKAR_OPTIMIZED_CACHE", raising=False)
+    monkeypatch.setattr(runtime, "registry", ResourceRegistry())
+    return path
+
+
+def _run_add(session) -> np.ndarray:
+    return session.run(["y"], {"x": np.zeros((1, 4), dtype=np.float32)})[0]
+
+
+def test_optimized_graph_is_saved_and_reused(add_model: Path, monkeypatch):
+    session = runtime.get_session(add_model, providers=["CPUExecutionProvider"])
+    cached = list(runtime.optimized_cache_dir().glob("add.*.onnx"))
+
+    assert len(cached) == 1
+    assert _run_add(session).tolist() == [[3.0] * 4]
+    runtime.release(session)
+
+    loaded = []
+    original = ort.InferenceSession
+
+    def tracking_session(path, *args, **kwargs):
+        loaded.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(runtime.ort, "InferenceSession", tracking_session)
+    session = runtime.get_session(add_model, providers=["CPUExecutionProvider"])
+
+    assert loaded == [str(cached[0])]
+    assert _run_add(session).tolist() == [[3.0] * 4]
+
+
+def test_cache_miss_keeps_the_session_that_saved_the_graph(
+    add_model: Path, monkeypatch
+):
+    built = []
+    original = ort.InferenceSession
+
+    def tracking_session(path, *args, **kwargs):
+        built.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(runtime.ort, "InferenceSession", tracking_session)
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    session = runtime.get_session(
+        add_model, providers=["CPUExecutionProvider"], sess_options=options
+    )
+
+    assert built == [str(add_model)]
+    assert len(list(runtime.optimized_cache_dir().glob("add.*.onnx"))) == 1
+    assert _run_add(session).tolist() == [[3.0] * 4]
+
+
+def test_model_hash_is_computed_once_per_file_version(add_model: Path, monkeypatch):
+    hashed = []
+    original = runtime.Hub.compute_sha256_hash
+
+    def counting_hash(path, *args, **kwargs):
+        hashed.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(runtime.Hub, "compute_sha256_hash", counting_hash)
+    monkeypatch.setattr(runtime, "_model_hashes", {})
+    first = runtime.model_sha256(add_model)
+    # A new process reads the verification record written next to the model.
+    monkeypatch.setattr(runtime, "_model_hashes", {})
+
+    assert runtime.model_sha256(add_model) == first
+    assert len(hashed) == 1
+    # The record of a custom model is kept in the cache, not next to it.
+    assert not runtime.Hub.get_verification_path(add_model).exists()
+    assert list(add_model.parent.iterdir()) == [add_model]
+    assert len(list((runtime.optimized_cache_dir() / "hashes").iterdir())) == 1
+
+    add_model.write_bytes(add_model.read_bytes() + b"\0")
+    assert runtime.model_sha256(add_model) != first
+    assert len(hashed) == 2
+
+
+def test_optimized_graph_key_depends_on_options(add_model: Path):
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    providers = ["CPUExecutionProvider"]
+
+    default_path = runtime.optimized_model_path(
+        add_model, providers, ort.SessionOptions()
+    )
+    basic_path = runtime.optimized_model_path(add_model, providers, options)
+
+    assert default_path != basic_path
+    assert default_path == runtime.optimized_model_path(
+        add_model, providers, ort.SessionOptions()
+    )
+
+
+def test_unusable_optimized_graph_falls_back_to_model(add_model: Path):
+    cached = runtime.optimized_model_path(
+        add_model, ["CPUExecutionProvider"], ort.SessionOptions()
+    )
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    cached.write_bytes(b"not a model")
+
+    session = runtime.get_session(add_model, providers=["CPUExecutionProvider"])
+
+    assert _run_add(session).tolist() == [[3.0] * 4]
+    assert not cached.exists()
+
+
+def test_optimized_graph_cache_can_be_disabled(add_model: Path, monkeypatch):
+    monkeypatch.setenv("SHEKAR_OPTIMIZED_CACHE", "0")
+
+    session = runtime.get_session(add_model, providers=["CPUExecutionProvider"])
+
+    assert _run_add(session).tolist() == [[3.0] * 4]
+    assert not runtime.optimized_cache_dir().exists()
+
+
+class _Model:
+    def __init__(self):
+        self.calls = []
+        self.released = False
+
+    def transform_batch(self, texts, batch_size=32):
+        self.calls.append(texts)
+        return texts
+
+    def release(self):
+        self.released = True
+
+
+def test_lazy_model_builds_on_first_use():
+    builds = []
+
+    def factory():
+        builds.append(1)
+        return _Model()
+
+    lazy = runtime.LazyModel(factory)
+
+    assert not lazy.loaded
+    assert builds == []
+    model = lazy.get()
+    assert lazy.get() is model
+    assert lazy.loaded
+    assert builds == [1]
+
+
+def test_lazy_model_preload_warms_up_in_background():
+    started = threading.Event()
+    proceed = threading.Event()
+
+    def factory():
+        started.set()
+        proceed.wait(5)
+        return _Model()
+
+    lazy = runtime.LazyModel(
+        factory, warmup=lambda model: model.transform_batch([runtime.WARMUP_TEXT])
+    )
+    future = lazy.preload()
+
+    assert started.wait(5)
+    assert not future.done()
+    proceed.set()
+    model = future.result(5)
+
+    assert lazy.get() is model
+    assert model.calls == [[runtime.WARMUP_TEXT]]
+
+
+def test_lazy_model_preload_reports_errors_and_retries():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("download failed")
+        return _Model()
+
+    lazy = runtime.LazyModel(factory)
+
+    with pytest.raises(RuntimeError, match="download failed"):
+        lazy.preload(warmup=False).result(5)
+    assert not lazy.loaded
+    assert isinstance(lazy.get(), _Model)
+
+
+def test_lazy_model_release_only_touches_built_models():
+    lazy = runtime.LazyModel(_Model)
+    lazy.release()
+
+    model = lazy.get()
+    lazy.release()
+
+    assert model.released
+
+
+def test_lazy_model_rebuilds_after_release():
+    proceed = threading.Event()
+
+    def factory():
+        proceed.wait(5)
+        return _Model()
+
+    lazy = runtime.LazyModel(factory)
+    first = lazy.preload(warmup=False)
+    assert lazy.preload(warmup=False) is first
+    proceed.set()
+    released = first.result(5)
+
+    lazy.release()
+    assert released.released
+    assert not lazy.loaded
+    assert lazy._preload is None
+
+    model = lazy.get()
+    assert model is not released
+    assert not model.released
+    assert lazy.loaded
+    again = lazy.preload(warmup=False)
+    assert again is not first
+    assert again.result(5) is model
+
+
+LAZY_COMPONENTS = pytest.mark.parametrize(
+    ("component", "model_class"),
+    [(NER, AlbertNER), (POSTagger, AlbertPOS), (DependencyParser, AlbertDepParser)],
+)
+
+
+@LAZY_COMPONENTS
+def test_lazy_component_defers_model_loading(component, model_class):
+    with patch.object(model_class, "__init__", return_value=None) as mock_init:
+        wrapper = component(lazy=True)
+        mock_init.assert_not_called()
+
+        assert isinstance(wrapper.model, model_class)
+        assert isinstance(wrapper.model, model_class)
+        mock_init.assert_called_once()
+
+
+@LAZY_COMPONENTS
+def test_lazy_component_preload_warms_up_model(component, model_class):
+    with (
+        patch.object(model_class, "__init__", return_value=None),
+        patch.object(model_class, "transform_batch") as mock_transform_batch,
+    ):
+        wrapper = component(lazy=True)
+        model = wrapper.preload().result(timeout=60)
+
+    assert model is wrapper.model
+    mock_transform_batch.assert_called_once_with([runtime.WARMUP_TEXT])
+
+
+@LAZY_COMPONENTS
+def test_component_model_can_be_replaced(component, model_class):
+    with patch.object(model_class, "__init__", return_value=None):
+        wrapper = component(lazy=True)
+    replacement = _Model()
+
+    wrapper.model = replacement
+
+    assert wrapper.model is replacement
+    assert wrapper.transform_batch(["سلام"]) == ["سلام"]
+    wrapper.release()
+    assert replacement.released
+
+
+def test_io_binding_runner_matches_session_run(add_model: Path):
+    session = ort.InferenceSession(str(add_model), providers=["CPUExecutionProvider"])
+    runner = runtime.IOBindingRunner(session)
+    rng = np.random.default_rng(0)
+
+    for rows in (2, 3, 2, 2):
+        x = rng.standard_normal((rows, 4)).astype(np.float32)
+        expected = session.run(None, {"x": x})
+        outputs = runner.run(None, {"x": x})
+        np.testing.assert_allclose(outputs[0], expected[0])
+
+
+def test_io_binding_runner_reuses_buffers_per_shape(add_model: Path):
+    session = ort.InferenceSession(str(add_model), providers=["CPUExecutionProvider"])
+    runner = runtime.IOBindingRunner(session, max_buckets=1)
+    x = np.zeros((2, 4), dtype=np.float32)
+
+    first = runner.run(["y"], {"x": x})[0]
+    second = runner.run(["y"], {"x": x + 1})[0]
+
+    assert second is first
+    assert second.tolist() == [[4.0] * 4] * 2
+
+    runner.run(["y"], {"x": np.zeros((3, 4), dtype=np.float32)})
+    assert runner.run(["y"], {"x": x})[0] is not first
+
+
+def test_io_binding_padding_reuses_buffers_across_lengths(tmp_path: Path, monkeypatch):
+    onnx = pytest.importorskip("onnx")
+    helper = onnx.helper
+    ids = helper.make_tensor_value_info(
+        "input_ids", onnx.TensorProto.INT64, [None, None]
+    )
+    out = helper.make_tensor_value_info("out", onnx.TensorProto.FLOAT, [None, None])
+    graph = helper.make_graph(
+        [helper.make_node("Cast", ["input_ids"], ["out"], to=onnx.TensorProto.FLOAT)],
+        "cast",
+        [ids],
+        [out],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    path = tmp_path / "cast.onnx"
+    onnx.save(model, path)
+    monkeypatch.setattr(runtime, "_io_binding", True)
+
+    # Only the padding arithmetic is needed, not the SentencePiece model.
+    tokenizer = AlbertTokenizer.__new__(AlbertTokenizer)
+    tokenizer._pad_multiple = AlbertTokenizer._parse_padding(
+        runtime.io_binding_padding()
+    )
+    tokenizer.enable_padding = True
+    tokenizer.model_max_length = 512
+    tokenizer.pad_token_id = 0
+    session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+    runner = runtime.io_binding_runner(session)
+
+    first = runner.run(
+        None, {"input_ids": tokenizer.pad([[5] * 3, [5] * 7])["input_ids"]}
+    )
+    second = runner.run(
+        None, {"input_ids": tokenizer.pad([[6] * 20, [6] * 2])["input_ids"]}
+    )
+
+    assert second[0] is first[0]
+    assert second[0].shape == (2, runtime.IO_BINDING_PAD_MULTIPLE)
+    assert second[0][0, :21].tolist() == [6.0] * 20 + [tokenizer.pad_token_id]
+
+
+def test_io_binding_is_opt_in(monkeypatch):
+    monkeypatch.setattr(runtime, "_io_binding", None)
+    monkeypatch.delenv("SHEKAR_IO_BINDING", raising=False)
+    session = object()
+
+    assert runtime.io_binding_runner(session) is None
+    assert runtime.io_binding_padding() == "longest"
+
+    monkeypatch.setenv("SHEKAR_IO_BINDING", "1")
+    assert runtime.io_binding_enabled()
+
+    runtime.configure_io_binding(False)
+    assert not runtime.io_binding_enabled()
+
+
+def test_io_binding_runner_rejects_invalid_bucket_count(add_model: Path):
+    session = ort.InferenceSession(str(add_model), providers=["CPUExecutionProvider"])
+    with pytest.raises(ValueError, match="max_buckets"):
+        runtime.IOBindingRunner(session, max_buckets=0)
@@ -2,6 +2,7 @@ import re
 
 import pytest
 
+from shekar import data
 from shekar.base import BaseTextTransform
 
 
@@ -60,6 +61,28 @@ class TestBaseTextTransformer:
         expected_output = "سگ روی حیاط نشست."
         assert BaseTextTransform._map_patterns(text, patterns) == expected_output
 
+    def test_compile_word_pattern(self):
+        pattern = BaseTextTransform._compile_word_pattern(
+            ["گربه", "گربه سیاه", "سگ", ""], data.persian_letters
+        )
+        assert pattern.sub("X", "گربه سیاه و گربه‌ها و سگ.") == "X و گربه‌ها و X."
+        assert pattern.sub("X", "گربه‌سیاه") == "گربه‌سیاه"
+        assert pattern.sub("X", "(گربه)") == "(X)"
+        assert pattern.sub("X", "سگی") == "سگی"
+        assert BaseTextTransform._compile_word_pattern([], "ا") is None
+
+    def test_compose_translation_tables(self):
+        first = BaseTextTransform._create_translation_table([("ab", "x"), ("c", "")])
+        second = {ord("x"): "yz", ord("d"): None, ord("e"): ord("f")}
+        composed = BaseTextTransform._compose_translation_tables(first, second)
+
+        text = "abcdeg"
+        assert text.translate(composed) == text.translate(first).translate(second)
+        assert text.translate(composed) == "yzyzfg"
+
+    def test_as_translation_default_is_none(self, transformer):
+        assert transformer._as_translation() is None
+
     def test_abstract_function_error(self):
         with pytest.raises(NotImplementedError):
             BaseTextTransform._function(None, None)
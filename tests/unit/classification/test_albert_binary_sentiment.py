@@ -1,6 +1,7 @@
 from types import SimpleNamespace
 
 import numpy as np
+import pytest
 
 from shekar.base import BaseTransform
 from shekar.classification.albert_sentiment_binary import (
@@ -110,3 +111,62 @@ class TestAlbertBinarySentimentClassifier:
 
         assert label == "negative"
         assert np.isclose(score, 1 / (1 + np.exp(-1)), atol=1e-6)
+
+    def test_transform_batch_matches_transform(self):
+        texts = ["فیلم ۳۰۰ افتضاح بود.", "", "سریال قصه‌های مجید عالی بود!"]
+
+        expected = [self.classifier.transform(text) for text in texts]
+
+        for batch_size in (1, 32):
+            results = self.classifier.transform_batch(texts, batch_size=batch_size)
+            assert [label for label, _ in results] == [label for label, _ in expected]
+            assert np.allclose(
+                [score for _, score in results],
+                [score for _, score in expected],
+                atol=1e-5,
+            )
+
+    def test_transform_batch_empty_input(self):
+        assert self.classifier.transform_batch([]) == []
+
+    def test_transform_batch_rejects_invalid_batch_size(self):
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            self.classifier.transform_batch(["عالی"], batch_size=0)
+
+    def test_long_document_scores_every_window(self):
+        classifier = AlbertBinarySentimentClassifier(long_document="mean")
+        text = "غذا خیلی خوب بود. " * 300
+
+        assert classifier.tokenizer(text)["input_ids"].shape[0] > 1
+        label, score = classifier.transform(text)
+
+        assert label in {"negative", "positive"}
+        assert 0.5 <= score <= 1
+        [(batch_label, batch_score)] = classifier.transform_batch([text])
+        assert batch_label == label
+        assert np.isclose(batch_score, score, atol=1e-5)
+
+
+def test_rejects_unknown_long_document_aggregation():
+    with pytest.raises(ValueError, match="Unknown long_document aggregation"):
+        AlbertBinarySentimentClassifier(long_document="median")
+
+
+@pytest.mark.parametrize(
+    "long_document, expected",
+    [
+        ("mean", [0.5, 0.5]),
+        ("max", [0.1, 0.9]),
+        ("weighted", [0.65, 0.35]),
+        (None, [0.8, 0.2]),
+    ],
+)
+def test_aggregate_window_scores(long_document, expected):
+    classifier = AlbertBinarySentimentClassifier.__new__(
+        AlbertBinarySentimentClassifier
+    )
+    classifier.long_document = long_document
+    scores = np.array([[0.8, 0.2], [0.1, 0.9], [0.6, 0.4]])
+    lengths = np.array([4, 1, 1])
+
+    assert np.allclose(classifier._aggregate(scores, lengths), expected)
@@ -92,3 +92,19 @@ class TestSentimentClassifier:
         """Test that SentimentClassifier inherits from BaseTransform."""
         classifier = SentimentClassifier()
         assert hasattr(classifier, "transform")
+
+    def test_transform_batch_returns_one_result_per_text(self):
+        """Test batch sentiment analysis returns results in input order."""
+        classifier = SentimentClassifier()
+        texts = ["سریال قصه‌های مجید عالی بود!", "فیلم ۳۰۰ افتضاح بود."]
+        results = classifier.transform_batch(texts)
+
+        assert len(results) == len(texts)
+        assert [label for label, _ in results] == [
+            classifier.transform(text)[0] for text in texts
+        ]
+
+    def test_init_with_long_document(self):
+        """Test that the long-document mode is forwarded to the model."""
+        classifier = SentimentClassifier(long_document="weighted")
+        assert classifier.model.long_document == "weighted"
@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 from shekar.classification import LogisticOffensiveClassifier
 
 
@@ -67,3 +70,39 @@ class TestLogisticOffensiveClassifier:
         result1 = self.classifier.transform(text)
         result2 = self.classifier.transform(text)
         assert result1 == result2
+
+    def test_transform_batch_matches_transform(self):
+        """Test batch inference returns the same predictions as transform."""
+        texts = [
+            "این یک متن معمولی است.",
+            "تو خیلی احمق و بی‌شرفی!",
+            "",
+            "سطر اول\nسطر دوم",
+        ]
+        labels, scores = self.classifier.transform_batch(texts, batch_size=3)
+
+        assert isinstance(labels, np.ndarray)
+        assert isinstance(scores, np.ndarray)
+        assert labels.shape == scores.shape == (len(texts),)
+        for text, label, score in zip(texts, labels, scores):
+            expected_label, expected_score = self.classifier.transform(text)
+            assert label == expected_label
+            assert np.isclose(score, expected_score)
+
+    def test_transform_batch_empty_input(self):
+        """Test batch inference on an empty list."""
+        labels, scores = self.classifier.transform_batch([])
+        assert labels.shape == scores.shape == (0,)
+
+    def test_transform_batch_rejects_invalid_batch_size(self):
+        """Test batch inference rejects a non-positive batch size."""
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            self.classifier.transform_batch(["سلام"], batch_size=0)
+
+    def test_remove_stopwords_matches_per_text_removal(self):
+        """Test bulk stopword removal matches removing stopwords per text."""
+        texts = ["این یک متن نمونه است و به شما کمک می‌کند.", "و", "", "از\x00به"]
+        expected = [self.classifier.stopword_remover(text) for text in texts]
+
+        assert self.classifier._remove_stopwords(texts) == expected
+        assert self.classifier._remove_stopwords(texts[:3]) == expected[:3]
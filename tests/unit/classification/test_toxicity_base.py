@@ -38,3 +38,10 @@ class TestOffensiveLanguageClassifier:
         classifier = OffensiveLanguageClassifier()
         result = classifier("زبان فارسی میهن من است!")
         assert isinstance(result, tuple)
+
+    def test_transform_batch(self):
+        classifier = OffensiveLanguageClassifier()
+        labels, scores = classifier.transform_batch(
+            ["زبان فارسی میهن من است!", "تو خیلی احمق و بی‌شرفی!"]
+        )
+        assert len(labels) == len(scores) == 2
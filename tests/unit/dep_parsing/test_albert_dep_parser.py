@@ -1,3 +1,7 @@
+import gc
+import weakref
+
+import numpy as np
 import pytest
 
 from shekar.dep_parsing.albert_dep_parser import AlbertDepParser
@@ -16,6 +20,18 @@ class TestAlbertDepParser:
         assert isinstance(parser.id2deprel, dict)
         assert len(parser.id2deprel) == len(AlbertDepParser.dep_relations)
 
+    def test_word_cache_does_not_keep_the_parser_alive(self):
+        parser = AlbertDepParser()
+        parser.transform("من به خانه رفتم.")
+        ref = weakref.ref(parser)
+
+        gc.disable()
+        try:
+            del parser
+            assert ref() is None
+        finally:
+            gc.enable()
+
     def test_dep_relations_coverage(self, parser):
         expected = {
             "acl",
@@ -172,3 +188,57 @@ class TestAlbertDepParser:
                 assert deprel == "punct", (
                     f"Expected 'punct' for '{word}', got '{deprel}'"
                 )
+
+    def test_build_batch_pads_word_positions(self, parser):
+        rows = [["علی", "به", "خانه", "رفت"], ["سلام"]]
+        input_ids, attention_mask, word_to_first_subtoken = parser._build_batch(rows)
+
+        assert input_ids.shape == attention_mask.shape
+        assert input_ids.shape[0] == 2
+        assert word_to_first_subtoken.shape == (2, 4)
+        assert word_to_first_subtoken[1, 0] == 1
+        assert word_to_first_subtoken[1, 1:].tolist() == [0, 0, 0]
+        assert attention_mask[1].sum() < attention_mask[0].sum()
+
+    def test_transform_batch_matches_transform(self, parser):
+        texts = ["من به خانه رفتم.", "", "سلام! حالت چطور است؟", "کتاب روی میز است."]
+
+        expected = [parser.transform(text) for text in texts]
+
+        assert parser.transform_batch(texts) == expected
+        assert parser.transform_batch(texts, batch_size=1) == expected
+
+    def test_transform_batch_rejects_invalid_batch_size(self, parser):
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            parser.transform_batch(["سلام"], batch_size=0)
+
+    def test_transform_long_text_is_parsed_per_sentence(self, parser):
+        from shekar.tokenization import WordTokenizer
+
+        text = "کتاب‌ها روی میز هستند و من آن‌ها را خواندم. " * 100
+        words = list(WordTokenizer()(text))
+
+        result = parser.transform(text)
+
+        assert [w for w, _, _ in result] == words
+        assert all(0 <= head <= len(words) for _, head, _ in result)
+
+
+def test_decode_ignores_padding_words():
+    parser = AlbertDepParser.__new__(AlbertDepParser)
+    num_deprels = len(AlbertDepParser.dep_relations)
+    arc_logits = np.zeros((2, 4, 4), dtype=np.float32)
+    rel_logits = np.zeros((2, 4, 4, num_deprels), dtype=np.float32)
+    # Row 1 has a single word; its padding words score highest as heads.
+    arc_logits[1, 1, 3] = 10.0
+    arc_logits[1, 1, 0] = 1.0
+    rel_logits[1, 1, 0, 5] = 1.0
+    arc_logits[0, 2, 3] = 1.0
+    rel_logits[0, 2, 3, 7] = 1.0
+
+    heads, deprels = parser._decode(arc_logits, rel_logits, np.array([3, 1]))
+
+    assert heads[1, 1] == 0
+    assert deprels[1, 1] == 5
+    assert heads[0, 2] == 3
+    assert deprels[0, 2] == 7
@@ -41,6 +41,16 @@ class TestDependencyParser:
         mock_transform.assert_called_once_with(text)
         assert result == [("کتاب", 2, "obj"), ("خواندم", 0, "root")]
 
+    @patch.object(AlbertDepParser, "transform_batch")
+    def test_transform_batch_delegates_to_model(self, mock_transform_batch):
+        mock_transform_batch.return_value = [[("سلام", 0, "root")]]
+        parser = DependencyParser()
+        texts = ["سلام"]
+        result = parser.transform_batch(texts, batch_size=4)
+
+        mock_transform_batch.assert_called_once_with(texts, batch_size=4)
+        assert result == [[("سلام", 0, "root")]]
+
     def test_transform_returns_list(self):
         parser = DependencyParser()
         result = parser.transform("من کتاب می‌خوانم.")
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from shekar.embeddings.albert_embedder import AlbertEmbedder
 
@@ -63,3 +64,34 @@ class TestAlbertEmbedder:
         embedder = AlbertEmbedder()
         assert embedder.vector_size == 768
         assert isinstance(embedder.vector_size, int)
+
+    def test_embed_batch_matches_embed(self):
+        embedder = AlbertEmbedder()
+        texts = ["سلام", "", "کتاب‌ها روی میز هستند. " * 150, "من به خانه رفتم."]
+
+        matrix = embedder.embed_batch(texts, batch_size=2)
+
+        assert matrix.shape == (len(texts), 768)
+        assert matrix.dtype == np.float32
+        for row, text in zip(matrix, texts):
+            np.testing.assert_allclose(row, embedder.embed(text), atol=1e-4)
+
+    def test_embed_batch_empty_input(self):
+        embedder = AlbertEmbedder()
+        assert embedder.embed_batch([]).shape == (0, 768)
+
+    def test_embed_batch_rejects_invalid_batch_size(self):
+        embedder = AlbertEmbedder()
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            embedder.embed_batch(["سلام"], batch_size=0)
+
+    def test_similarity_matrix(self):
+        embedder = AlbertEmbedder()
+        texts = ["متن اول", "متن دوم", "متن اول"]
+
+        matrix = embedder.similarity_matrix(texts)
+
+        assert matrix.shape == (3, 3)
+        np.testing.assert_allclose(np.diag(matrix), 1.0, atol=1e-5)
+        assert np.isclose(matrix[0, 2], 1.0, atol=1e-5)
+        assert np.isclose(matrix[0, 1], embedder.similarity(texts[0], texts[1]))
@@ -96,3 +96,58 @@ def test_similarity_returns_float():
     e = DummyEmbedder(table=table, dim=3)
     sim = e.similarity("hello", "hello")
     assert isinstance(sim, float)
+
+
+class NoneEmbedder(DummyEmbedder):
+    """Returns None for unknown texts, like WordEmbedder(oov_strategy='none')."""
+
+    vector_size = 3
+
+    def embed(self, text: str):
+        vec = self.table.get(text)
+        return None if vec is None else np.asarray(vec, dtype=np.float32)
+
+
+def test_embed_batch_stacks_embeddings():
+    table = {"a": [1.0, 0.0, 0.0], "b": [0.0, 2.0, 0.0]}
+    e = DummyEmbedder(table=table, dim=3)
+
+    matrix = e.embed_batch(["a", "b", "oov"])
+
+    assert matrix.dtype == np.float32
+    assert matrix.tolist() == [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 0.0]]
+
+
+def test_embed_batch_fills_missing_embeddings_with_zeros():
+    e = NoneEmbedder(table={"a": [1.0, 2.0, 3.0]})
+
+    assert e.embed_batch(["oov", "a"]).tolist() == [[0.0, 0.0, 0.0], [1.0, 2.0, 3.0]]
+    assert e.embed_batch(["oov"]).shape == (1, 3)
+    assert e.embed_batch([]).shape == (0, 3)
+
+
+def test_similarity_matrix_is_pairwise_cosine_similarity():
+    table = {
+        "a": np.array([1.0, 0.0, 0.0]),
+        "b": np.array([0.0, 3.0, 0.0]),
+        "c": np.array([2.0, 2.0, 0.0]),
+    }
+    e = DummyEmbedder(table=table, dim=3)
+    texts = ["a", "b", "c", "oov"]
+
+    matrix = e.similarity_matrix(texts)
+
+    assert matrix.shape == (4, 4)
+    assert matrix.dtype == np.float32
+    for i, text1 in enumerate(texts):
+        for j, text2 in enumerate(texts):
+            assert np.isclose(matrix[i, j], e.similarity(text1, text2), atol=1e-6)
+
+
+def test_similarity_matrix_against_other_texts():
+    table = {"a": np.array([1.0, 0.0]), "b": np.array([0.0, 1.0])}
+    e = DummyEmbedder(table=table, dim=2)
+
+    matrix = e.similarity_matrix(["a"], ["a", "b", "oov"])
+
+    assert np.allclose(matrix, [[1.0, 0.0, 0.0]])
@@ -53,3 +53,18 @@ class TestContextualEmbedder:
 
         mock_embed.assert_called_once_with("test sentence")
         assert np.array_equal(result, np.array([0.4, 0.5, 0.6]))
+
+    @patch("shekar.embeddings.contextual_embedder.CONTEXTUAL_EMBEDDING_REGISTRY")
+    def test_embed_batch_calls_embedder(self, mock_registry):
+        """Test that embed_batch delegates to the underlying embedder."""
+        mock_embedder = Mock()
+        mock_embedder.embed_batch.return_value = np.zeros((2, 3), dtype=np.float32)
+        mock_registry.__getitem__.return_value = lambda: mock_embedder
+        mock_registry.__contains__.return_value = True
+        mock_registry.keys.return_value = ["albert"]
+
+        embedder = ContextualEmbedder()
+        result = embedder.embed_batch(["a", "b"], batch_size=8)
+
+        mock_embedder.embed_batch.assert_called_once_with(["a", "b"], batch_size=8)
+        assert result.shape == (2, 3)
@@ -1,5 +1,9 @@
+from pathlib import Path
+from unittest import mock
+
 import pytest
 
+import shekar.morphology.conjugator as conjugator_module
 from shekar.morphology.conjugator import Conjugator
 
 
@@ -2275,3 +2279,32 @@ class TestConjugator:
 
         for form in future_simple:
             assert form in full_result
+
+
+def test_conjugated_verb_tables_are_cached_on_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    built = conjugator_module._build_conjugated_verbs()
+    build_mock = mock.Mock(return_value=built)
+    monkeypatch.setattr(conjugator_module, "_build_conjugated_verbs", build_mock)
+
+    conjugator_module._load_conjugated_verbs.cache_clear()
+    try:
+        assert conjugator_module.get_conjugated_verbs() == built[0]
+        assert conjugator_module.get_informal_conjugated_verbs() == built[1]
+        build_mock.assert_called_once()
+
+        cache_files = list((tmp_path / ".shekar").glob("conjugated_verbs_*.pkl"))
+        assert len(cache_files) == 1
+
+        # a cold start reads the cache instead of conjugating again
+        conjugator_module._load_conjugated_verbs.cache_clear()
+        assert conjugator_module.get_conjugated_verbs() == built[0]
+        build_mock.assert_called_once()
+
+        # a corrupt cache is rebuilt and overwritten
+        cache_files[0].write_bytes(b"not a pickle")
+        conjugator_module._load_conjugated_verbs.cache_clear()
+        assert conjugator_module.get_informal_conjugated_verbs() == built[1]
+        assert build_mock.call_count == 2
+    finally:
+        conjugator_module._load_conjugated_verbs.cache_clear()
@@ -85,6 +85,47 @@ def test_aggregate_entities_trailing_entity(ner_model):
     assert result == [("تهران", "LOC")]
 
 
+def test_transform_batch_matches_transform(ner_model):
+    texts = [
+        "من علی‌رضا امیری هستم و در دانشگاه تهران تحصیل می‌کنم.",
+        "",
+        "حسن روحانی در مشهد سخنرانی کرد. " * 80,
+        "سلام",
+    ]
+
+    expected = [ner_model.transform(text) for text in texts]
+
+    assert ner_model.transform_batch(texts) == expected
+    assert ner_model.transform_batch(texts, batch_size=1) == expected
+
+
+def test_transform_batch_keeps_the_tokenizer_padding_multiple(ner_model, monkeypatch):
+    texts = ["سلام", "حسن روحانی در مشهد سخنرانی کرد. " * 3, "علی به تهران رفت."]
+    expected = [ner_model.transform(text) for text in texts]
+    monkeypatch.setattr(ner_model.tokenizer, "_pad_multiple", 64)
+    predict = ner_model._predict
+    widths = []
+
+    def spy(encoded):
+        widths.append(encoded["input_ids"].shape[1])
+        return predict(encoded)
+
+    monkeypatch.setattr(ner_model, "_predict", spy)
+
+    assert ner_model.transform_batch(texts, batch_size=1) == expected
+    assert len(widths) == 3
+    assert all(width % 64 == 0 for width in widths)
+
+
+def test_transform_batch_empty_input(ner_model):
+    assert ner_model.transform_batch([]) == []
+
+
+def test_transform_batch_rejects_invalid_batch_size(ner_model):
+    with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+        ner_model.transform_batch(["سلام"], batch_size=0)
+
+
 # --- transform multi-batch branch coverage ---
 
 
@@ -30,6 +30,15 @@ def test_ner_transform_outputs_entities():
         assert isinstance(ent[1], str)  # entity label
 
 
+def test_ner_transform_batch_returns_one_result_per_text():
+    ner = NER()
+    texts = ["علی به دانشگاه تهران رفت.", "سلام"]
+
+    results = ner.transform_batch(texts, batch_size=1)
+
+    assert results == [ner.transform(text) for text in texts]
+
+
 def test_ner_fit_returns_model():
     ner = NER()
     result = ner.fit(["متن تست"], [["O", "B-PER", "I-PER"]])
@@ -1,3 +1,6 @@
+import gc
+import weakref
+
 import pytest
 
 from shekar.hub import Hub
@@ -84,3 +87,40 @@ class TestAlbertPOS:
         result = pos_tagger.transform(text)
 
         assert [word for word, _ in result] == expected_words
+
+    def test_transform_batch_matches_transform(self, pos_tagger):
+        texts = ["من به خانه رفتم.", "", "سلام! این یک متن تست است.", "سلام سلام"]
+
+        expected = [pos_tagger.transform(text) for text in texts]
+
+        assert pos_tagger.transform_batch(texts) == expected
+        assert pos_tagger.transform_batch(texts, batch_size=1) == expected
+
+    def test_transform_batch_rejects_invalid_batch_size(self, pos_tagger):
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            pos_tagger.transform_batch(["سلام"], batch_size=0)
+
+    def test_word_cache_does_not_keep_the_tagger_alive(self):
+        pos_tagger = AlbertPOS()
+        pos_tagger.transform("من به خانه رفتم.")
+        ref = weakref.ref(pos_tagger)
+
+        gc.disable()
+        try:
+            del pos_tagger
+            assert ref() is None
+        finally:
+            gc.enable()
+
+    def test_transform_tags_every_word_of_a_long_text(self, pos_tagger):
+        text = "کتاب‌ها روی میز هستند و من آن‌ها را خواندم. " * 100
+        words = list(pos_tagger.word_tokenizer(text))
+
+        rows = pos_tagger._split_rows(text)
+        result = pos_tagger.transform(text)
+
+        assert len(rows) > 1
+        for row in rows:
+            length = sum(len(pos_tagger._word_ids(word)) for word in row)
+            assert length <= pos_tagger.tokenizer.model_max_length
+        assert [word for word, _ in result] == words
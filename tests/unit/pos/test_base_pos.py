@@ -42,6 +42,16 @@ class TestPOSTagger:
         mock_transform.assert_called_once_with(text)
         assert result == [("word", "POS")]
 
+    @patch.object(AlbertPOS, "transform_batch")
+    def test_transform_batch_delegates_to_model(self, mock_transform_batch):
+        mock_transform_batch.return_value = [[("word", "POS")]]
+        tagger = POSTagger()
+        texts = ["Sample text"]
+        result = tagger.transform_batch(texts, batch_size=8)
+
+        mock_transform_batch.assert_called_once_with(texts, batch_size=8)
+        assert result == [[("word", "POS")]]
+
     def test_integration_with_model(self):
         # This is a more integration-style test
         tagger = POSTagger()
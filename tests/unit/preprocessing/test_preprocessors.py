@@ -210,6 +210,18 @@ def test_remove_stopwords():
     assert stopword_Filter(input_text) == expected_output
 
 
+def test_stopword_remover_word_boundaries():
+    stopword_Filter = StopWordRemover(stopwords=["از", "از این", "می"], mask_token="|")
+    # ZWNJ and Persian letters are part of a word, punctuation is not
+    assert stopword_Filter("می‌روم") == "می‌روم"
+    assert stopword_Filter("ازدواج") == "ازدواج"
+    assert stopword_Filter("از،می.") == "|،|."
+    # the longest word starting at a position wins
+    assert stopword_Filter("از این راه") == "| راه"
+    assert stopword_Filter("از اینجا") == "| اینجا"
+    assert StopWordRemover(stopwords=[])("از این راه") == "از این راه"
+
+
 def test_remove_non_persian():
     non_persian_Filter = NonPersianLetterMasker()
     input_text = "با یه گل بهار نمی‌شه"
@@ -132,3 +132,128 @@ def test_padding_does_not_implicitly_truncate():
 
     assert output["input_ids"].shape == (1, expected_body_length + 2)
     assert np.all(output["attention_mask"] == 1)
+
+
+@pytest.mark.parametrize(
+    "padding", ["shortest", "multiple_of=0", "multiple_of=-8", "multiple_of=x", 8]
+)
+def test_rejects_invalid_padding(padding):
+    with pytest.raises(ValueError, match="padding must be"):
+        AlbertTokenizer(enable_padding=True, padding=padding)
+
+
+def test_longest_padding_does_not_pad_a_single_sequence():
+    tokenizer = AlbertTokenizer(enable_padding=True, padding="longest")
+    text = "سلام دنیا"
+    expected_body_length = len(tokenizer.sp.encode(text, out_type=int))
+
+    output = tokenizer(text)
+
+    assert output["input_ids"].shape == (1, expected_body_length + 2)
+    assert np.all(output["attention_mask"] == 1)
+
+
+def test_longest_padding_pads_overflow_windows_to_the_longest_window():
+    tokenizer = AlbertTokenizer(
+        enable_padding=True,
+        enable_truncation=True,
+        return_overflowing_tokens=True,
+        model_max_length=8,
+        padding="longest",
+    )
+    text = " ".join(["سلام"] * 20)
+
+    output = tokenizer(text)
+
+    assert output["input_ids"].shape[1] == tokenizer.model_max_length
+    assert np.any(output["attention_mask"][-1] == 0)
+
+
+def test_multiple_of_padding_rounds_up_to_the_multiple():
+    tokenizer = AlbertTokenizer(enable_padding=True, padding="multiple_of=8")
+
+    output = tokenizer.pad([[5, 6, 7], [5, 6, 7, 8, 9]])
+
+    assert output["input_ids"].shape == (2, 8)
+    assert output["attention_mask"].sum(axis=1).tolist() == [3, 5]
+    assert np.all(output["input_ids"][0, 3:] == tokenizer.pad_token_id)
+    assert [tokenizer.padded_length(n) for n in (1, 8, 9)] == [8, 8, 16]
+
+
+def test_multiple_of_padding_never_exceeds_model_max_length():
+    tokenizer = AlbertTokenizer(
+        enable_padding=True, model_max_length=10, padding="multiple_of=8"
+    )
+
+    output = tokenizer.pad([[5] * 9])
+
+    assert output["input_ids"].shape == (1, 10)
+
+
+def test_max_length_padding_pads_to_model_max_length():
+    tokenizer = AlbertTokenizer(enable_padding=True, model_max_length=16)
+
+    output = tokenizer.pad([[5, 6, 7]])
+
+    assert output["input_ids"].shape == (1, 16)
+    assert output["attention_mask"].sum() == 3
+
+
+def test_encode_returns_matching_pieces_and_ids():
+    tokenizer = AlbertTokenizer()
+    text = "من عاشق برنامه‌نویسی هستم."
+
+    encoding = tokenizer.encode(text)
+
+    assert encoding.ids[1:-1] == tokenizer.sp.encode(text, out_type=int)
+    assert encoding.tokens[1:-1] == tokenizer.sp.encode(text, out_type=str)
+    assert encoding.tokens[0] == "[CLS]" and encoding.tokens[-1] == "[SEP]"
+
+
+def test_encode_batch_matches_transform_per_document():
+    tokenizer = AlbertTokenizer(
+        enable_padding=True,
+        enable_truncation=True,
+        return_overflowing_tokens=True,
+        model_max_length=8,
+        padding="longest",
+    )
+    texts = ["سلام", " ".join(["سلام"] * 20), "او به دانشگاه رفت."]
+
+    batch = tokenizer.encode_batch(texts)
+
+    mapping = batch["overflow_to_sample_mapping"]
+    assert batch["input_ids"].dtype == np.int64
+    assert batch["attention_mask"].shape == batch["input_ids"].shape
+    assert mapping.tolist() == sorted(mapping.tolist())
+    assert set(mapping.tolist()) == {0, 1, 2}
+
+    for doc_index, text in enumerate(texts):
+        single = tokenizer(text)
+        rows = np.flatnonzero(mapping == doc_index)
+        assert len(rows) == single["input_ids"].shape[0]
+        for window, row in enumerate(rows):
+            length = int(single["attention_mask"][window].sum())
+            assert batch["attention_mask"][row].sum() == length
+            assert np.array_equal(
+                batch["input_ids"][row, :length], single["input_ids"][window, :length]
+            )
+
+
+def test_encode_batch_empty_input():
+    tokenizer = AlbertTokenizer()
+
+    batch = tokenizer.encode_batch([])
+
+    assert batch["input_ids"].shape == (0, 0)
+    assert batch["overflow_to_sample_mapping"].shape == (0,)
+
+
+def test_tokenizers_share_one_sentencepiece_model():
+    first = AlbertTokenizer()
+    second = AlbertTokenizer(enable_padding=True, padding="longest")
+
+    assert first.sp is second.sp
+
+    second.release()
+    assert first.encode("سلام").ids
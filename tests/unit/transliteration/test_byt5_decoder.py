@@ -1,3 +1,4 @@
+import time
 from types import SimpleNamespace
 
 import numpy as np
@@ -91,3 +92,413 @@ def test_beam_search_keeps_finished_and_active_scores_separate():
         decoder._tokenizer._eos_id not in input_ids
         for input_ids in decoder._session.input_history[1:]
     )
+
+
+class BatchedBeamSearchSession(BeamSearchSession):
+    """Like BeamSearchSession, but inputs whose encoder state is 1 end at once."""
+
+    def run(self, _, feed):
+        input_ids = feed["input_ids"][:, 0]
+        self.input_history.append(input_ids.copy())
+        logits = np.full((len(input_ids), 1, 5), -20.0, dtype=np.float32)
+        stop_now = feed["encoder_hidden_states"][:, 0, 0] == 1
+
+        if len(self.input_history) == 1:
+            logits[:, 0, 2] = 5.0
+            logits[:, 0, 3] = 4.0
+            logits[:, 0, 1] = np.where(stop_now, 10.0, -10.0)
+            return [logits]
+
+        single = BeamSearchSession()
+        single.input_history = [None]
+        return single.run(_, feed)
+
+
+def test_decode_batch_matches_single_decoding():
+    decoder = make_decoder()
+    decoder._session = BatchedBeamSearchSession()
+    enc_out = np.array([[[0.0]], [[1.0]], [[0.0]]], dtype=np.float32)
+
+    results = decoder.decode_batch(
+        enc_out, np.ones((3, 1), dtype=np.int64), num_beams=2, max_new_tokens=3
+    )
+
+    assert results == [[2, 4], [], [2, 4]]
+    # The second input finished after the first step and left the batch.
+    assert [len(ids) for ids in decoder._session.input_history] == [3, 4, 4]
+
+
+def test_transform_batch_validates_batch_size():
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    with pytest.raises(ValueError, match="batch_size"):
+        transliterator.transform_batch(["salom"], batch_size=0)
+
+
+@pytest.mark.parametrize(("max_new_tokens", "expected"), [(2, [2]), (3, [2, 4])])
+def test_greedy_keeps_best_normalized_finished_sequence(max_new_tokens, expected):
+    decoder = make_decoder()
+
+    result = decoder.decode(
+        np.zeros((1, 1, 1), dtype=np.float32),
+        np.ones((1, 1), dtype=np.int64),
+        num_beams=1,
+        max_new_tokens=max_new_tokens,
+    )
+
+    assert result == expected
+
+
+def test_greedy_decode_batch_drops_finished_inputs():
+    decoder = make_decoder()
+    decoder._session = BatchedBeamSearchSession()
+    enc_out = np.array([[[0.0]], [[1.0]]], dtype=np.float32)
+
+    results = decoder.decode_batch(
+        enc_out, np.ones((2, 1), dtype=np.int64), num_beams=1, max_new_tokens=3
+    )
+
+    assert results == [[2, 4], []]
+    assert [len(ids) for ids in decoder._session.input_history] == [2, 1, 1]
+
+
+@pytest.fixture
+def kv_decoder_path(tmp_path, monkeypatch):
+    """A tiny decoder whose next-token logits depend on its self-attention KV."""
+    onnx = pytest.importorskip("onnx")
+    helper = onnx.helper
+    numpy_helper = onnx.numpy_helper
+    monkeypatch.setenv("SHEKAR_OPTIMIZED_CACHE", "0")
+
+    table = np.random.default_rng(0).normal(size=(5, 5)).astype(np.float32)
+    table[:, 1] -= 1.0
+    initializers = [
+        numpy_helper.from_array(table, "table"),
+        numpy_helper.from_array(np.ones((1, 1, 1, 1), np.float32), "ones"),
+        numpy_helper.from_array(
+            np.array([0.0, 0.4, -0.3, 0.2, -0.1], np.float32), "history_weight"
+        ),
+        numpy_helper.from_array(
+            np.array([0.0, 1.0, -1.0, 0.5, 0.0], np.float32), "encoder_weight"
+        ),
+        numpy_helper.from_array(np.array([1, 2, 3], np.int64), "kv_axes"),
+        numpy_helper.from_array(np.array([1, 2], np.int64), "enc_axes"),
+    ]
+    nodes = [
+        helper.make_node("Gather", ["table", "input_ids"], ["token_logits"]),
+        helper.make_node("Cast", ["input_ids"], ["ids_f"], to=onnx.TensorProto.FLOAT),
+        helper.make_node("Unsqueeze", ["ids_f", "enc_axes"], ["ids_4d"]),
+        helper.make_node("Mul", ["ids_4d", "ones"], ["new_kv"]),
+    ]
+    inputs = [
+        helper.make_tensor_value_info("input_ids", onnx.TensorProto.INT64, ["B", 1]),
+        helper.make_tensor_value_info(
+            "encoder_attention_mask", onnx.TensorProto.INT64, ["B", "S"]
+        ),
+        helper.make_tensor_value_info(
+            "encoder_hidden_states", onnx.TensorProto.FLOAT, ["B", "S", 1]
+        ),
+    ]
+    outputs = [
+        helper.make_tensor_value_info("logits", onnx.TensorProto.FLOAT, ["B", 1, 5])
+    ]
+    for kind, length in (("decoder", "P"), ("encoder", "S")):
+        for part in ("key", "value"):
+            past = f"past_key_values.0.{kind}.{part}"
+            present = f"present.0.{kind}.{part}"
+            inputs.append(
+                helper.make_tensor_value_info(
+                    past, onnx.TensorProto.FLOAT, ["B", 1, length, 1]
+                )
+            )
+            outputs.append(
+                helper.make_tensor_value_info(
+                    present, onnx.TensorProto.FLOAT, ["B", 1, None, 1]
+                )
+            )
+            if kind == "decoder":
+                nodes.append(
+                    helper.make_node("Concat", [past, "new_kv"], [present], axis=2)
+                )
+            else:
+                nodes.append(helper.make_node("Identity", [past], [present]))
+    nodes += [
+        helper.make_node(
+            "ReduceSum", ["present.0.decoder.key", "kv_axes"], ["history"], keepdims=1
+        ),
+        helper.make_node("Reshape", ["history", "history_shape"], ["history_2d"]),
+        helper.make_node("Mul", ["history_2d", "history_weight"], ["history_bias"]),
+        helper.make_node(
+            "ReduceSum", ["encoder_hidden_states", "enc_axes"], ["enc_sum"], keepdims=1
+        ),
+        helper.make_node("Reshape", ["enc_sum", "history_shape"], ["enc_sum_2d"]),
+        helper.make_node("Mul", ["enc_sum_2d", "encoder_weight"], ["encoder_bias"]),
+        helper.make_node("Add", ["history_bias", "encoder_bias"], ["bias_2d"]),
+        helper.make_node("Unsqueeze", ["bias_2d", "one_axis"], ["bias"]),
+        helper.make_node("Add", ["token_logits", "bias"], ["logits"]),
+    ]
+    initializers += [
+        numpy_helper.from_array(np.array([-1, 1], np.int64), "history_shape"),
+        numpy_helper.from_array(np.array([1], np.int64), "one_axis"),
+    ]
+    graph = helper.make_graph(nodes, "kv_decoder", inputs, outputs, initializers)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    path = tmp_path / "decoder.onnx"
+    onnx.save(model, path)
+    return path
+
+
+@pytest.mark.parametrize("num_beams", [1, 2, 3])
+def test_io_binding_decoding_matches_numpy_decoding(kv_decoder_path, num_beams):
+    decoder = ByT5Decoder(kv_decoder_path)
+    enc_out = np.array([[[0.0]], [[1.0]], [[-0.5]], [[0.2]]], dtype=np.float32)
+    mask = np.ones((4, 1), dtype=np.int64)
+
+    decoder._io_binding = False
+    expected = decoder.decode_batch(enc_out, mask, num_beams, max_new_tokens=8)
+    decoder._io_binding = True
+    bound = decoder.decode_batch(enc_out, mask, num_beams, max_new_tokens=8)
+
+    assert bound == expected
+    assert len({tuple(ids) for ids in expected}) > 1
+
+
+@pytest.mark.parametrize("num_beams", [2, 3])
+def test_beam_search_on_cuda_does_not_bind_the_reordered_cache(
+    kv_decoder_path, num_beams, monkeypatch
+):
+    decoder = ByT5Decoder(kv_decoder_path)
+    enc_out = np.array([[[0.0]], [[1.0]], [[-0.5]]], dtype=np.float32)
+    mask = np.ones((3, 1), dtype=np.int64)
+    expected = decoder.decode_batch(enc_out, mask, num_beams, max_new_tokens=8)
+
+    decoder._io_binding = True
+    monkeypatch.setattr(decoder, "_device", "cuda")
+
+    def bound_run(feed, output_names):
+        raise AssertionError("beam search must not bind on CUDA")
+
+    monkeypatch.setattr(decoder, "_run_bound", bound_run)
+
+    assert decoder.decode_batch(enc_out, mask, num_beams, max_new_tokens=8) == (
+        expected
+    )
+
+
+class CausalKVSession:
+    """A one-layer decoder whose logits depend on every token fed so far.
+
+    The self-attention cache stores the fed token ids, and several input
+    positions can be fed per call, as with a real causal decoder.
+    """
+
+    def __init__(self, vocab_size=6, seed=0):
+        rng = np.random.default_rng(seed)
+        self.table = rng.normal(size=(vocab_size, vocab_size)).astype(np.float32)
+        self.table[:, 1] -= 1.5
+        self.history_weight = rng.normal(size=vocab_size).astype(np.float32) * 2
+        self.encoder_weight = rng.normal(size=vocab_size).astype(np.float32) * 3
+        self.input_lengths = []
+
+    def run(self, names, feed):
+        input_ids = feed["input_ids"]
+        self.input_lengths.append(input_ids.shape[1])
+        past = feed["past_key_values.0.decoder.key"]
+        present = np.concatenate(
+            [past, input_ids[:, None, :, None].astype(np.float32)], axis=2
+        )
+        history = np.cumsum(present[:, 0, :, 0], axis=1)[:, -input_ids.shape[1] :]
+        logits = (
+            self.table[input_ids] + np.sin(history)[..., None] * self.history_weight
+        )
+        logits += feed["encoder_hidden_states"][:, :1, :1] * self.encoder_weight
+        outputs = {
+            "logits": logits,
+            "present.0.decoder.key": present,
+            "present.0.decoder.value": present,
+            "present.0.encoder.key": feed["past_key_values.0.encoder.key"],
+            "present.0.encoder.value": feed["past_key_values.0.encoder.value"],
+        }
+        return [outputs[name] for name in names]
+
+
+def make_kv_decoder() -> ByT5Decoder:
+    decoder = make_decoder()
+    decoder._session = CausalKVSession()
+    decoder._past_self_k = ["past_key_values.0.decoder.key"]
+    decoder._past_self_v = ["past_key_values.0.decoder.value"]
+    decoder._past_cross_k = ["past_key_values.0.encoder.key"]
+    decoder._past_cross_v = ["past_key_values.0.encoder.value"]
+    decoder._present_self_k = ["present.0.decoder.key"]
+    decoder._present_self_v = ["present.0.decoder.value"]
+    decoder._present_cross_k = ["present.0.encoder.key"]
+    decoder._present_cross_v = ["present.0.encoder.value"]
+    decoder._output_names = ["logits", *decoder._present_self_k]
+    decoder._output_names += decoder._present_self_v + decoder._present_cross_k
+    decoder._output_names += decoder._present_cross_v
+    decoder._num_layers = 1
+    return decoder
+
+
+@pytest.mark.parametrize("speculative_tokens", [1, 3, 8])
+def test_speculative_decoding_matches_greedy(speculative_tokens):
+    decoder = make_kv_decoder()
+    enc_out = np.array([[[0.0]], [[0.7]], [[-0.4]]], dtype=np.float32)
+    mask = np.ones((3, 1), dtype=np.int64)
+
+    expected = decoder.decode_batch(enc_out, mask, 1, max_new_tokens=24)
+    greedy_calls = len(decoder._session.input_lengths)
+
+    # Drafting from the expected output makes most drafts correct.
+    decoder._session.input_lengths = []
+    sources = [np.array(ids, dtype=np.int64) for ids in expected]
+    drafted = decoder.decode_batch(enc_out, mask, 1, 24, speculative_tokens, sources)
+    drafted_lengths = decoder._session.input_lengths
+    decoder._session.input_lengths = []
+    # Unrelated sources give mostly wrong drafts.
+    unrelated = decoder.decode_batch(
+        enc_out, mask, 1, 24, speculative_tokens, [np.array([2, 3, 4, 5] * 3)] * 3
+    )
+
+    assert drafted == expected
+    assert unrelated == expected
+    assert len({tuple(ids) for ids in expected}) > 1
+    assert max(drafted_lengths) > 1
+    assert len(drafted_lengths) < greedy_calls
+
+
+def test_speculative_rows_accept_drafts_independently():
+    decoder = make_kv_decoder()
+    enc_out = np.array([[[0.0]], [[0.7]], [[-0.4]]], dtype=np.float32)
+    mask = np.ones((3, 1), dtype=np.int64)
+    expected = decoder.decode_batch(enc_out, mask, 1, max_new_tokens=24)
+
+    # Only the first row has useful drafts; the others have none at all.
+    decoder._session.input_lengths = []
+    empty = np.zeros(0, dtype=np.int64)
+    sources = [np.array(expected[0], dtype=np.int64), empty, empty]
+    drafted = decoder.decode_batch(enc_out, mask, 1, 24, 8, sources)
+
+    assert drafted == expected
+    assert len(decoder._session.input_lengths) <= len(expected[0]) // 2
+
+
+def test_lookup_draft_continues_latest_ngram_match():
+    context = np.array([5, 6, 7, 8, 5, 6, 9, 4, 5, 6])
+
+    assert ByT5Decoder._lookup_draft(context, 2).tolist() == [9, 4]
+    assert ByT5Decoder._lookup_draft(context, 0).tolist() == []
+    assert ByT5Decoder._lookup_draft(np.array([1, 2, 3]), 2).tolist() == []
+
+
+@pytest.mark.parametrize(
+    ("num_beams", "speculative_tokens"), [(1, -1), (1, True), (1, 1.5), (2, 1)]
+)
+def test_decode_validates_speculative_tokens(num_beams, speculative_tokens):
+    decoder = make_decoder()
+    with pytest.raises(ValueError):
+        decoder.decode(
+            np.zeros((1, 1, 1), dtype=np.float32),
+            np.ones((1, 1), dtype=np.int64),
+            num_beams=num_beams,
+            speculative_tokens=speculative_tokens,
+        )
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["سلام! خوبی؟ من خوبم.", "  a b.c\n\nd e f  ", "", "   ", "a!b", "x y z " * 80],
+)
+def test_split_chunks_joins_back_to_text(text):
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    pieces = transliterator._split_chunks(text)
+
+    assert "".join(pieces) == text
+    assert len(pieces) % 2 == 1
+    assert all(not piece.strip() for piece in pieces[::2])
+    assert all(piece.strip() == piece and piece for piece in pieces[1::2])
+
+
+def test_split_chunks_cuts_at_sentences_lines_and_size():
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    transliterator._max_chunk_bytes = 5
+
+    pieces = transliterator._split_chunks("aa bb cc dd. ee\nff gggggggg h")
+
+    assert pieces[1::2] == ["aa bb", "cc", "dd.", "ee", "ff", "gggggggg", "h"]
+
+
+def test_transform_stream_yields_after_each_group():
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    transliterator.stream_batch_size = 2
+    transliterator.memo = None
+    transliterator.max_new_tokens = 256
+    transliterator._transliterate = lambda texts, budgets, batch_size: [
+        text.upper() for text in texts
+    ]
+    pulled = []
+
+    def source():
+        for text in ["a", "b", "c", "d", "e"]:
+            pulled.append(text)
+            yield text
+
+    stream = transliterator.transform(source())
+
+    assert next(stream) == "A"
+    assert pulled == ["a", "b"]
+    assert list(stream) == ["B", "C", "D", "E"]
+
+
+@pytest.mark.parametrize("stream_batch_size", [0, -1, True, 2.5])
+def test_transliterator_validates_stream_batch_size(stream_batch_size):
+    with pytest.raises(ValueError, match="stream_batch_size"):
+        ByT5Transliterator(stream_batch_size=stream_batch_size)
+
+
+def test_transform_batch_rejects_non_string_items():
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+
+    with pytest.raises(TypeError, match="Input must be a string"):
+        transliterator.transform_batch(["a", 3])
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_stream_long_yields_chunks_in_order(workers):
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    calls = []
+
+    def transform_batch(texts, batch_size, max_new_tokens):
+        calls.append(max_new_tokens)
+        return [text.upper() for text in texts]
+
+    transliterator.transform_batch = transform_batch
+    text = " one. two three!\nfour. " + "x" * 40 + "."
+
+    streamed = list(transliterator.stream_long(text, batch_size=2, workers=workers))
+
+    assert "".join(streamed) == text.upper()
+    assert streamed[0] == " "
+    assert calls == [[64, 64], [64, 128]]
+
+
+def test_closing_stream_long_stops_pending_chunks():
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    calls = []
+
+    def transform_batch(texts, batch_size, max_new_tokens):
+        calls.append(texts)
+        return texts
+
+    transliterator.transform_batch = transform_batch
+    text = " ".join(f"w{i}." for i in range(20))
+
+    stream = transliterator.stream_long(text, batch_size=1, workers=2)
+    assert next(stream) == ""
+    assert next(stream) == "w0. "
+    stream.close()
+    time.sleep(0.05)
+
+    # The first group, the one queued behind it and the one queued when
+    # it was read; none of the other 17.
+    assert len(calls) <= 3
@@ -1,6 +1,6 @@
 import pytest
 
-from shekar.transliteration import FarsiToTajik
+from shekar.transliteration import FarsiToTajik, TransliterationMemo
 
 
 @pytest.fixture(scope="module")
@@ -35,3 +35,36 @@ def test_batch_transform(model):
     results = list(model(["کتاب", "دانشگاه"]))
     assert results[0] == "китоб"
     assert results[1] == "донишгоҳ"
+
+
+def test_transform_batch_matches_single_calls(model):
+    texts = ["کتاب", "دانشگاه", "سلام"]
+    assert model.transform_batch(texts, batch_size=2) == [model(t) for t in texts]
+
+
+def test_speculative_decoding_matches_greedy(model):
+    texts = ["کتاب", "دانشگاه تهران", "سلام ۱۲۳ abc"]
+    speculative = FarsiToTajik(speculative_tokens=4)
+    assert speculative.transform_batch(texts) == model.transform_batch(texts)
+
+
+def test_transform_long_matches_sentence_calls(model):
+    text = "کتاب خواندم. دانشگاه تهران!\nسلام"
+    sentences = ["کتاب خواندم.", "دانشگاه تهران!", "سلام"]
+    budgets = [model._chunk_budget(sentence) for sentence in sentences]
+    expected = model.transform_batch(sentences, max_new_tokens=budgets)
+
+    result = model.transform_long(text, workers=2)
+
+    assert result == f"{expected[0]} {expected[1]}\n{expected[2]}"
+    assert "".join(model.stream_long(text)) == result
+
+
+def test_memo_returns_model_results(model, tmp_path):
+    texts = ["کتاب", "دانشگاه", "کتاب"]
+    memo = TransliterationMemo(path=tmp_path / "memo.sqlite")
+    memoized = FarsiToTajik(memo=memo)
+
+    assert memoized.transform_batch(texts) == model.transform_batch(texts)
+    assert memoized("کتاب") == model("کتاب")
+    assert memo.stats()["hits"] == 1
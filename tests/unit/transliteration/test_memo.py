@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+
+from shekar.transliteration import ByT5Transliterator, TransliterationMemo
+
+
+def test_memo_counts_hits_and_misses():
+    memo = TransliterationMemo()
+
+    assert memo.get("a") is None
+    memo.put("a", "A")
+
+    assert memo.get("a") == "A"
+    assert memo.stats() == {"hits": 1, "misses": 1, "disk_hits": 0, "size": 1}
+
+
+def test_memo_evicts_least_recently_used():
+    memo = TransliterationMemo(max_size=2)
+    memo.update({"a": "A", "b": "B"})
+    memo.get("a")
+    memo.put("c", "C")
+
+    assert len(memo) == 2
+    assert memo.get("b") is None
+    assert memo.get("a") == "A"
+    assert memo.get("c") == "C"
+
+
+def test_memo_disk_tier_survives_restart(tmp_path):
+    path = tmp_path / "memo" / "cache.sqlite"
+    memo = TransliterationMemo(max_size=1, path=path)
+    memo.update({"a": "A", "b": "B"})
+
+    # "a" was evicted from memory but is still on disk.
+    assert memo.get("a") == "A"
+    assert memo.disk_hits == 1
+    memo.close()
+
+    reopened = TransliterationMemo(path=path)
+    assert reopened.get("b") == "B"
+    assert reopened.get("b") == "B"
+    assert reopened.stats() == {"hits": 2, "misses": 0, "disk_hits": 1, "size": 1}
+
+    reopened.clear()
+    assert reopened.get("a") is None
+    assert reopened.stats()["misses"] == 1
+
+
+def test_memo_disk_tier_drops_least_recently_used(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    memo = TransliterationMemo(path=path, max_disk_size=2)
+    memo.put("a", "A")
+    memo.put("b", "B")
+    # A memory hit keeps "a" on disk too, so "b" is the one dropped.
+    assert memo.get("a") == "A"
+    memo.put("c", "C")
+    memo.close()
+
+    reopened = TransliterationMemo(max_size=1, path=path, max_disk_size=2)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == "A"
+    assert reopened.get("c") == "C"
+    # Served from disk, "a" is now more recent than "c".
+    assert reopened.get("a") == "A"
+    reopened.put("d", "D")
+    reopened.close()
+
+    final = TransliterationMemo(path=path, max_disk_size=None)
+    assert [final.get(key) for key in "abcd"] == ["A", None, None, "D"]
+
+
+@pytest.mark.parametrize("max_size", [0, -1, True, 1.5])
+def test_memo_validates_max_size(max_size):
+    with pytest.raises(ValueError, match="max_size"):
+        TransliterationMemo(max_size=max_size)
+    with pytest.raises(ValueError, match="max_disk_size"):
+        TransliterationMemo(max_disk_size=max_size)
+
+
+def test_memo_is_thread_safe(tmp_path):
+    memo = TransliterationMemo(max_size=50, path=tmp_path / "cache.sqlite")
+
+    def work(offset):
+        for i in range(60):
+            memo.put(f"{offset}-{i}", str(i))
+            memo.get(f"{offset}-{i // 2}")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert memo.hits + memo.misses == 240
+    assert len(memo) == 50
+
+
+def make_transliterator(memo):
+    transliterator = ByT5Transliterator.__new__(ByT5Transliterator)
+    transliterator._direction = "fa2tg"
+    transliterator.num_beams = 1
+    transliterator.max_new_tokens = 256
+    transliterator.memo = memo
+    transliterator._model_key = "model"
+    transliterator.calls = []
+
+    def transliterate(texts, max_new_tokens, batch_size):
+        transliterator.calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    transliterator._transliterate = transliterate
+    return transliterator
+
+
+def test_transform_batch_reuses_memoized_results():
+    memo = TransliterationMemo()
+    transliterator = make_transliterator(memo)
+
+    first = transliterator.transform_batch(["ab", " cd ", "ab"])
+    second = transliterator.transform_batch(["cd", "ef", "ab"])
+
+    assert first == ["AB", "CD", "AB"]
+    assert second == ["CD", "EF", "AB"]
+    assert transliterator.calls == [["ab", "cd"], ["ef"]]
+    assert memo.stats()["hits"] == 2
+
+
+def test_memo_key_separates_directions_and_settings():
+    memo = TransliterationMemo()
+    transliterator = make_transliterator(memo)
+    transliterator.transform_batch(["ab"])
+
+    transliterator._direction = "tg2fa"
+    transliterator.transform_batch(["ab"])
+    transliterator.num_beams = 2
+    transliterator.transform_batch(["ab"])
+    transliterator.transform_batch(["ab"], max_new_tokens=[64])
+
+    assert len(transliterator.calls) == 4
+    assert len(memo) == 4
+
+
+def test_stream_long_by_word_memoizes_words():
+    memo = TransliterationMemo()
+    transliterator = make_transliterator(memo)
+
+    result = transliterator.transform_long("ab cd. ab\nab", unit="word")
+
+    assert result == "AB CD. AB\nAB"
+    assert transliterator.calls == [["ab", "cd."]]
+    with pytest.raises(ValueError, match="unit"):
+        transliterator.transform_long("ab", unit="line")
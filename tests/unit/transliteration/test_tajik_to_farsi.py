@@ -35,3 +35,14 @@ def test_batch_transform(model):
     results = list(model(["китоб", "донишгоҳ"]))
     assert results[0] == "کتاب"
     assert results[1] == "دانشگاه"
+
+
+def test_transform_batch_matches_single_calls(model):
+    texts = ["китоб", "донишгоҳ", "салом"]
+    assert model.transform_batch(texts, batch_size=2) == [model(t) for t in texts]
+
+
+def test_speculative_decoding_matches_greedy(model):
+    texts = ["китоб", "донишгоҳи Теҳрон", "салом 123 abc"]
+    speculative = TajikToFarsi(speculative_tokens=4)
+    assert speculative.transform_batch(texts) == model.transform_batch(texts)